@@ -0,0 +1,81 @@
+# =======================================================================================================
+# Benchmark Daftar Koleksi
+# Membandingkan display_items versi lama (string disambung dengan +=) dengan daftar berbasis generator:
+# display_items baru (disambung per halaman), halaman pertama iter_pages, dan menelusuri semua halaman.
+# Waktu diukur tanpa tracemalloc; memori puncak diukur terpisah dengan tracemalloc dan hanya
+# mencakup alokasi selama daftar dibuat (objek item sudah ada sebelumnya).
+#
+#   python benchmark_daftar.py --items 1000000
+# =======================================================================================================
+
+import argparse
+import time
+import tracemalloc
+
+from manajemen_perpustakaan import DEFAULT_PAGE_SIZE, Book, Library, Magazine
+
+
+def build_library(count):
+    library = Library("Benchmark")
+    for i in range(count):
+        if i % 5:
+            library.add_item(Book(f"B{i:07d}", f"Judul Buku {i}", 2000 + i % 25, "Penulis", "978-0"))
+        else:
+            library.add_item(Magazine(f"M{i:07d}", f"Judul Majalah {i}", 2000 + i % 25, "Edisi", "Penerbit"))
+    return library
+
+
+# display_items versi lama: seluruh daftar disusun dulu dengan +=
+def old_display_items(library):
+    result = f"Daftar Item di Perpustakaan {library.name}:\n"
+    for item in library.get_all_items():
+        result += f"{item.display_info()}\n"
+    return result
+
+
+def first_page(library):
+    return next(library.iter_pages(DEFAULT_PAGE_SIZE))
+
+
+def all_pages(library):
+    pages = 0
+    for _ in library.iter_pages(DEFAULT_PAGE_SIZE):
+        pages += 1
+    return pages
+
+
+CASES = [
+    ("+= (lama)", old_display_items),
+    ("display_items", lambda library: library.display_items()),
+    ("halaman pertama", first_page),
+    ("semua halaman", all_pages),
+]
+
+
+def measure(function, library):
+    start = time.perf_counter()
+    function(library)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    function(library)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000000)
+    options = parser.parse_args()
+
+    library = build_library(options.items)
+    print(f"{options.items} item, {DEFAULT_PAGE_SIZE} item per halaman\n")
+    print(f"{'Cara':<24}{'Waktu (ms)':>12}{'Memori puncak (MB)':>20}")
+    for name, function in CASES:
+        seconds, peak = measure(function, library)
+        print(f"{name:<24}{seconds * 1000:>12.2f}{peak / 2**20:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# =======================================================================================================
+# Benchmark Memori Item Perpustakaan
+# Membandingkan memori Book/Magazine dengan __slots__ terhadap layout lama (atribut di __dict__).
+# Setiap varian dijalankan di proses terpisah agar angka RSS tidak saling mempengaruhi.
+#
+#   python benchmark_memori.py --items 1000000
+#
+# Membutuhkan modul resource (Linux/macOS) untuk membaca RSS.
+# =======================================================================================================
+
+import argparse
+import gc
+import resource
+import subprocess
+import sys
+import time
+
+from manajemen_perpustakaan import Book, Magazine
+
+
+# Layout lama: kelas biasa tanpa __slots__, atribut disimpan di __dict__ setiap objek
+class DictBook:
+    def __init__(self, item_id, title, year_published, author, isbn):
+        self._item_id = item_id
+        self._title = title
+        self._year_published = year_published
+        self._is_available = True
+        self._author = author
+        self._isbn = isbn
+
+
+class DictMagazine:
+    def __init__(self, item_id, title, year_published, issue_number, publisher):
+        self._item_id = item_id
+        self._title = title
+        self._year_published = year_published
+        self._is_available = True
+        self._issue_number = issue_number
+        self._publisher = publisher
+
+
+VARIANTS = {
+    "slots": (Book, Magazine),
+    "dict": (DictBook, DictMagazine),
+}
+
+
+# Membuat item dengan string unik per item (ID, judul, ISBN) seperti data katalog sebenarnya
+def build_items(count, book_class, magazine_class):
+    items = []
+    for i in range(count):
+        if i % 5:
+            items.append(book_class(f"B{i:07d}", f"Judul Buku {i}", 2000 + i % 25,
+                                    f"Penulis {i % 1000}", f"978-{i:010d}"))
+        else:
+            items.append(magazine_class(f"M{i:07d}", f"Judul Majalah {i}", 2000 + i % 25,
+                                        f"Edisi {i % 12}", f"Penerbit {i % 100}"))
+    return items
+
+
+# Peak RSS proses dalam byte (ru_maxrss dalam KB di Linux, byte di macOS)
+def peak_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+# Ukuran objek item itu sendiri (termasuk __dict__ bila ada), tanpa string nilai atributnya
+def layout_size(item):
+    size = sys.getsizeof(item)
+    if hasattr(item, "__dict__"):
+        size += sys.getsizeof(item.__dict__)
+    return size
+
+
+# Mengukur satu varian di proses ini, hasil dicetak sebagai satu baris
+def measure(variant, count):
+    gc.collect()
+    rss_before = peak_rss()
+    start = time.perf_counter()
+    items = build_items(count, *VARIANTS[variant])
+    seconds = time.perf_counter() - start
+    rss = peak_rss() - rss_before
+    layout = sum(layout_size(item) for item in items)
+    print(f"{variant} {layout} {rss} {seconds:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--variant", choices=list(VARIANTS), help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.variant:
+        measure(options.variant, options.items)
+        return
+
+    print(f"{options.items} item (80% Book, 20% Magazine)\n")
+    print(f"{'Layout':<10}{'Objek (MB)':>12}{'Byte/objek':>12}{'RSS (MB)':>12}{'RSS/item':>10}{'Waktu (s)':>12}")
+    results = {}
+    for variant in VARIANTS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--items", str(options.items), "--variant", variant],
+            check=True, capture_output=True, text=True).stdout.split()
+        layout, rss, seconds = int(output[1]), int(output[2]), float(output[3])
+        results[variant] = (layout, rss)
+        print(f"{variant:<10}{layout / 2**20:>12.1f}{layout / options.items:>12.0f}"
+              f"{rss / 2**20:>12.1f}{rss / options.items:>10.0f}{seconds:>12.2f}")
+    layout_saving = 1 - results["slots"][0] / results["dict"][0]
+    rss_saving = 1 - results["slots"][1] / results["dict"][1]
+    print(f"\n__slots__ menghemat {layout_saving * 100:.0f}% ukuran objek dan {rss_saving * 100:.0f}% RSS "
+          f"(sisanya adalah string ID, judul, dan atribut lain)")
+
+
+if __name__ == "__main__":
+    main()
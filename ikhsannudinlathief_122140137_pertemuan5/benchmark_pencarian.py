@@ -0,0 +1,80 @@
+# =======================================================================================================
+# Benchmark Pencarian Judul
+# Membandingkan Library.search_by_title (indeks trigram) dengan pemindaian linear versi lama
+# pada koleksi sintetis. Hasil kedua cara dipastikan sama sebelum waktu dicetak.
+#
+#   python benchmark_pencarian.py --items 1000000
+# =======================================================================================================
+
+import argparse
+import random
+import statistics
+import time
+
+from manajemen_perpustakaan import Book, Library, Magazine
+
+WORDS = [
+    "Python", "Data", "Structures", "Algorithms", "Programming", "Web", "Database",
+    "Network", "Security", "Machine", "Learning", "Geographic", "Science", "History",
+    "Mathematics", "Physics", "Economics", "Design", "Systems", "Introduction",
+]
+
+QUERIES = ["python", "data str", "geographic", "ing", "machine learning 12", "999999", "zzz", "py"]
+
+
+# Membuat koleksi sintetis dengan judul acak (deterministik per seed)
+def build_library(count, seed=0):
+    rng = random.Random(seed)
+    library = Library("Benchmark")
+    for i in range(count):
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        if i % 5:
+            library.add_item(Book(f"B{i:07d}", title, 2000 + i % 25, "Penulis", "978-0"))
+        else:
+            library.add_item(Magazine(f"M{i:07d}", title, 2000 + i % 25, "Edisi", "Penerbit"))
+    return library
+
+
+# Pencarian versi lama: lower() setiap judul pada setiap pencarian
+def linear_search_by_title(items, title):
+    results = []
+    for item in items:
+        if title.lower() in item.title.lower():
+            results.append(item)
+    return results
+
+
+# Median waktu (ms) dari beberapa kali pemanggilan
+def measure(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    start = time.perf_counter()
+    library = build_library(options.items)
+    build_seconds = time.perf_counter() - start
+    items = library.get_all_items()
+    print(f"{options.items} item ditambahkan dalam {build_seconds:.1f} detik (termasuk indeks)\n")
+
+    print(f"{'Kata kunci':<22}{'Hasil':>9}{'Linear (ms)':>14}{'Indeks (ms)':>14}{'Speedup':>10}")
+    for query in QUERIES:
+        expected = linear_search_by_title(items, query)
+        assert library.search_by_title(query) == expected, query
+        linear_ms = measure(lambda: linear_search_by_title(items, query), options.repeat)
+        indexed_ms = measure(lambda: library.search_by_title(query), options.repeat)
+        print(f"{query!r:<22}{len(expected):>9}{linear_ms:>14.2f}{indexed_ms:>14.3f}"
+              f"{linear_ms / indexed_ms:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,41 @@
 # sederhana dengan fitur pengelolaan buku dan majalah.
 # =======================================================================================================
 
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+# Jumlah item yang disimpan di cache LRU Library (item lain dibaca dari storage saat dibutuhkan)
+DEFAULT_CACHE_SIZE = 1024
+
+# Jumlah kunci (lock) peminjaman di Library; item dibagi ke kunci berdasarkan hash ID-nya
+DEFAULT_LOCK_STRIPES = 64
+
+# Jumlah baris yang dibaca sekaligus saat storage SQLite dibaca berurutan
+FETCH_SIZE = 1000
+
+# Jumlah item per halaman saat daftar koleksi ditampilkan di menu
+DEFAULT_PAGE_SIZE = 20
+
+# Lokasi file default untuk setiap jenis storage
+DEFAULT_STORAGE_PATHS = {
+    "sqlite": "perpustakaan.sqlite",
+    "log": "perpustakaan.log",
+}
 
 # Kelas abstrak sebagai dasar untuk semua item perpustakaan
 # Menerapkan konsep abstraksi dalam OOP dimana kelas ini tidak dapat diinstansiasi langsung
+# __slots__ menyimpan atribut di slot tetap (tanpa __dict__ per objek) sehingga setiap item lebih hemat memori
 class LibraryItem(ABC):
+    __slots__ = ("_item_id", "_title", "_year_published", "_is_available")
+
     def __init__(self, item_id, title, year_published):
         # Menggunakan protected attributes (_) untuk encapsulation
         self._item_id = item_id          # ID unik untuk item
@@ -53,10 +83,24 @@ class LibraryItem(ABC):
         self._is_available = True
         return True
 
+    # Mengubah item menjadi dictionary untuk disimpan oleh storage backend
+    # Kunci dictionary sama dengan nama parameter konstruktor kelas turunan
+    def to_record(self):
+        return {
+            "type": self.RECORD_TYPE,
+            "item_id": self._item_id,
+            "title": self._title,
+            "year_published": self._year_published,
+            "is_available": self._is_available,
+        }
+
 
 # Kelas untuk item buku, mewarisi dari LibraryItem
 # Menerapkan konsep inheritance (pewarisan) dari kelas induk
 class Book(LibraryItem):
+    __slots__ = ("_author", "_isbn")
+    RECORD_TYPE = "buku"
+
     def __init__(self, item_id, title, year_published, author, isbn):
         # Memanggil konstruktor kelas induk
         super().__init__(item_id, title, year_published)
@@ -70,10 +114,16 @@ class Book(LibraryItem):
         return f"Buku: {self._title} (ID: {self._item_id}) | Penulis: {self._author} | " \
                f"Tahun: {self._year_published} | ISBN: {self._isbn} | Status: {status}"
 
+    def to_record(self):
+        return dict(super().to_record(), author=self._author, isbn=self._isbn)
+
 
 # Kelas untuk item majalah, mewarisi dari LibraryItem
 # Implementasi kedua dari konsep inheritance
 class Magazine(LibraryItem):
+    __slots__ = ("_issue_number", "_publisher")
+    RECORD_TYPE = "majalah"
+
     def __init__(self, item_id, title, year_published, issue_number, publisher):
         # Memanggil konstruktor kelas induk
         super().__init__(item_id, title, year_published)
@@ -87,18 +137,427 @@ class Magazine(LibraryItem):
         return f"Majalah: {self._title} (ID: {self._item_id}) | Edisi: {self._issue_number} | " \
                f"Penerbit: {self._publisher} | Tahun: {self._year_published} | Status: {status}"
 
+    def to_record(self):
+        return dict(super().to_record(), issue_number=self._issue_number, publisher=self._publisher)
+
+
+# Jenis item yang dapat disimpan, dipakai untuk membuat kembali objek dari record
+ITEM_TYPES = {cls.RECORD_TYPE: cls for cls in (Book, Magazine)}
+
+
+# Membuat kembali objek Book/Magazine dari dictionary hasil to_record()
+def item_from_record(record):
+    fields = dict(record)
+    item_class = ITEM_TYPES[fields.pop("type")]
+    is_available = fields.pop("is_available", True)
+    item = item_class(**fields)
+    item.is_available = is_available
+    return item
+
+
+# Kelas abstrak untuk tempat penyimpanan koleksi perpustakaan
+# Library hanya berinteraksi melalui method di bawah ini, sehingga penyimpanan dapat diganti
+# (memori, SQLite, atau file log) tanpa mengubah kelas Library
+# Setiap implementasi harus aman dipanggil dari beberapa thread sekaligus
+class StorageBackend(ABC):
+    # Mengambil satu item berdasarkan ID, None bila tidak ada
+    @abstractmethod
+    def load(self, item_id):
+        pass
+
+    # Menyimpan item baru
+    @abstractmethod
+    def add(self, item):
+        pass
+
+    # Menyimpan perubahan status ketersediaan satu item (tanpa menulis ulang data lain)
+    @abstractmethod
+    def update_status(self, item_id, is_available):
+        pass
+
+    # Menyimpan status yang sama untuk beberapa item (dipakai peminjaman sekaligus)
+    def update_statuses(self, item_ids, is_available):
+        for item_id in item_ids:
+            self.update_status(item_id, is_available)
+
+    # Menghasilkan pasangan (ID, judul) seluruh item sesuai urutan penambahan
+    @abstractmethod
+    def iter_titles(self):
+        pass
+
+    # Menghasilkan seluruh item sesuai urutan penambahan
+    @abstractmethod
+    def iter_items(self):
+        pass
+
+    @abstractmethod
+    def __contains__(self, item_id):
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# Penyimpanan di memori (perilaku awal program, data hilang saat program ditutup)
+class MemoryStorage(StorageBackend):
+    def __init__(self):
+        self.__items = {}
+
+    def load(self, item_id):
+        return self.__items.get(item_id)
+
+    def add(self, item):
+        self.__items[item.item_id] = item
+
+    def update_status(self, item_id, is_available):
+        self.__items[item_id].is_available = is_available
+
+    def iter_titles(self):
+        for item_id, item in self.__items.items():
+            yield item_id, item.title
+
+    def iter_items(self):
+        yield from self.__items.values()
+
+    def __contains__(self, item_id):
+        return item_id in self.__items
+
+    def __len__(self):
+        return len(self.__items)
+
+
+# Penyimpanan di database SQLite
+# Satu baris per item; kolom is_available dipisah agar peminjaman cukup meng-UPDATE satu kolom
+# Setiap thread memakai koneksinya sendiri dengan mode WAL, sehingga pembaca tidak menunggu penulis.
+# SQLite hanya mengizinkan satu penulis; penulis diantrekan dengan kunci Python karena busy handler
+# SQLite menunggu dengan sleep dan jauh lebih lambat saat banyak thread menulis bersamaan.
+class SQLiteStorage(StorageBackend):
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, path):
+        self.__path = path
+        self.__local = threading.local()
+        self.__connections = []   # Semua koneksi yang pernah dibuka, untuk close()
+        self.__lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+        connection = self.__connection
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " item_id TEXT NOT NULL UNIQUE,"
+            " title TEXT NOT NULL,"
+            " is_available INTEGER NOT NULL,"
+            " data TEXT NOT NULL)"
+        )
+        connection.commit()
+
+    # Koneksi milik thread yang sedang berjalan, dibuka saat pertama kali dipakai
+    @property
+    def __connection(self):
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.__path, timeout=self.BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
+
+    @staticmethod
+    def __to_item(is_available, data):
+        record = json.loads(data)
+        record["is_available"] = bool(is_available)
+        return item_from_record(record)
+
+    def __fetchone(self, sql, parameters=()):
+        return self.__connection.execute(sql, parameters).fetchone()
+
+    # Membaca hasil query per FETCH_SIZE baris
+    def __iter_rows(self, sql):
+        cursor = self.__connection.execute(sql)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+
+    def load(self, item_id):
+        row = self.__fetchone("SELECT is_available, data FROM items WHERE item_id = ?", (item_id,))
+        return self.__to_item(*row) if row else None
+
+    def add(self, item):
+        record = item.to_record()
+        is_available = record.pop("is_available")
+        connection = self.__connection
+        with self.__write_lock, connection:
+            connection.execute(
+                "INSERT INTO items (item_id, title, is_available, data) VALUES (?, ?, ?, ?)",
+                (item.item_id, item.title, int(is_available), json.dumps(record)))
+
+    def update_status(self, item_id, is_available):
+        self.update_statuses([item_id], is_available)
+
+    # Semua perubahan status disimpan dalam satu transaksi
+    def update_statuses(self, item_ids, is_available):
+        connection = self.__connection
+        with self.__write_lock, connection:
+            connection.executemany(
+                "UPDATE items SET is_available = ? WHERE item_id = ?",
+                [(int(is_available), item_id) for item_id in item_ids])
+
+    def iter_titles(self):
+        yield from self.__iter_rows("SELECT item_id, title FROM items ORDER BY seq")
+
+    def iter_items(self):
+        for row in self.__iter_rows("SELECT is_available, data FROM items ORDER BY seq"):
+            yield self.__to_item(*row)
+
+    def __contains__(self, item_id):
+        return self.__fetchone("SELECT 1 FROM items WHERE item_id = ?", (item_id,)) is not None
+
+    def __len__(self):
+        return self.__fetchone("SELECT COUNT(*) FROM items")[0]
+
+    def close(self):
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+
+
+# Penyimpanan berupa file log yang hanya ditambah di bagian akhir (append-only)
+# Setiap baris adalah satu kejadian JSON: penambahan item ("add") atau perubahan status ("status").
+# Saat dibuka, file dibaca sekali untuk mencatat posisi (offset) baris "add" setiap item dan status
+# terakhirnya; isi item baru dibaca dari file ketika dibutuhkan.
+# Baris terakhir yang tidak lengkap (program berhenti saat menulis) dibuang saat file dibuka.
+# Posisi baca/tulis file dipakai bersama, sehingga setiap akses file dilindungi kunci.
+class AppendLogStorage(StorageBackend):
+    def __init__(self, path):
+        self.__lock = threading.Lock()
+        self.__path = path
+        self.__offsets = {}       # ID item -> offset baris "add" di file
+        self.__status = {}        # ID item -> status terakhir dari kejadian "status"
+        self.__file = open(path, "a+b")
+        self.__file.seek(0)
+        offset = 0
+        for line in self.__file:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # Hanya baris terakhir yang boleh rusak; kerusakan di tengah file tetap error
+                if self.__file.read(1):
+                    raise
+                break
+            if event["op"] == "add":
+                self.__offsets[event["record"]["item_id"]] = offset
+            else:
+                self.__status[event["item_id"]] = event["is_available"]
+            offset += len(line)
+        # Sisa file setelah baris utuh terakhir adalah tulisan yang terputus
+        if offset < self.__file.seek(0, os.SEEK_END):
+            self.__file.truncate(offset)
+
+    # Menulis kejadian di akhir file, dipanggil dengan kunci sudah dipegang
+    def __append(self, events):
+        # Mode "a" selalu menulis di akhir file walaupun posisi baca sudah dipindah
+        self.__file.write(b"".join(json.dumps(event).encode() + b"\n" for event in events))
+        self.__file.flush()
+        # Kejadian baru dianggap tersimpan setelah benar-benar sampai ke disk
+        os.fsync(self.__file.fileno())
+
+    def load(self, item_id):
+        with self.__lock:
+            offset = self.__offsets.get(item_id)
+            if offset is None:
+                return None
+            self.__file.seek(offset)
+            record = json.loads(self.__file.readline())["record"]
+            record["is_available"] = self.__status.get(item_id, record["is_available"])
+        return item_from_record(record)
+
+    def add(self, item):
+        with self.__lock:
+            self.__file.seek(0, os.SEEK_END)
+            self.__offsets[item.item_id] = self.__file.tell()
+            self.__append([{"op": "add", "record": item.to_record()}])
+
+    def update_status(self, item_id, is_available):
+        self.update_statuses([item_id], is_available)
+
+    # Semua perubahan status ditulis dengan satu kali write
+    def update_statuses(self, item_ids, is_available):
+        with self.__lock:
+            self.__append([{"op": "status", "item_id": item_id, "is_available": is_available}
+                           for item_id in item_ids])
+            for item_id in item_ids:
+                self.__status[item_id] = is_available
+
+    # Membaca seluruh record "add" secara berurutan dengan file handle terpisah
+    def __iter_records(self):
+        with open(self.__path, "rb") as log_file:
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    # Baris terakhir yang sedang ditulis thread lain
+                    break
+                event = json.loads(line)
+                if event["op"] == "add":
+                    record = event["record"]
+                    record["is_available"] = self.__status.get(
+                        record["item_id"], record["is_available"])
+                    yield record
+
+    def iter_titles(self):
+        for record in self.__iter_records():
+            yield record["item_id"], record["title"]
+
+    def iter_items(self):
+        for record in self.__iter_records():
+            yield item_from_record(record)
+
+    def __contains__(self, item_id):
+        return item_id in self.__offsets
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def close(self):
+        self.__file.close()
+
+
+# Indeks trigram untuk pencarian judul secara parsial (substring)
+# Setiap judul dinormalisasi (huruf kecil) lalu dipecah menjadi potongan 3 karakter (trigram).
+# Untuk setiap trigram disimpan daftar posisi item yang judulnya mengandung trigram tersebut,
+# sehingga pencarian cukup memeriksa item pada daftar terpendek, bukan seluruh koleksi.
+class TitleIndex:
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self.__keys = []          # Posisi -> ID item, urut sesuai penambahan
+        self.__titles = []        # Posisi -> judul yang sudah dinormalisasi
+        self.__postings = {}      # Trigram -> array posisi item (selalu terurut naik)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    # Normalisasi yang sama dengan pencarian lama: title.lower() in item.title.lower()
+    @staticmethod
+    def normalize(text):
+        return text.lower()
+
+    # Memecah teks menjadi himpunan trigram
+    @classmethod
+    def grams(cls, text):
+        size = cls.GRAM_SIZE
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    # Menambahkan judul ke indeks (dipanggil setiap kali item baru ditambahkan)
+    def add(self, key, title):
+        position = len(self.__keys)
+        normalized = self.normalize(title)
+        self.__keys.append(key)
+        self.__titles.append(normalized)
+        for gram in self.grams(normalized):
+            posting = self.__postings.get(gram)
+            if posting is None:
+                posting = self.__postings[gram] = array("I")
+            posting.append(position)
+
+    # Mencari ID item yang judulnya mengandung kata kunci, urut sesuai penambahan
+    def search(self, query):
+        normalized = self.normalize(query)
+        if len(normalized) < self.GRAM_SIZE:
+            # Kata kunci terlalu pendek untuk trigram: periksa semua judul yang sudah dinormalisasi
+            candidates = range(len(self.__keys))
+        else:
+            postings = []
+            for gram in self.grams(normalized):
+                posting = self.__postings.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            candidates = min(postings, key=len)
+            if len(normalized) == self.GRAM_SIZE:
+                # Kata kunci tepat satu trigram: daftar posisinya sudah merupakan hasil akhir
+                return [self.__keys[position] for position in candidates]
+            # Semua trigram ada di judul belum tentu berarti kata kunci ada (urutannya bisa beda),
+            # jadi kandidat dari daftar terpendek tetap diperiksa dengan pencarian substring
+
+        keys = self.__keys
+        titles = self.__titles
+        return [keys[position] for position in candidates if normalized in titles[position]]
+
 
 # Kelas untuk manajemen koleksi perpustakaan
 # Menggunakan atribut private (__) untuk encapsulation yang lebih ketat
+# Item disimpan oleh storage backend dan hanya dibaca saat dibutuhkan; item yang sering dipakai
+# disimpan di cache LRU berukuran terbatas
+# Aman dipakai dari beberapa thread: setiap item dijaga oleh salah satu dari beberapa kunci
+# (lock striping), sehingga peminjaman item yang berbeda umumnya tidak saling menunggu
 class Library:
-    def __init__(self, name):
+    def __init__(self, name, storage=None, cache_size=DEFAULT_CACHE_SIZE,
+                 lock_stripes=DEFAULT_LOCK_STRIPES):
         self.__name = name        # Nama perpustakaan (private)
-        self.__items = {}         # Dictionary untuk menyimpan semua item (private)
+        self.__storage = storage if storage is not None else MemoryStorage()
+        self.__cache = OrderedDict()        # Cache LRU: ID item -> objek item
+        self.__cache_size = cache_size
+        self.__cache_lock = threading.Lock()
+        self.__locks = [threading.Lock() for _ in range(lock_stripes)]
+        self.__title_index = TitleIndex()   # Indeks trigram judul untuk search_by_title
+        self.__index_lock = threading.Lock()
+        # Indeks judul dibangun dari storage tanpa memuat seluruh objek item
+        for item_id, title in self.__storage.iter_titles():
+            self.__title_index.add(item_id, title)
     
     # Property untuk mengakses nama perpustakaan
     @property
     def name(self):
         return self.__name
+
+    def __len__(self):
+        return len(self.__storage)
+
+    # Kunci yang menjaga satu item
+    def __lock_for(self, item_id):
+        return self.__locks[hash(item_id) % len(self.__locks)]
+
+    # Memegang kunci beberapa item sekaligus
+    # Kunci selalu diambil dengan urutan yang sama (nomor kunci) agar tidak terjadi deadlock
+    @contextlib.contextmanager
+    def __locks_for(self, item_ids):
+        stripes = sorted({hash(item_id) % len(self.__locks) for item_id in item_ids})
+        with contextlib.ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self.__locks[stripe])
+            yield
+
+    # Menyimpan item ke cache LRU, item yang paling lama tidak dipakai dibuang
+    def __remember(self, item):
+        with self.__cache_lock:
+            self.__cache[item.item_id] = item
+            self.__cache.move_to_end(item.item_id)
+            if len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+
+    # Mengambil item dari cache atau storage; kunci item harus sudah dipegang
+    # Karena item hanya dimasukkan ke cache selama kuncinya dipegang, objek di cache selalu
+    # memiliki status terbaru
+    def __get(self, item_id):
+        with self.__cache_lock:
+            item = self.__cache.get(item_id)
+            if item:
+                self.__cache.move_to_end(item_id)
+                return item
+        item = self.__storage.load(item_id)
+        if item:
+            self.__remember(item)
+        return item
     
     # Method untuk menambah item baru ke perpustakaan dengan validasi
     def add_item(self, item):
@@ -107,42 +566,121 @@ class Library:
             print("Error: Hanya item perpustakaan yang dapat ditambahkan")
             return False
         
-        # Validasi: memeriksa apakah ID sudah ada
-        if item.item_id in self.__items:
-            print(f"Error: Item dengan ID {item.item_id} sudah ada dalam perpustakaan")
-            return False
-        
-        self.__items[item.item_id] = item
+        with self.__lock_for(item.item_id):
+            # Validasi: memeriksa apakah ID sudah ada
+            if item.item_id in self.__storage:
+                print(f"Error: Item dengan ID {item.item_id} sudah ada dalam perpustakaan")
+                return False
+            
+            self.__storage.add(item)
+            self.__remember(item)
+        # Judul tidak dapat diubah setelah item dibuat, jadi indeks cukup diperbarui di sini
+        with self.__index_lock:
+            self.__title_index.add(item.item_id, item.title)
         return True
     
-    # Method untuk menampilkan seluruh koleksi perpustakaan
-    def display_items(self):
-        if not self.__items:
+    # Method untuk menelusuri koleksi satu per satu langsung dari storage (tanpa memuat semuanya)
+    # item_type: kelas item (Book/Magazine) yang ditampilkan, available: True/False untuk
+    # menyaring status, None berarti tanpa filter
+    def iter_items(self, item_type=None, available=None):
+        for item in self.__storage.iter_items():
+            if item_type is not None and not isinstance(item, item_type):
+                continue
+            if available is not None and item.is_available != available:
+                continue
+            yield item
+
+    # Method untuk menghasilkan baris tampilan setiap item dengan filter yang sama
+    def iter_display_lines(self, item_type=None, available=None):
+        for item in self.iter_items(item_type, available):
+            yield item.display_info()
+
+    # Method untuk menghasilkan baris tampilan per halaman (list berisi paling banyak page_size baris)
+    def iter_pages(self, page_size=DEFAULT_PAGE_SIZE, item_type=None, available=None):
+        lines = self.iter_display_lines(item_type, available)
+        while True:
+            page = list(islice(lines, page_size))
+            if not page:
+                return
+            yield page
+
+    # Method lama untuk menampilkan seluruh koleksi perpustakaan dalam satu string
+    # Untuk koleksi besar gunakan iter_pages agar daftar tidak perlu disusun seluruhnya
+    # String disambung per halaman: hanya satu halaman baris yang disimpan sekaligus, sehingga
+    # memori puncak kira-kira sebesar hasil akhir (join atas semua baris memerlukan dua kali lipat)
+    def display_items(self, item_type=None, available=None):
+        if not len(self.__storage):
             return "Perpustakaan kosong"
         
         result = f"Daftar Item di Perpustakaan {self.__name}:\n"
-        for item in self.__items.values():
-            result += f"{item.display_info()}\n"
+        for page in self.iter_pages(DEFAULT_PAGE_SIZE, item_type, available):
+            page.append("")
+            result += "\n".join(page)
         return result
     
     # Method untuk mencari item berdasarkan ID
+    # Item dicari di cache lebih dulu, lalu dibaca dari storage (lazy loading)
     def search_by_id(self, item_id):
-        item = self.__items.get(item_id)
-        if item:
-            return item
-        return None
+        with self.__lock_for(item_id):
+            return self.__get(item_id)
     
     # Method untuk mencari item berdasarkan judul (pencarian parsial)
+    # Menggunakan indeks trigram, hasil dan urutannya sama dengan pemindaian seluruh koleksi
     def search_by_title(self, title):
-        results = []
-        for item in self.__items.values():
-            if title.lower() in item.title.lower():
-                results.append(item)
-        return results
+        # Hasil pencarian tidak dimasukkan ke cache agar pencarian yang luas tidak menggusur item yang sering dipakai
+        item_ids = self.__title_index.search(title)
+        with self.__cache_lock:
+            cached = [self.__cache.get(item_id) for item_id in item_ids]
+        load = self.__storage.load
+        return [item or load(item_id) for item_id, item in zip(item_ids, cached)]
 
     # Method untuk mendapatkan semua item dalam bentuk list
     def get_all_items(self):
-        return list(self.__items.values())
+        return list(self.iter_items())
+
+    # Method untuk meminjam item, status baru langsung disimpan ke storage (write-through)
+    # Gunakan method ini (bukan item.check_out()) agar aman dari thread lain dan perubahan
+    # tidak hilang saat item keluar dari cache
+    def check_out(self, item_id):
+        return self.check_out_many([item_id])
+
+    # Method untuk mengembalikan item, status baru langsung disimpan ke storage
+    def check_in(self, item_id):
+        return self.check_in_many([item_id])
+
+    # Method untuk meminjam beberapa item sekaligus: semua berhasil dipinjam, atau tidak ada
+    # yang dipinjam sama sekali bila salah satu item tidak ditemukan atau sedang dipinjam
+    def check_out_many(self, item_ids):
+        return self.__change_status(item_ids, False)
+
+    # Method untuk mengembalikan beberapa item sekaligus dengan aturan yang sama
+    def check_in_many(self, item_ids):
+        return self.__change_status(item_ids, True)
+
+    # Mengubah status beberapa item selama kunci semua item tersebut dipegang
+    def __change_status(self, item_ids, is_available):
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return False
+        with self.__locks_for(item_ids):
+            items = [self.__get(item_id) for item_id in item_ids]
+            # Pinjam: semua item harus tersedia; kembalikan: semua item harus sedang dipinjam
+            if any(item is None or item.is_available == is_available for item in items):
+                return False
+            for item in items:
+                item.is_available = is_available
+            try:
+                self.__storage.update_statuses(item_ids, is_available)
+            except Exception:
+                # Gagal menyimpan: kembalikan status di memori agar tetap sama dengan storage
+                for item in items:
+                    item.is_available = not is_available
+                raise
+        return True
+
+    # Menutup storage (koneksi database atau file log)
+    def close(self):
+        self.__storage.close()
 
 
 # Fungsi untuk menampilkan menu interaktif kepada pengguna
@@ -159,9 +697,22 @@ def display_menu():
     print("========================================")
 
 
+# Fungsi untuk membuka storage sesuai pilihan: memory, sqlite, atau log
+def open_storage(kind, path=None):
+    if kind == "memory":
+        return MemoryStorage()
+    path = path or DEFAULT_STORAGE_PATHS[kind]
+    if kind == "sqlite":
+        return SQLiteStorage(path)
+    return AppendLogStorage(path)
+
+
 # Fungsi untuk memulai perpustakaan dengan data awal
-def initialize_library():
-    library = Library("ITERA")
+# Data awal hanya ditambahkan bila storage masih kosong
+def initialize_library(storage=None, cache_size=DEFAULT_CACHE_SIZE):
+    library = Library("ITERA", storage, cache_size)
+    if len(library):
+        return library
     
     # Data awal untuk perpustakaan (seeder)
     initial_data = [
@@ -176,6 +727,40 @@ def initialize_library():
     return library
 
 
+# Fungsi untuk menampilkan koleksi per halaman dengan filter jenis dan status
+# Halaman dibaca dari storage satu per satu, sehingga koleksi besar langsung tampil
+def show_items(library, page_size=DEFAULT_PAGE_SIZE):
+    item_type = input("\nJenis item (buku/majalah, Enter untuk semua): ").strip().lower()
+    if item_type and item_type not in ITEM_TYPES:
+        print(f"Jenis item '{item_type}' tidak dikenal")
+        return
+    status = input("Status (tersedia/dipinjam, Enter untuk semua): ").strip().lower()
+    if status and status not in ("tersedia", "dipinjam"):
+        print(f"Status '{status}' tidak dikenal")
+        return
+
+    pages = library.iter_pages(page_size, ITEM_TYPES.get(item_type),
+                               None if not status else status == "tersedia")
+    page = next(pages, None)
+    if page is None:
+        print("Perpustakaan kosong" if not len(library) else "Tidak ada item yang sesuai dengan filter")
+        return
+
+    print(f"\nDaftar Item di Perpustakaan {library.name}:")
+    number = 1
+    while True:
+        for line in page:
+            print(line)
+        page = next(pages, None)
+        if page is None:
+            break
+        answer = input(f"\n-- Halaman {number}. Enter untuk halaman berikutnya, q untuk berhenti: ")
+        if answer.strip().lower() == "q":
+            break
+        number += 1
+    pages.close()
+
+
 # Fungsi untuk menambah buku baru melalui input pengguna
 def add_book(library):
     print("\n--- TAMBAH BUKU BARU ---")
@@ -243,8 +828,7 @@ def checkout_item(library):
     item = library.search_by_id(item_id)
     
     if item:
-        if item.is_available:
-            item.check_out()
+        if library.check_out(item_id):
             print(f"Berhasil meminjam: {item.display_info()}")
         else:
             print(f"Item '{item.title}' sedang tidak tersedia (sudah dipinjam)")
@@ -258,8 +842,7 @@ def checkin_item(library):
     item = library.search_by_id(item_id)
     
     if item:
-        if not item.is_available:
-            item.check_in()
+        if library.check_in(item_id):
             print(f"Berhasil mengembalikan: {item.display_info()}")
         else:
             print(f"Item '{item.title}' tidak sedang dipinjam")
@@ -267,10 +850,22 @@ def checkin_item(library):
         print(f"Item dengan ID '{item_id}' tidak ditemukan")
 
 
+# Fungsi untuk membaca pilihan storage dari argumen command line
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sistem Manajemen Perpustakaan")
+    parser.add_argument("--storage", choices=["sqlite", "log", "memory"], default="sqlite",
+                        help="Tempat penyimpanan koleksi (default: sqlite)")
+    parser.add_argument("--path", help="Lokasi file storage (default: perpustakaan.sqlite / perpustakaan.log)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="Jumlah item yang disimpan di cache")
+    return parser.parse_args(argv)
+
+
 # Fungsi utama yang menjalankan program secara keseluruhan
-def main():
+def main(argv=None):
+    args = parse_args(argv)
     # Inisialisasi perpustakaan
-    library = initialize_library()
+    library = initialize_library(open_storage(args.storage, args.path), args.cache_size)
     print(f"Selamat datang di Sistem Manajemen Perpustakaan {library.name}!")
     
     # Loop utama program
@@ -280,7 +875,7 @@ def main():
         
         # Eksekusi fungsi sesuai dengan pilihan pengguna
         if choice == "1":
-            print(library.display_items())
+            show_items(library)
         elif choice == "2":
             add_book(library)
         elif choice == "3":
@@ -295,6 +890,7 @@ def main():
             checkin_item(library)
         elif choice == "0":
             print("\nTerima kasih telah menggunakan Sistem Manajemen Perpustakaan!")
+            library.close()
             break
         else:
             print("\nPilihan tidak valid. Silakan coba lagi.")
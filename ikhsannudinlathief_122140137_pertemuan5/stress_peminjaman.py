@@ -0,0 +1,150 @@
+# =======================================================================================================
+# Stress Test Peminjaman Konkuren
+# Beberapa thread meminjam dan mengembalikan item (satu per satu maupun beberapa sekaligus) pada
+# koleksi kecil sehingga sering berebut item yang sama. Setiap peminjaman yang berhasil dicatat;
+# bila satu item berhasil dipinjam dua kali tanpa dikembalikan, itu dihitung sebagai pelanggaran.
+# Di akhir, status setiap item di Library dan di storage dibandingkan dengan catatan tersebut.
+#
+#   python stress_peminjaman.py --threads 16 --items 200 --seconds 5
+#   python stress_peminjaman.py --storage sqlite
+#
+# Varian yang dijalankan:
+#   striped  - Library dengan lock striping (default)
+#   global   - Library dengan satu kunci untuk semua item (pembanding)
+# Program keluar dengan kode 1 bila ada pelanggaran atau status yang berbeda.
+# =======================================================================================================
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from manajemen_perpustakaan import DEFAULT_LOCK_STRIPES, Book, Library, open_storage
+
+
+# Catatan peminjam setiap item, dijaga kunci sendiri
+class Ledger:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.holders = {}         # ID item -> nomor thread yang sedang meminjam
+        self.violations = 0
+
+    def borrowed(self, worker, item_ids):
+        with self.lock:
+            for item_id in item_ids:
+                if item_id in self.holders:
+                    self.violations += 1
+                self.holders[item_id] = worker
+
+    def returned(self, item_ids):
+        with self.lock:
+            for item_id in item_ids:
+                self.holders.pop(item_id, None)
+
+
+def worker(number, library, item_ids, ledger, stop, batch, counts):
+    rng = random.Random(number)
+    held = []
+    operations = successes = 0
+    while not stop.is_set():
+        operations += 1
+        if held and rng.random() < 0.5:
+            returning = held[:batch] if rng.random() < 0.3 else held[:1]
+            # Catat pengembalian sebelum item benar-benar dikembalikan, agar peminjam
+            # berikutnya tidak dianggap melanggar
+            ledger.returned(returning)
+            ok = (library.check_in_many(returning) if len(returning) > 1
+                  else library.check_in(returning[0]))
+            if ok:
+                del held[:len(returning)]
+                successes += 1
+            else:
+                ledger.borrowed(number, returning)
+        else:
+            wanted = rng.sample(item_ids, batch) if rng.random() < 0.3 else [rng.choice(item_ids)]
+            ok = (library.check_out_many(wanted) if len(wanted) > 1
+                  else library.check_out(wanted[0]))
+            if ok:
+                ledger.borrowed(number, wanted)
+                held.extend(wanted)
+                successes += 1
+    counts[number] = (operations, successes)
+
+
+def run(name, library, item_ids, options):
+    ledger = Ledger()
+    stop = threading.Event()
+    counts = [None] * options.threads
+    threads = [
+        threading.Thread(target=worker,
+                         args=(i, library, item_ids, ledger, stop, options.batch, counts))
+        for i in range(options.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(options.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Status akhir: item tidak tersedia jika dan hanya jika tercatat sedang dipinjam
+    mismatched = sum(
+        1 for item_id in item_ids
+        if library.search_by_id(item_id).is_available == (item_id in ledger.holders))
+    operations = sum(count[0] for count in counts)
+    successes = sum(count[1] for count in counts)
+    print(f"{name:<9}{operations / elapsed:>12.0f}{successes:>12}{ledger.violations:>14}{mismatched:>12}")
+    return ledger, mismatched
+
+
+def build_library(options, directory, name, stripes):
+    path = None
+    if options.storage != "memory":
+        path = os.path.join(directory, f"stress-{name}.{options.storage}")
+    library = Library("Stress", open_storage(options.storage, path), lock_stripes=stripes)
+    for i in range(options.items):
+        library.add_item(Book(f"B{i:05d}", f"Buku {i}", 2024, "Penulis", "978-0"))
+    return library, path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=3, help="jumlah item per peminjaman sekaligus")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--storage", choices=["memory", "sqlite", "log"], default="memory")
+    options = parser.parse_args()
+
+    # Pergantian thread lebih sering agar race condition lebih mudah muncul
+    sys.setswitchinterval(1e-5)
+    item_ids = [f"B{i:05d}" for i in range(options.items)]
+    failed = False
+    print(f"{options.threads} thread, {options.items} item, storage {options.storage}\n")
+    print(f"{'Varian':<9}{'Operasi/s':>12}{'Berhasil':>12}{'Pelanggaran':>14}{'Status beda':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, stripes in (("striped", DEFAULT_LOCK_STRIPES), ("global", 1)):
+            library, path = build_library(options, directory, name, stripes)
+            ledger, mismatched = run(name, library, item_ids, options)
+            failed |= bool(ledger.violations or mismatched)
+            library.close()
+            if path:
+                # Status yang disimpan ke storage sama dengan status di memori
+                reopened = Library("Stress", open_storage(options.storage, path))
+                stored = sum(1 for item_id in item_ids
+                             if reopened.search_by_id(item_id).is_available
+                             == (item_id in ledger.holders))
+                reopened.close()
+                if stored:
+                    print(f"{'':<9}{stored} item berbeda setelah storage dibuka ulang")
+                    failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
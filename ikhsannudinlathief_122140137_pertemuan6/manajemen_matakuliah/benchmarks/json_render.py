@@ -0,0 +1,116 @@
+"""
+Benchmark serialisasi daftar matakuliah ke JSON.
+
+Membandingkan cara lama (objek ORM + ``to_dict()``, atau ``Row._asdict()``
++ json standar) dengan ``RowList`` (nama kolom dihitung sekali, dict dibuat
+dengan zip) pada json standar maupun orjson, serta serializer per baris yang
+dikompilasi (potongan ``{"kolom":`` tetap, hanya nilai yang di-encode,
+tanpa dict per baris). Untuk ``RowList`` dicetak juga rinciannya: waktu
+membuat dict per baris dan waktu encoder saja.
+Hasil dicetak sebagai JSON dalam milidetik per halaman.
+
+    python benchmarks/json_render.py --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import timeit
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.models.meta import Base
+from manajemen_matakuliah.queries import export_query
+from manajemen_matakuliah.renderers import RowList, orjson, render
+
+
+def seed(rows):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.Matakuliah.__table__), [
+            {'kode_mk': f'IF{i:07d}', 'nama_mk': f'Matakuliah "{i}"',
+             'sks': 2 + i % 3, 'semester': 1 + i % 8}
+            for i in range(rows)
+        ])
+    return engine
+
+
+def compile_row_serializer(keys, dump_value, as_bytes):
+    """serialize_row(row) dengan potongan key yang sudah jadi, tanpa dict"""
+    parts = []
+    for index, key in enumerate(keys):
+        literal = ('{' if index == 0 else ',') + json.dumps(key) + ':'
+        parts.append(f'{literal.encode() if as_bytes else literal!r} + dump(row[{index}])')
+    parts.append(repr(b'}' if as_bytes else '}'))
+    body = ' + '.join(parts)
+    if not as_bytes:
+        body = f"({body}).encode('utf-8')"
+    namespace = {'dump': dump_value}
+    exec(f'def serialize_row(row):\n    return {body}\n', namespace)
+    return namespace['serialize_row']
+
+
+def load_rows(engine):
+    with Session(engine) as dbsession:
+        objects = dbsession.query(models.Matakuliah).order_by(models.Matakuliah.id).all()
+        rows = dbsession.execute(export_query()).all()
+    return objects, rows
+
+
+def alternatives(objects, rows):
+    keys = tuple(str(key) for key in rows[0]._fields)
+
+    def compiled(dump_value, as_bytes):
+        serialize = compile_row_serializer(keys, dump_value, as_bytes)
+        return lambda: b'{"matakuliahs":[' + b','.join(map(serialize, rows)) + b']}'
+
+    cases = {
+        'orm_to_dict_json': lambda: json.dumps(
+            {'matakuliahs': [m.to_dict() for m in objects]}).encode('utf-8'),
+        'core_asdict_json': lambda: json.dumps(
+            {'matakuliahs': [row._asdict() for row in rows]}).encode('utf-8'),
+        'rowlist_json': lambda: json.dumps(
+            {'matakuliahs': RowList(rows).__json__(None)}).encode('utf-8'),
+        'compiled_json': compiled(json.dumps, False),
+    }
+    if orjson is not None:
+        cases['rowlist_orjson'] = lambda: render({'matakuliahs': RowList(rows)})
+        cases['compiled_orjson'] = compiled(orjson.dumps, True)
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    objects, rows = load_rows(seed(args.rows))
+    cases = alternatives(objects, rows)
+    expected = json.loads(cases['core_asdict_json']())
+    results = []
+    for name, func in cases.items():
+        assert json.loads(func()) == expected, name
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5))
+        results.append({
+            'case': name,
+            'rows': args.rows,
+            'ms_per_page': round(best / args.repeat * 1000, 3),
+        })
+    # Rincian RowList: dict per baris vs encoder (orjson bila ada)
+    dicts = RowList(rows).__json__(None)
+    encode = orjson.dumps if orjson is not None else json.dumps
+    for name, func in (('rowlist_dicts_only', lambda: RowList(rows).__json__(None)),
+                       ('encoder_only', lambda: encode(dicts))):
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5))
+        results.append({
+            'case': name,
+            'rows': args.rows,
+            'ms_per_page': round(best / args.repeat * 1000, 3),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark skala server pre-fork terhadap jumlah worker.
+
+Database diisi ``--rows`` matakuliah, lalu server ``prefork.serve`` dijalankan
+berulang kali dengan jumlah worker berbeda (default 1, 2, 4, ... hingga
+jumlah CPU). Beban dibangkitkan oleh ``--client-processes`` proses klien
+agar generator beban sendiri tidak dibatasi GIL. Hasil dicetak sebagai JSON:
+request/detik, latensi p50/p99, dan speedup terhadap satu worker.
+
+    python benchmarks/prefork_scaling.py --rows 10000 --workers 1 2 4 --seconds 10
+
+Speedup hanya terlihat bila mesin punya lebih dari satu core; klien dan
+server berbagi CPU yang sama, jadi angka absolut lebih rendah daripada
+server yang dibebani dari mesin lain.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+
+from wsgi_vs_asgi import _free_port, _wait_ready, load, seed
+
+
+def serve_prefork(settings, port, workers, threads):
+    from manajemen_matakuliah import main
+    from manajemen_matakuliah.prefork import serve
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+    serve(main({}, **settings), host='127.0.0.1', port=str(port),
+          workers=workers, threads=threads)
+
+
+def _load_worker(args):
+    return load(*args)
+
+
+def load_parallel(port, processes, clients, seconds, rows, page_size):
+    """``load`` dari beberapa proses sekaligus, hasilnya digabung"""
+    per_process = max(1, clients // processes)
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(_load_worker, [
+            (port, per_process, seconds, rows, page_size)
+            for _ in range(processes)])
+    requests = sum(result['requests'] for result in results)
+    return {
+        'requests': requests,
+        'errors': sum(result['errors'] for result in results),
+        'requests_per_sec': round(requests / seconds, 1),
+        # Persentil per proses klien, diambil yang terburuk
+        'p50_ms': max(result['p50_ms'] or 0 for result in results),
+        'p99_ms': max(result['p99_ms'] or 0 for result in results),
+    }
+
+
+def run(settings, workers, options):
+    port = _free_port()
+    process = multiprocessing.Process(
+        target=serve_prefork,
+        args=(settings, port, workers, options.threads), daemon=True)
+    process.start()
+    try:
+        _wait_ready(port)
+        result = load_parallel(
+            port, options.client_processes, options.clients, options.seconds,
+            options.rows, options.page_size)
+    finally:
+        # SIGTERM: induk menghentikan semua worker
+        process.terminate()
+        process.join()
+    return dict({'workers': workers, 'threads': options.threads}, **result)
+
+
+def default_workers():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='jumlah worker yang diuji (default 1, 2, 4, ... CPU)')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='jumlah thread waitress per worker')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--client-processes', type=int,
+                        default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--page-size', type=int, default=50)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings = {
+            'sqlalchemy.url': f"sqlite:///{os.path.join(directory, 'bench.sqlite')}",
+            'sqlalchemy.sqlite.journal_mode': 'wal',
+            'sqlalchemy.sqlite.synchronous': 'normal',
+            'sqlalchemy.sqlite.busy_timeout': '5000',
+            # Cache dimatikan agar yang diukur adalah jalur database dan JSON
+            'matakuliah.cache.backend': 'none',
+            'matakuliah.startup.warmup': 'true',
+        }
+        seed(settings, options.rows)
+
+        results = [run(settings, workers, options)
+                   for workers in options.workers or default_workers()]
+    baseline = results[0]['requests_per_sec'] or 1
+    for result in results:
+        result['speedup'] = round(result['requests_per_sec'] / baseline, 2)
+    print(json.dumps({'cpu_count': os.cpu_count(), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark penulis konkuren pada SQLite: pengaturan default vs pragma .ini.
+
+Setiap thread penulis menjalankan transaksi pendek (INSERT satu matakuliah
+lalu COMMIT), sementara thread pembaca terus membaca satu halaman daftar.
+Hasil dicetak sebagai JSON.
+
+    python benchmarks/sqlite_writers.py --writers 8 --readers 4 --transactions 200
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.models.meta import Base
+
+CONFIGS = {
+    'default': {},
+    'tuned': {
+        'sqlalchemy.pool_size': '16',
+        'sqlalchemy.max_overflow': '8',
+        'sqlalchemy.sqlite.journal_mode': 'wal',
+        'sqlalchemy.sqlite.synchronous': 'normal',
+        'sqlalchemy.sqlite.cache_size': '-65536',
+        'sqlalchemy.sqlite.mmap_size': '268435456',
+        'sqlalchemy.sqlite.busy_timeout': '5000',
+    },
+}
+
+
+def run(config_name, writers, readers, transactions, directory):
+    path = os.path.join(directory, f'{config_name}.sqlite')
+    settings = {'sqlalchemy.url': f'sqlite:///{path}'}
+    settings.update(CONFIGS[config_name])
+    engine = models.get_engine(settings)
+    Base.metadata.create_all(engine)
+    session_factory = models.get_session_factory(engine)
+
+    committed = [0] * writers
+    failed = [0] * writers
+    reads = [0] * readers
+    stop = threading.Event()
+
+    def writer(index):
+        for n in range(transactions):
+            dbsession = session_factory()
+            try:
+                dbsession.add(models.Matakuliah(
+                    kode_mk=f'W{index}-{n}', nama_mk='Benchmark',
+                    sks=3, semester=1 + n % 8))
+                dbsession.commit()
+                committed[index] += 1
+            except OperationalError:
+                dbsession.rollback()
+                failed[index] += 1
+            finally:
+                dbsession.close()
+
+    def reader(index):
+        table = models.Matakuliah.__table__
+        while not stop.is_set():
+            dbsession = session_factory()
+            try:
+                dbsession.execute(select(*table.c).order_by(table.c.id).limit(100)).all()
+                reads[index] += 1
+            except OperationalError:
+                pass
+            finally:
+                dbsession.close()
+
+    reader_threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in reader_threads:
+        thread.start()
+    start = time.perf_counter()
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    engine.dispose()
+
+    return {
+        'config': config_name,
+        'writers': writers,
+        'readers': readers,
+        'seconds': round(elapsed, 3),
+        'commits': sum(committed),
+        'failed': sum(failed),
+        'commits_per_sec': round(sum(committed) / elapsed, 1),
+        'reads_per_sec': round(sum(reads) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--transactions', type=int, default=200)
+    parser.add_argument('--config', choices=sorted(CONFIGS), action='append')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            run(name, args.writers, args.readers, args.transactions, directory)
+            for name in (args.config or ['default', 'tuned'])
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
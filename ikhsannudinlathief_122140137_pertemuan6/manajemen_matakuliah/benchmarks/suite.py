@@ -0,0 +1,359 @@
+"""
+Suite benchmark API matakuliah: latensi dan throughput per operasi.
+
+Untuk setiap ukuran ``--sizes`` (misalnya 10^3 sampai 10^6 baris) dibuat
+database SQLite baru yang diisi dengan fixture ``setup_models`` milik
+``initialize_db`` ditambah baris sintetis. Operasi list, detail, add, update,
+dan delete lalu diukur dengan dua cara:
+
+- ``inprocess``: request WSGI langsung ke aplikasi, satu klien, tanpa jaringan
+- ``server``: aplikasi dijalankan di waitress (proses terpisah) dan dibebani
+  ``--clients`` klien konkuren dengan koneksi keep-alive
+
+Hasil ditulis sebagai JSON (stdout atau ``--output``) beserta commit git,
+sehingga dapat dibandingkan antar commit::
+
+    python benchmarks/suite.py --sizes 1000,10000 --output baseline.json
+    python benchmarks/suite.py --sizes 1000,10000 --compare baseline.json
+
+Dengan ``--compare``, hasil yang throughput-nya turun atau latensi p95-nya
+naik lebih dari ``--tolerance`` dilaporkan dan script keluar dengan kode 1.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import sqlalchemy
+import transaction
+from sqlalchemy import insert
+from webob import Request
+
+from manajemen_matakuliah import main as make_app
+from manajemen_matakuliah import models
+from manajemen_matakuliah.models.meta import Base
+from manajemen_matakuliah.scripts.initialize_db import setup_models
+
+from wsgi_vs_asgi import _free_port, _wait_ready, serve_wsgi
+
+OPERATIONS = ('list', 'detail', 'add', 'update', 'delete')
+SEED_BATCH_SIZE = 10000
+
+
+def seed(settings, rows):
+    """Fixture initialize_db ditambah baris sintetis hingga ``rows`` baris"""
+    engine = models.get_engine(settings)
+    Base.metadata.create_all(engine)
+    session_factory = models.get_session_factory(engine)
+    with transaction.manager:
+        dbsession = models.get_tm_session(session_factory, transaction.manager)
+        setup_models(dbsession)
+        dbsession.flush()
+        existing = dbsession.query(models.Matakuliah).count()
+    table = models.Matakuliah.__table__
+    for start in range(existing, rows, SEED_BATCH_SIZE):
+        with engine.begin() as connection:
+            connection.execute(insert(table), [
+                {'kode_mk': f'BM{i:07d}', 'nama_mk': f'Matakuliah {i}',
+                 'sks': 2 + i % 3, 'semester': 1 + i % 8}
+                for i in range(start, min(rows, start + SEED_BATCH_SIZE))
+            ])
+    engine.dispose()
+
+
+class Workload:
+    """Pembuat request (method, path, body, headers) untuk satu klien"""
+
+    def __init__(self, rows, page_size, tag):
+        self.rows = rows
+        self.page_size = page_size
+        self.tag = tag
+        self.rng = random.Random(tag)
+        self.counter = 0
+
+    def _new_record(self):
+        self.counter += 1
+        return {'kode_mk': f'{self.tag}-{self.counter}',
+                'nama_mk': f'Benchmark {self.counter}', 'sks': 3, 'semester': 1}
+
+    def list(self):
+        return ('GET', f'/api/matakuliah?limit={self.page_size}'
+                       f'&semester={self.rng.randint(1, 8)}', None, {})
+
+    def detail(self):
+        return 'GET', f'/api/matakuliah/{self.rng.randint(1, self.rows)}', None, {}
+
+    def add(self):
+        return 'POST', '/api/matakuliah', self._new_record(), {}
+
+    def update(self):
+        # If-Match: * melewati cek versi tetapi tetap lewat UPDATE berversi
+        return ('PUT', f'/api/matakuliah/{self.rng.randint(1, self.rows)}',
+                {'nama_mk': f'Diubah {self.rng.random()}'}, {'If-Match': '*'})
+
+    def prepare_delete(self):
+        # Baris yang dihapus dibuat dulu agar jumlah baris tetap. Latensinya
+        # tidak diukur, tetapi ikut mengurangi throughput delete.
+        return self.add()
+
+
+def _encode(body):
+    return None if body is None else json.dumps(body).encode('utf-8')
+
+
+def summarize(latencies, errors, elapsed):
+    samples = sorted(latencies)
+    count = len(samples)
+
+    def percentile(p):
+        if not samples:
+            return None
+        return round(samples[min(count - 1, int(count * p))] * 1000, 3)
+
+    return {
+        'requests': count,
+        'errors': errors,
+        'requests_per_sec': round(count / elapsed, 1) if elapsed else None,
+        'mean_ms': round(sum(samples) / count * 1000, 3) if samples else None,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def run_inprocess(app, operation, rows, options):
+    workload = Workload(rows, options.page_size, f'IP{operation}')
+    latencies = []
+    errors = 0
+
+    def call(method, path, body, headers):
+        request = Request.blank(path, method=method, body=_encode(body),
+                                content_type='application/json' if body else None,
+                                headers=headers)
+        return request.get_response(app)
+
+    for _ in range(options.warmup):
+        call(*workload.list())
+    start = time.perf_counter()
+    for _ in range(options.iterations):
+        if operation == 'delete':
+            response = call(*workload.prepare_delete())
+            request = ('DELETE', f"/api/matakuliah/{response.json['matakuliah']['id']}",
+                       None, {})
+        else:
+            request = getattr(workload, operation)()
+        begin = time.perf_counter()
+        response = call(*request)
+        latency = time.perf_counter() - begin
+        if response.status_int != 200:
+            errors += 1
+            continue
+        latencies.append(latency)
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def run_server(port, operation, rows, options):
+    latencies = [[] for _ in range(options.clients)]
+    errors = [0] * options.clients
+    stop = threading.Event()
+
+    def connect():
+        return http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+
+    def send(connection, method, path, body, headers):
+        if body is not None:
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        connection.request(method, path, body=_encode(body), headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def client(index):
+        workload = Workload(rows, options.page_size, f'SV{operation}{index}')
+        connection = connect()
+        while not stop.is_set():
+            try:
+                if operation == 'delete':
+                    _, data = send(connection, *workload.prepare_delete())
+                    id = json.loads(data)['matakuliah']['id']
+                    request = ('DELETE', f'/api/matakuliah/{id}', None, {})
+                else:
+                    request = getattr(workload, operation)()
+                begin = time.perf_counter()
+                status, _ = send(connection, *request)
+                latency = time.perf_counter() - begin
+            except (OSError, ValueError, KeyError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                connection = connect()
+                continue
+            if status != 200:
+                errors[index] += 1
+                continue
+            latencies[index].append(latency)
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,))
+               for i in range(options.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(options.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return summarize([value for values in latencies for value in values],
+                     sum(errors), elapsed)
+
+
+def bench_size(rows, options, directory):
+    path = os.path.join(directory, f'bench_{rows}.sqlite')
+    settings = {
+        'sqlalchemy.url': f'sqlite:///{path}',
+        'sqlalchemy.sqlite.journal_mode': 'wal',
+        'sqlalchemy.sqlite.synchronous': 'normal',
+        'sqlalchemy.sqlite.busy_timeout': '5000',
+        # Cache dimatikan agar yang diukur adalah jalur database
+        'matakuliah.cache.backend': 'none',
+    }
+    started = time.perf_counter()
+    seed(settings, rows)
+    print(f'{rows} baris diisi dalam {time.perf_counter() - started:.1f} detik',
+          file=sys.stderr)
+
+    results = []
+    if 'inprocess' in options.modes:
+        app = make_app({}, **settings)
+        for operation in options.operations:
+            result = run_inprocess(app, operation, rows, options)
+            results.append(dict({'size': rows, 'mode': 'inprocess',
+                                 'operation': operation, 'clients': 1}, **result))
+        app.registry['dbsession_factory'].kw['bind'].dispose()
+
+    if 'server' in options.modes:
+        port = _free_port()
+        process = multiprocessing.Process(
+            target=serve_wsgi, args=(settings, port, options.threads), daemon=True)
+        process.start()
+        try:
+            _wait_ready(port)
+            for operation in options.operations:
+                result = run_server(port, operation, rows, options)
+                results.append(dict({'size': rows, 'mode': 'server',
+                                     'operation': operation,
+                                     'clients': options.clients}, **result))
+        finally:
+            process.terminate()
+            process.join()
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(result):
+    return (result['size'], result['mode'], result['operation'], result['clients'])
+
+
+def compare(results, baseline, tolerance):
+    """Daftar regresi dibanding hasil ``baseline`` (dict JSON suite ini)"""
+    previous = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get(_key(result))
+        if base is None or not base['requests'] or not result['requests']:
+            continue
+        name = '{}/{}/{}'.format(result['size'], result['mode'], result['operation'])
+        if result['requests_per_sec'] < base['requests_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {base['requests_per_sec']} -> "
+                f"{result['requests_per_sec']} req/s")
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']} -> {result['p95_ms']} ms")
+    return regressions
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=lambda v: [int(float(s)) for s in _csv(v)],
+                        default=[1000, 10000],
+                        help='jumlah baris, dipisah koma, misalnya 1e3,1e4,1e5,1e6')
+    parser.add_argument('--modes', type=_csv, default=['inprocess', 'server'])
+    parser.add_argument('--operations', type=_csv, default=list(OPERATIONS))
+    parser.add_argument('--iterations', type=int, default=500,
+                        help='request per operasi pada mode inprocess')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5,
+                        help='durasi per operasi pada mode server')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='jumlah thread waitress')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--output', help='tulis hasil JSON ke file ini')
+    parser.add_argument('--compare', help='file JSON hasil sebelumnya')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    options = parser.parse_args(argv[1:])
+    unknown = set(options.operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f'Operasi tidak dikenal: {", ".join(sorted(unknown))}')
+    return options
+
+
+def main(argv=sys.argv):
+    options = parse_args(argv)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in options.sizes:
+            results.extend(bench_size(rows, options, directory))
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'options': {name: value for name, value in vars(options).items()
+                        if name not in ('output', 'compare')},
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare(results, json.load(f), options.tolerance)
+        for regression in regressions:
+            print(f'REGRESI {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Benchmark WSGI (waitress) vs ASGI (uvicorn) pada database SQLite yang sama.
+
+Database diisi ``--rows`` matakuliah, lalu masing-masing server dijalankan
+di proses terpisah dan dibebani ``--clients`` klien konkuren dengan koneksi
+keep-alive. Setiap klien bergantian memanggil daftar (satu halaman) dan
+detail acak. Hasil dicetak sebagai JSON: request/detik serta latensi p50/p99.
+
+    python benchmarks/wsgi_vs_asgi.py --rows 10000 --clients 16 --seconds 10
+
+Membutuhkan extra ``asgi`` (aiosqlite, uvicorn).
+"""
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.models.meta import Base
+
+
+def seed(settings, rows):
+    engine = models.get_engine(settings)
+    Base.metadata.create_all(engine)
+    records = [
+        {'kode_mk': f'IF{i:07d}', 'nama_mk': f'Matakuliah {i}',
+         'sks': 2 + i % 3, 'semester': 1 + i % 8}
+        for i in range(rows)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(models.Matakuliah.__table__), records)
+    engine.dispose()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve_wsgi(settings, port, threads):
+    import waitress
+    from manajemen_matakuliah import main
+    # Peringatan "Task queue depth" memang diharapkan saat dibebani
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+    waitress.serve(main({}, **settings), host='127.0.0.1', port=port,
+                   threads=threads, _quiet=True)
+
+
+def serve_asgi(settings, port):
+    import uvicorn
+    from manajemen_matakuliah.asgi import create_app
+    uvicorn.run(create_app(settings), host='127.0.0.1', port=port,
+                log_level='warning', access_log=False)
+
+
+def _wait_ready(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/matakuliah?limit=1')
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server pada port {port} tidak siap')
+
+
+def load(port, clients, seconds, rows, page_size):
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop = threading.Event()
+
+    def client(index):
+        rng = random.Random(index)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        n = 0
+        while not stop.is_set():
+            if n % 2:
+                path = f'/api/matakuliah/{rng.randint(1, rows)}'
+            else:
+                path = f'/api/matakuliah?limit={page_size}&semester={rng.randint(1, 8)}'
+            n += 1
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[index] += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            latencies[index].append(time.perf_counter() - start)
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    samples = sorted(value for values in latencies for value in values)
+    count = len(samples)
+
+    def percentile(p):
+        if not samples:
+            return None
+        return round(samples[min(count - 1, int(count * p))] * 1000, 2)
+
+    return {
+        'requests': count,
+        'errors': sum(errors),
+        'requests_per_sec': round(count / seconds, 1),
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def run(name, target, args, settings, options):
+    port = _free_port()
+    process = multiprocessing.Process(
+        target=target, args=(settings, port) + args, daemon=True)
+    process.start()
+    try:
+        _wait_ready(port)
+        result = load(port, options.clients, options.seconds, options.rows,
+                      options.page_size)
+    finally:
+        process.terminate()
+        process.join()
+    return dict({'server': name, 'clients': options.clients}, **result)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=8,
+                        help='jumlah thread waitress')
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], action='append')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings = {
+            'sqlalchemy.url': f"sqlite:///{os.path.join(directory, 'bench.sqlite')}",
+            'sqlalchemy.sqlite.journal_mode': 'wal',
+            'sqlalchemy.sqlite.synchronous': 'normal',
+            'sqlalchemy.sqlite.busy_timeout': '5000',
+            # Cache dimatikan agar yang diukur adalah jalur database
+            'matakuliah.cache.backend': 'none',
+        }
+        seed(settings, options.rows)
+
+        servers = {
+            'wsgi': (serve_wsgi, (options.threads,)),
+            'asgi': (serve_asgi, ()),
+        }
+        results = [
+            run(name, *servers[name], settings, options)
+            for name in (options.server or ['wsgi', 'asgi'])
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,38 @@
-from pyramid.config import Configurator
+import time
+
+_import_started = time.perf_counter()
+
+from pyramid.config import Configurator  # noqa: E402
+
+from .renderers import FastJSONRenderer  # noqa: E402
+from .startup import include_views  # noqa: E402
+
+# Waktu import paket (termasuk SQLAlchemy dan configure_mappers di models)
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 
 def main(global_config, **settings):
     """ This function returns a Pyramid WSGI application.
     """
+    started = time.perf_counter()
     with Configurator(settings=settings) as config:
         config.include('pyramid_tm')
         config.include('pyramid_jinja2')
+        # Renderer JSON cepat (orjson bila ada), dipakai view API
+        config.add_renderer('fastjson', FastJSONRenderer())
         config.include('.routes')
         config.include('.models')
-        config.scan()
+        config.include('.cache')
+        config.include('.compression')
+        config.include('.instrumentation')
+        config.include('.query_guard')
+        # Warm-up dan laporan waktu boot, lihat startup.py
+        config.include('.startup')
+        include_views(config)
+    # Konfigurasi di-commit saat blok with selesai; warm-up berjalan di
+    # make_wsgi_app (event ApplicationCreated)
+    config.registry['matakuliah_boot_times'] = {
+        'import': IMPORT_SECONDS,
+        'configure': time.perf_counter() - started,
+    }
     return config.make_wsgi_app()
@@ -0,0 +1,34 @@
+"""add table_version
+
+Revision ID: 27f3eb696224
+Revises: de9fabaf6f29
+Create Date: 2026-10-18 11:52:07.418230
+
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '27f3eb696224'
+down_revision = 'de9fabaf6f29'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    table_version = op.create_table('table_version',
+    sa.Column('table_name', sa.Text(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name', name=op.f('pk_table_version'))
+    )
+    op.bulk_insert(table_version, [{
+        'table_name': 'matakuliah',
+        'version': 1,
+        'updated_at': datetime.datetime.utcnow().replace(microsecond=0),
+    }])
+
+def downgrade():
+    op.drop_table('table_version')
@@ -0,0 +1,40 @@
+"""restore table_version for the list ETag
+
+Revision ID: 3b7e9c2d5f10
+Revises: 8d2f4a6c1b93
+Create Date: 2026-10-18 16:02:44.518309
+
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e9c2d5f10'
+down_revision = '8d2f4a6c1b93'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # ETag daftar kembali dari penghitung yang dinaikkan setiap penulisan;
+    # sidik jari count(*)/max() memindai tabel dan bisa melewatkan UPDATE.
+    # Baris dibuat di sini agar penulis cukup menjalankan UPDATE atomik.
+    table_version = op.create_table('table_version',
+    sa.Column('table_name', sa.Text(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name', name=op.f('pk_table_version'))
+    )
+    op.bulk_insert(table_version, [{
+        'table_name': 'matakuliah',
+        'version': 1,
+        'updated_at': datetime.datetime.utcnow().replace(microsecond=0),
+    }])
+    op.drop_index('ix_matakuliah_updated_at', table_name='matakuliah')
+
+def downgrade():
+    op.create_index('ix_matakuliah_updated_at', 'matakuliah',
+                    ['updated_at'], unique=False)
+    op.drop_table('table_version')
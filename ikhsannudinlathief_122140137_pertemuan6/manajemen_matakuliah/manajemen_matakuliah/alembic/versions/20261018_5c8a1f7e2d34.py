@@ -0,0 +1,53 @@
+"""add matakuliah_fts full-text index
+
+Revision ID: 5c8a1f7e2d34
+Revises: b3e5d0c41a97
+Create Date: 2026-10-18 12:21:15.530864
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8a1f7e2d34'
+down_revision = 'b3e5d0c41a97'
+branch_labels = None
+depends_on = None
+
+# FTS5 hanya tersedia di SQLite, engine lain memakai pencarian fallback
+# di views/api/matakuliah_search.py. Salinan untuk create_all ada di
+# models/fts.py; migrasi tetap berdiri sendiri agar riwayatnya tidak berubah
+TRIGGERS = (
+    """CREATE TRIGGER matakuliah_fts_ai AFTER INSERT ON matakuliah BEGIN
+        INSERT INTO matakuliah_fts(rowid, nama_mk) VALUES (new.id, new.nama_mk);
+    END""",
+    """CREATE TRIGGER matakuliah_fts_ad AFTER DELETE ON matakuliah BEGIN
+        INSERT INTO matakuliah_fts(matakuliah_fts, rowid, nama_mk)
+        VALUES ('delete', old.id, old.nama_mk);
+    END""",
+    """CREATE TRIGGER matakuliah_fts_au AFTER UPDATE OF nama_mk ON matakuliah BEGIN
+        INSERT INTO matakuliah_fts(matakuliah_fts, rowid, nama_mk)
+        VALUES ('delete', old.id, old.nama_mk);
+        INSERT INTO matakuliah_fts(rowid, nama_mk) VALUES (new.id, new.nama_mk);
+    END""",
+)
+
+def upgrade():
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS matakuliah_fts USING fts5("
+        "nama_mk, content='matakuliah', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    # Isi index dari data matakuliah yang sudah ada
+    op.execute("INSERT INTO matakuliah_fts(matakuliah_fts) VALUES ('rebuild')")
+
+def downgrade():
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    for name in ('matakuliah_fts_au', 'matakuliah_fts_ad', 'matakuliah_fts_ai'):
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.execute('DROP TABLE IF EXISTS matakuliah_fts')
@@ -0,0 +1,47 @@
+"""add matakuliah updated_at, drop table_version
+
+Revision ID: 8d2f4a6c1b93
+Revises: e41d6b9c3f58
+Create Date: 2026-10-18 14:10:32.207415
+
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4a6c1b93'
+down_revision = 'e41d6b9c3f58'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # ADD COLUMN biasa (bukan batch) agar trigger FTS tetap ada; SQLite tidak
+    # menerima default CURRENT_TIMESTAMP pada ADD COLUMN, jadi baris lama
+    # diisi dengan UPDATE
+    op.add_column('matakuliah', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    matakuliah = sa.table('matakuliah', sa.column('updated_at', sa.DateTime()))
+    op.execute(matakuliah.update().values(
+        updated_at=datetime.datetime.utcnow()))
+    op.create_index('ix_matakuliah_updated_at', 'matakuliah',
+                    ['updated_at'], unique=False)
+    # ETag daftar kini dihitung dari baris matakuliah, bukan dari satu baris
+    # penghitung yang dikunci setiap penulisan
+    op.drop_table('table_version')
+
+def downgrade():
+    table_version = op.create_table('table_version',
+    sa.Column('table_name', sa.Text(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name', name=op.f('pk_table_version'))
+    )
+    op.bulk_insert(table_version, [{
+        'table_name': 'matakuliah',
+        'version': 1,
+        'updated_at': datetime.datetime.utcnow().replace(microsecond=0),
+    }])
+    op.drop_index('ix_matakuliah_updated_at', table_name='matakuliah')
+    op.drop_column('matakuliah', 'updated_at')
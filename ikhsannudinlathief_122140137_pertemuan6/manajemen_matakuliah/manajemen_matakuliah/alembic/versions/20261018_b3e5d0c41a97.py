@@ -0,0 +1,27 @@
+"""add matakuliah filter indexes
+
+Revision ID: b3e5d0c41a97
+Revises: 27f3eb696224
+Create Date: 2026-10-18 12:06:41.902115
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e5d0c41a97'
+down_revision = '27f3eb696224'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_matakuliah_semester', 'matakuliah', ['semester', 'id'], unique=False)
+    op.create_index('ix_matakuliah_sks', 'matakuliah', ['sks', 'id'], unique=False)
+    op.create_index('ix_matakuliah_semester_sks', 'matakuliah', ['semester', 'sks'], unique=False)
+    op.create_index('ix_matakuliah_nama_mk', 'matakuliah', ['nama_mk', 'id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_matakuliah_nama_mk', table_name='matakuliah')
+    op.drop_index('ix_matakuliah_semester_sks', table_name='matakuliah')
+    op.drop_index('ix_matakuliah_sks', table_name='matakuliah')
+    op.drop_index('ix_matakuliah_semester', table_name='matakuliah')
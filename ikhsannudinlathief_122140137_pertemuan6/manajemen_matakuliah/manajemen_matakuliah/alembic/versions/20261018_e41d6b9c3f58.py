@@ -0,0 +1,25 @@
+"""add matakuliah version column
+
+Revision ID: e41d6b9c3f58
+Revises: 5c8a1f7e2d34
+Create Date: 2026-10-18 13:02:44.118503
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41d6b9c3f58'
+down_revision = '5c8a1f7e2d34'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # ADD COLUMN biasa (bukan batch) agar trigger FTS pada tabel matakuliah
+    # tidak hilang karena tabel dibuat ulang
+    op.add_column('matakuliah', sa.Column(
+        'version', sa.Integer(), nullable=False, server_default='1'))
+
+def downgrade():
+    op.drop_column('matakuliah', 'version')
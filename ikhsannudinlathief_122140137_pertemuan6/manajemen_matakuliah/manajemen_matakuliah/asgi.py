@@ -0,0 +1,445 @@
+"""
+Aplikasi ASGI untuk API matakuliah dengan SQLAlchemy async.
+
+Route, body JSON, pesan error dan ETag sama dengan aplikasi Pyramid (WSGI).
+Parsing parameter dan query diambil dari ``queries``, sedangkan operasi bulk
+dan pencarian yang masih sinkron dijalankan lewat ``AsyncSession.run_sync``.
+Aplikasi WSGI tetap dijalankan dengan ``pserve``; aplikasi ini dijalankan
+dengan server ASGI, misalnya::
+
+    MATAKULIAH_INI=production.ini uvicorn --factory manajemen_matakuliah.asgi:create_app
+
+Read replica dan cache response hanya tersedia pada aplikasi WSGI.
+"""
+import datetime
+import email.utils
+import json
+import os
+import re
+from urllib.parse import parse_qsl
+
+from pyramid.paster import get_appsettings
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from .conditional import check_version, detail_etag, list_etag, row_etag
+from .models.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    bulk_delete_matakuliah,
+    bulk_update_matakuliah,
+    upsert_matakuliah,
+)
+from .models.engine import create_async_engine_from_settings
+from .models.matakuliah import Matakuliah
+from .models.table_version import register_version_events
+from .queries import (
+    DEFAULT_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    REQUIRED_FIELDS,
+    UPDATE_FIELDS,
+    build_list_query,
+    export_query,
+    list_page,
+    parse_bulk_values,
+    parse_int_param,
+    parse_selection,
+    read_json_object,
+    read_records,
+    search_tokens,
+    validate_field,
+    validate_matakuliah,
+    validate_records,
+)
+from .renderers import RowList, ndjson, render
+from .views.api.matakuliah_search import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    search_fts,
+    search_like,
+)
+
+# File .ini yang dibaca create_app bila settings tidak diberikan
+INI_ENV = 'MATAKULIAH_INI'
+
+
+class VersionedSession(Session):
+    """Session sinkron di balik AsyncSession, dengan event versi tabel"""
+
+
+register_version_events(VersionedSession)
+
+
+class AsgiRequest:
+    """Request minimal dengan atribut yang dipakai helper di ``queries``"""
+
+    def __init__(self, scope, body, matchdict):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.params = dict(parse_qsl(
+            scope['query_string'].decode('latin-1'), keep_blank_values=True))
+        self.headers = {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        self.body = body
+        self.matchdict = matchdict
+
+    @property
+    def content_type(self):
+        return self.headers.get('content-type', '').split(';')[0].strip()
+
+    @property
+    def json_body(self):
+        return json.loads(self.body)
+
+
+class Response:
+    def __init__(self, body=None, status=200, headers=None,
+                 content_type='application/json', app_iter=None):
+        self.status = status
+        self.headers = dict(headers or {})
+        self.headers.setdefault('content-type', content_type)
+        if body is not None and not isinstance(body, bytes):
+            body = render(body)
+        self.body = body or b''
+        self.app_iter = app_iter
+
+
+def json_error(status, error):
+    return Response({'error': error}, status=status)
+
+
+def _conditional_headers(etag, last_modified):
+    headers = {'etag': f'"{etag}"', 'cache-control': 'no-cache'}
+    if last_modified is not None:
+        headers['last-modified'] = email.utils.format_datetime(
+            last_modified.replace(tzinfo=datetime.timezone.utc), usegmt=True)
+    return headers
+
+
+def _not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or f'"{etag}"' in tags or f'W/"{etag}"' in tags
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= since.replace(tzinfo=None)
+    return False
+
+
+def conditional(make_etag):
+    """Versi async dari conditional_view: 304 bila versi data tidak berubah"""
+    def decorator(handler):
+        async def wrapper(app, request):
+            async with app.session_factory() as session:
+                etag, last_modified = await session.run_sync(make_etag, request)
+            if etag is None:
+                return await handler(app, request)
+            headers = _conditional_headers(etag, last_modified)
+            if _not_modified(request, etag, last_modified):
+                return Response(status=304, headers=headers)
+            response = await handler(app, request)
+            if response.status == 200:
+                response.headers.update(headers)
+            return response
+        return wrapper
+    return decorator
+
+
+@conditional(list_etag)
+async def matakuliah_list(app, request):
+    try:
+        query, limit, order_field = build_list_query(
+            request.params, app.page_size, app.max_page_size)
+    except ValueError as e:
+        return json_error(400, str(e))
+    async with app.session_factory() as session:
+        rows = (await session.execute(query)).all()
+    return Response(list_page(rows, limit, order_field))
+
+
+async def _export_app_iter(app):
+    async with app.session_factory() as session:
+        query = export_query().execution_options(yield_per=app.export_batch_size)
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield ndjson(rows)
+
+
+async def matakuliah_export(app, request):
+    return Response(
+        content_type='application/x-ndjson',
+        headers={'content-disposition': 'attachment; filename="matakuliah.ndjson"'},
+        app_iter=_export_app_iter(app),
+    )
+
+
+@conditional(list_etag)
+async def matakuliah_search(app, request):
+    q = request.params.get('q', '')
+    try:
+        limit = parse_int_param(request.params, 'limit',
+                                default=DEFAULT_SEARCH_LIMIT, minimum=1)
+    except ValueError as e:
+        return json_error(400, str(e))
+    if not search_tokens(q):
+        return json_error(400, 'Parameter q wajib diisi')
+    limit = min(limit, MAX_SEARCH_LIMIT)
+
+    search = search_fts if app.engine.dialect.name == 'sqlite' else search_like
+    async with app.session_factory() as session:
+        rows = await session.run_sync(search, q, limit)
+    return Response({'matakuliahs': RowList(rows)})
+
+
+async def matakuliah_bulk_upsert(app, request):
+    try:
+        records = read_records(request)
+    except ValueError as e:
+        return json_error(400, str(e))
+    if not records:
+        return json_error(400, 'Tidak ada matakuliah yang dikirim')
+
+    valid, results = validate_records(records)
+    if not valid:
+        return Response({'success': False, 'results': results}, status=400)
+
+    rows = [{field: data[field] for field in REQUIRED_FIELDS} for data in records]
+    async with app.session_factory() as session, session.begin():
+        ids = await session.run_sync(
+            upsert_matakuliah, rows, chunk_size=app.bulk_chunk_size)
+
+    for result, row in zip(results, rows):
+        result['id'] = ids[row['kode_mk']]
+        result['kode_mk'] = row['kode_mk']
+    return Response({'success': True, 'count': len(rows), 'results': results})
+
+
+async def matakuliah_bulk_update(app, request):
+    try:
+        json_data = read_json_object(request)
+        criteria = parse_selection(json_data)
+        values = parse_bulk_values(json_data)
+    except ValueError as e:
+        return json_error(400, str(e))
+
+    async with app.session_factory() as session, session.begin():
+        ids = await session.run_sync(bulk_update_matakuliah, criteria, values)
+    return Response({'success': True, 'count': len(ids), 'ids': ids})
+
+
+async def matakuliah_bulk_delete(app, request):
+    try:
+        criteria = parse_selection(read_json_object(request))
+    except ValueError as e:
+        return json_error(400, str(e))
+
+    async with app.session_factory() as session, session.begin():
+        ids = await session.run_sync(bulk_delete_matakuliah, criteria)
+    return Response({'success': True, 'count': len(ids), 'ids': ids})
+
+
+async def _get_matakuliah(session, matakuliah_id):
+    result = await session.execute(
+        select(Matakuliah).filter_by(id=matakuliah_id))
+    return result.scalars().first()
+
+
+@conditional(detail_etag)
+async def matakuliah_detail(app, request):
+    async with app.session_factory() as session:
+        matakuliah = await _get_matakuliah(session, request.matchdict['id'])
+        if matakuliah is None:
+            return json_error(404, 'Matakuliah tidak ditemukan')
+        return Response({'matakuliah': matakuliah.to_dict()})
+
+
+async def matakuliah_add(app, request):
+    try:
+        json_data = request.json_body
+        error = validate_matakuliah(json_data)
+        if error is not None:
+            return json_error(400, error)
+
+        async with app.session_factory() as session, session.begin():
+            matakuliah = Matakuliah(
+                **{field: json_data[field] for field in REQUIRED_FIELDS})
+            session.add(matakuliah)
+            await session.flush()
+            data = matakuliah.to_dict()
+        return Response({'success': True, 'matakuliah': data})
+    except IntegrityError:
+        # session.begin() sudah rollback; pesan database tidak dikirim ke klien
+        return json_error(409, 'kode_mk sudah dipakai matakuliah lain')
+    except ValueError as e:
+        return json_error(400, str(e))
+
+
+async def matakuliah_update(app, request):
+    async with app.session_factory() as session:
+        try:
+            async with session.begin():
+                matakuliah = await _get_matakuliah(session, request.matchdict['id'])
+                if matakuliah is None:
+                    return json_error(404, 'Matakuliah tidak ditemukan')
+                json_data = read_json_object(request)
+                problem = check_version(
+                    request.headers.get('if-match'), json_data, matakuliah)
+                if problem is not None:
+                    return json_error(*problem)
+                # Semua field divalidasi sebelum ada yang diubah: return di
+                # dalam session.begin() tetap meng-commit perubahan sebelumnya
+                for field in UPDATE_FIELDS:
+                    if field in json_data:
+                        error = validate_field(field, json_data[field])
+                        if error is not None:
+                            return json_error(400, error)
+                for field in UPDATE_FIELDS:
+                    if field in json_data:
+                        setattr(matakuliah, field, json_data[field])
+                await session.flush()
+                data = matakuliah.to_dict()
+        except StaleDataError:
+            return json_error(409, 'Matakuliah sudah diubah, ambil ulang data terbaru')
+        except IntegrityError:
+            return json_error(409, 'kode_mk sudah dipakai matakuliah lain')
+        except ValueError as e:
+            return json_error(400, str(e))
+    etag = row_etag(data['id'], data['version'])
+    return Response({'success': True, 'matakuliah': data},
+                    headers={'etag': f'"{etag}"'})
+
+
+async def matakuliah_delete(app, request):
+    matakuliah_id = request.matchdict['id']
+    async with app.session_factory() as session, session.begin():
+        matakuliah = await _get_matakuliah(session, matakuliah_id)
+        if matakuliah is None:
+            return json_error(404, 'Matakuliah tidak ditemukan')
+        await session.delete(matakuliah)
+    return Response({
+        'success': True,
+        'message': f'Matakuliah dengan id {matakuliah_id} berhasil dihapus',
+    })
+
+
+# Urutan sama dengan routes.py: route statis sebelum /api/matakuliah/{id}
+ROUTES = [
+    ('GET', '/api/matakuliah', matakuliah_list),
+    ('GET', '/api/matakuliah/export', matakuliah_export),
+    ('GET', '/api/matakuliah/search', matakuliah_search),
+    ('POST', '/api/matakuliah/bulk', matakuliah_bulk_upsert),
+    ('PATCH', '/api/matakuliah/bulk', matakuliah_bulk_update),
+    ('DELETE', '/api/matakuliah/bulk', matakuliah_bulk_delete),
+    ('GET', '/api/matakuliah/{id}', matakuliah_detail),
+    ('POST', '/api/matakuliah', matakuliah_add),
+    ('PUT', '/api/matakuliah/{id}', matakuliah_update),
+    ('DELETE', '/api/matakuliah/{id}', matakuliah_delete),
+]
+
+
+def _compile(pattern):
+    return re.compile('^' + re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', pattern) + '$')
+
+
+class MatakuliahASGI:
+    """Aplikasi ASGI (HTTP + lifespan) untuk endpoint /api/matakuliah"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.engine = create_async_engine_from_settings(settings)
+        self.session_factory = async_sessionmaker(
+            self.engine, sync_session_class=VersionedSession,
+            expire_on_commit=False)
+        self.page_size = int(settings.get('matakuliah.page_size', DEFAULT_PAGE_SIZE))
+        self.max_page_size = int(settings.get('matakuliah.max_page_size', MAX_PAGE_SIZE))
+        self.export_batch_size = int(settings.get(
+            'matakuliah.export.batch_size', EXPORT_BATCH_SIZE))
+        self.bulk_chunk_size = int(settings.get(
+            'matakuliah.bulk.chunk_size', DEFAULT_CHUNK_SIZE))
+        self.routes = [
+            (method, _compile(pattern), handler)
+            for method, pattern, handler in ROUTES
+        ]
+
+    def match(self, method, path):
+        for route_method, regex, handler in self.routes:
+            if route_method != method:
+                continue
+            match = regex.match(path)
+            if match is not None:
+                return handler, match.groupdict()
+        return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler, matchdict = self.match(scope['method'], scope['path'])
+        if handler is None:
+            # Sama dengan Pyramid, route tanpa method yang cocok dianggap 404
+            await _send(send, json_error(404, 'Halaman tidak ditemukan'))
+            return
+        request = AsgiRequest(scope, await _read_body(receive), matchdict)
+        await _send(send, await handler(self, request))
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+async def _read_body(receive):
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+async def _send(send, response):
+    headers = [
+        (name.encode('latin-1'), value.encode('latin-1'))
+        for name, value in response.headers.items()
+    ]
+    if response.app_iter is None:
+        headers.append((b'content-length', str(len(response.body)).encode('ascii')))
+        await send({'type': 'http.response.start', 'status': response.status,
+                    'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.body})
+        return
+
+    await send({'type': 'http.response.start', 'status': response.status,
+                'headers': headers})
+    async for chunk in response.app_iter:
+        await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def create_app(settings=None):
+    """
+    Factory aplikasi ASGI. Tanpa argumen, settings dibaca dari file .ini
+    pada environment variable MATAKULIAH_INI (default development.ini).
+    """
+    if settings is None:
+        settings = get_appsettings(os.environ.get(INI_ENV, 'development.ini'))
+    return MatakuliahASGI(settings)
@@ -0,0 +1,219 @@
+"""
+Cache response untuk endpoint baca matakuliah.
+
+Entry cache diberi tag (misalnya ``matakuliah:list`` dan ``matakuliah:<id>``)
+sehingga penulisan cukup menghapus tag yang terdampak. Penghapusan dijalankan
+lewat after-commit hook transaksi pyramid_tm, jadi cache baru dibersihkan
+ketika transaksi benar-benar commit.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from pyramid.exceptions import ConfigurationError
+
+from .renderers import json_default
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+LIST_TAG = 'matakuliah:list'
+
+
+def item_tag(matakuliah_id):
+    return f'matakuliah:{matakuliah_id}'
+
+
+class CacheBackend:
+    """Antarmuka backend cache response"""
+
+    def get(self, key):
+        """Kembalikan nilai untuk key, atau None jika tidak ada/kadaluarsa"""
+        raise NotImplementedError
+
+    def set(self, key, value, tags=()):
+        """Simpan nilai beserta tag yang dipakai untuk invalidasi"""
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags):
+        """Hapus semua entry yang memiliki salah satu tag"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Cache LRU in-process dengan TTL, aman dipakai banyak thread"""
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, value, tags)
+        self._tags = {}                 # tag -> set(key)
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, tags=()):
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Cache bersama antar proses menggunakan Redis (butuh paket redis)"""
+
+    def __init__(self, url, ttl=60, prefix='manajemen_matakuliah:'):
+        if redis is None:
+            raise ConfigurationError(
+                'matakuliah.cache.backend = redis membutuhkan paket redis')
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key, value, tags=()):
+        key = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.set(key, json.dumps(value, default=json_default), ex=self.ttl)
+        for tag in tags:
+            pipe.sadd(self.prefix + 'tag:' + tag, key)
+            pipe.expire(self.prefix + 'tag:' + tag, self.ttl)
+        pipe.execute()
+
+    def invalidate_tags(self, tags):
+        for tag in tags:
+            tag_key = self.prefix + 'tag:' + tag
+            keys = self.client.smembers(tag_key)
+            pipe = self.client.pipeline()
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(tag_key)
+            pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+def cache_key(request):
+    """
+    Key cache dari nama route, matchdict dan parameter query yang diurutkan.
+    ETag yang sudah dihitung conditional_view ikut dimasukkan sehingga data
+    yang terbaca sebelum commit penulis tidak tersaji dengan versi baru.
+    """
+    route_name = request.matched_route.name if request.matched_route else ''
+    matchdict = urlencode(sorted((request.matchdict or {}).items()))
+    params = urlencode(sorted(request.GET.items()))
+    etag = request.environ.get('manajemen_matakuliah.etag', '')
+    return f'{route_name}?{matchdict}?{params}?{etag}'
+
+
+def get_cache(request):
+    return request.registry.get('matakuliah_cache')
+
+
+def cached_view(tags):
+    """
+    Decorator view read-through: hasil dict dari view disimpan dengan tag
+    ``tags(request)``. Response lain (error, 304, dsb.) tidak di-cache.
+    """
+    def decorator(view):
+        def wrapper(context, request):
+            cache = get_cache(request)
+            if cache is None:
+                return view(context, request)
+            key = cache_key(request)
+            result = cache.get(key)
+            if result is None:
+                result = view(context, request)
+                if isinstance(result, dict):
+                    cache.set(key, result, tags(request))
+            return result
+        return wrapper
+    return decorator
+
+
+def _invalidate_after_commit(status, cache, tags):
+    # status False berarti transaksi gagal/abort, cache tidak perlu disentuh
+    if status:
+        cache.invalidate_tags(tags)
+
+
+def invalidate_matakuliah(request, ids=()):
+    """
+    Jadwalkan invalidasi cache daftar matakuliah dan detail ``ids`` setelah
+    transaksi request commit.
+    """
+    cache = get_cache(request)
+    if cache is None:
+        return
+    tags = [LIST_TAG] + [item_tag(matakuliah_id) for matakuliah_id in ids]
+    request.tm.get().addAfterCommitHook(
+        _invalidate_after_commit, args=(cache, tags))
+
+
+def build_cache(settings):
+    backend = settings.get('matakuliah.cache.backend', 'memory')
+    ttl = int(settings.get('matakuliah.cache.ttl', 60))
+    if backend in ('none', ''):
+        return None
+    if backend == 'memory':
+        max_entries = int(settings.get('matakuliah.cache.max_entries', 1024))
+        return MemoryCache(max_entries=max_entries, ttl=ttl)
+    if backend == 'redis':
+        return RedisCache(settings['matakuliah.cache.redis_url'], ttl=ttl)
+    raise ConfigurationError(f'Backend cache {backend} tidak dikenal')
+
+
+def includeme(config):
+    config.registry['matakuliah_cache'] = build_cache(config.get_settings())
@@ -0,0 +1,167 @@
+"""
+Kompresi response (gzip/brotli) sebagai tween.
+
+Encoding dipilih dari header ``Accept-Encoding``; brotli hanya ditawarkan
+bila paket ``brotli`` terpasang. Response dikompresi hanya jika content
+type-nya ada di allowlist dan ukurannya minimal ``min_size`` byte. Response
+streaming (tanpa Content-Length, misalnya export NDJSON) dikompresi per
+chunk tanpa menampung seluruh body. Response yang sudah memiliki
+Content-Encoding, misalnya file statis ``.gz``/``.br`` hasil
+``precompress_manajemen_matakuliah_static``, dibiarkan apa adanya.
+"""
+import zlib
+
+from pyramid.settings import asbool, aslist
+from pyramid.tweens import INGRESS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+DEFAULT_CONTENT_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'image/svg+xml',
+    'text/css',
+    'text/html',
+    'text/plain',
+)
+
+
+class GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.flush()
+
+    def compressor(self):
+        # wbits 31 = format gzip (header + trailer CRC32)
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+
+class BrotliEncoder:
+    name = 'br'
+
+    def __init__(self, quality):
+        self.quality = quality
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def compressor(self):
+        return _BrotliStream(brotli.Compressor(quality=self.quality))
+
+
+class _BrotliStream:
+    """Adaptor agar brotli.Compressor punya antarmuka seperti zlib"""
+
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+def _stream(app_iter, compressor):
+    try:
+        for chunk in app_iter:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(app_iter, 'close', None)
+        if close is not None:
+            close()
+
+
+class CompressionPolicy:
+    """Pengaturan kompresi yang dibaca dari ``matakuliah.compression.*``"""
+
+    def __init__(self, settings):
+        prefix = 'matakuliah.compression.'
+        self.enabled = asbool(settings.get(prefix + 'enabled', True))
+        self.min_size = int(settings.get(prefix + 'min_size', DEFAULT_MIN_SIZE))
+        self.content_types = frozenset(aslist(
+            settings.get(prefix + 'content_types', ' '.join(DEFAULT_CONTENT_TYPES))))
+        self.encoders = {}
+        if brotli is not None and asbool(settings.get(prefix + 'brotli', True)):
+            self.encoders['br'] = BrotliEncoder(int(settings.get(
+                prefix + 'brotli_quality', DEFAULT_BROTLI_QUALITY)))
+        self.encoders['gzip'] = GzipEncoder(int(settings.get(
+            prefix + 'gzip_level', DEFAULT_GZIP_LEVEL)))
+
+    def choose(self, request):
+        """Encoder terbaik menurut Accept-Encoding, atau None"""
+        # Tanpa header, WebOb menganggap semua encoding diterima; klien
+        # seperti itu (curl, test) tetap dikirimi body apa adanya
+        if 'Accept-Encoding' not in request.headers:
+            return None
+        offers = request.accept_encoding.acceptable_offers(list(self.encoders))
+        if not offers:
+            return None
+        return self.encoders[offers[0][0]]
+
+    def compressible(self, response):
+        if response.content_encoding or response.status_int in (204, 304):
+            return False
+        if response.content_type not in self.content_types:
+            return False
+        length = response.content_length
+        return length is None or length >= self.min_size
+
+
+def compress_response(policy, request, response):
+    """Kompresi response di tempat bila memenuhi policy"""
+    if not policy.compressible(response):
+        return response
+    # Representasi bergantung pada Accept-Encoding meskipun tidak dikompresi
+    vary = tuple(response.vary or ())
+    if 'Accept-Encoding' not in vary:
+        response.vary = vary + ('Accept-Encoding',)
+    encoder = policy.choose(request)
+    if encoder is None or request.method == 'HEAD':
+        return response
+
+    if response.content_length is None:
+        response.app_iter = _stream(response.app_iter, encoder.compressor())
+        response.content_length = None
+    else:
+        response.body = encoder.compress(response.body)
+    response.content_encoding = encoder.name
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        # Body berbeda per encoding, jadi ETag diturunkan menjadi weak
+        # (If-None-Match tetap cocok karena perbandingannya weak)
+        response.headers['ETag'] = 'W/' + etag
+    return response
+
+
+def compression_tween_factory(handler, registry):
+    policy = CompressionPolicy(registry.settings)
+    if not policy.enabled:
+        return handler
+
+    def compression_tween(request):
+        return compress_response(policy, request, handler(request))
+
+    return compression_tween
+
+
+def includeme(config):
+    config.add_tween(
+        'manajemen_matakuliah.compression.compression_tween_factory',
+        under=INGRESS)
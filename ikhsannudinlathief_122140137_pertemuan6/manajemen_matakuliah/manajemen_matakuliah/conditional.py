@@ -0,0 +1,125 @@
+"""
+Conditional GET (ETag / Last-Modified) untuk endpoint baca matakuliah.
+
+ETag daftar dihitung dari versi tabel di ``table_version`` yang dinaikkan
+di transaksi yang sama dengan setiap penulisan (models/table_version.py).
+ETag detail dari kolom ``version`` milik barisnya. Pengecekan
+``If-None-Match`` hanya satu lookup primary key, tanpa menjalankan query
+utama maupun serialisasi.
+
+ETag detail juga dipakai untuk optimistic locking: PUT wajib mengirim
+``If-Match`` dengan ETag tersebut atau field ``version`` di body.
+"""
+from pyramid.httpexceptions import HTTPNotModified
+from sqlalchemy import select
+
+from .models.matakuliah import Matakuliah
+from .models.table_version import get_table_version
+
+ETAG_ENVIRON_KEY = 'manajemen_matakuliah.etag'
+
+
+def _http_time(value):
+    # Last-Modified HTTP hanya sampai detik
+    return value.replace(microsecond=0) if value is not None else None
+
+
+def list_etag(dbsession, request):
+    """(ETag, Last-Modified) daftar matakuliah dari versi tabel"""
+    table_name = Matakuliah.__tablename__
+    version, last_modified = get_table_version(dbsession, table_name)
+    if version is None:
+        return None, None
+    return f'{table_name}-v{version}', _http_time(last_modified)
+
+
+def row_etag(matakuliah_id, version):
+    return f'matakuliah-{matakuliah_id}-v{version}'
+
+
+def detail_etag(dbsession, request):
+    """
+    (ETag, Last-Modified) satu matakuliah dari kolom version dan updated_at
+    barisnya, atau (None, None) bila baris tidak ada agar view menjawab 404
+    """
+    row = dbsession.execute(
+        select(Matakuliah.id, Matakuliah.version, Matakuliah.updated_at)
+        .where(Matakuliah.id == request.matchdict['id'])
+    ).first()
+    if row is None:
+        return None, None
+    return row_etag(row.id, row.version), _http_time(row.updated_at)
+
+
+def _if_match_tags(value):
+    # ETag bisa menjadi weak (W/) hanya karena body dikompresi, isinya sama,
+    # jadi prefix W/ diabaikan saat membandingkan
+    tags = set()
+    for tag in value.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tags.add(tag.strip('"'))
+    return tags
+
+
+def check_version(if_match, json_data, matakuliah):
+    """
+    Precondition optimistic locking untuk PUT. Mengembalikan None bila boleh
+    lanjut, atau (status, pesan error): 428 tanpa If-Match/version, 412 bila
+    If-Match tidak cocok, 409 bila version di body sudah usang.
+    """
+    if if_match:
+        tags = _if_match_tags(if_match)
+        if '*' in tags or row_etag(matakuliah.id, matakuliah.version) in tags:
+            return None
+        return 412, 'Matakuliah sudah diubah, ambil ulang data terbaru'
+    if 'version' in json_data:
+        version = json_data['version']
+        if not isinstance(version, int) or isinstance(version, bool):
+            return 400, 'Field version harus berupa bilangan bulat'
+        if version == matakuliah.version:
+            return None
+        return 409, (f'Versi matakuliah sudah {matakuliah.version}, '
+                     f'bukan {version}')
+    return 428, 'Header If-Match atau field version wajib diisi'
+
+
+def _not_modified(request, etag, last_modified):
+    if request.if_none_match:
+        return etag in request.if_none_match
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional_view(make_etag):
+    """
+    Decorator view yang menambahkan ETag dan Last-Modified, serta menjawab
+    304 Not Modified tanpa memanggil view bila versi data belum berubah.
+    ``make_etag(dbsession, request)`` mengembalikan (etag, last_modified);
+    etag None berarti data tidak ada dan view dipanggil tanpa pengecekan.
+    """
+    def decorator(view):
+        def wrapper(context, request):
+            etag, last_modified = make_etag(request.read_dbsession, request)
+            if etag is None:
+                return view(context, request)
+            # Dipakai cache_key agar entry cache ikut berganti bersama versi
+            request.environ[ETAG_ENVIRON_KEY] = etag
+            if _not_modified(request, etag, last_modified):
+                response = HTTPNotModified()
+                response.etag = etag
+                response.last_modified = last_modified
+                return response
+
+            result = view(context, request)
+            response = request.response if isinstance(result, dict) else result
+            if response.status_int == 200:
+                response.etag = etag
+                response.last_modified = last_modified
+                # Klien tetap wajib revalidasi, tetapi cukup dengan 304
+                response.cache_control = 'no-cache'
+            return result
+        return wrapper
+    return decorator
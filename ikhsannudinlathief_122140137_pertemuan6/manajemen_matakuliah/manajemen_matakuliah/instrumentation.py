@@ -0,0 +1,301 @@
+"""
+Instrumentasi performa per request.
+
+Tween ``instrumentation_tween_factory`` mencatat waktu total, waktu SQL,
+jumlah statement, dan jumlah baris yang diambil untuk setiap request.
+Angka SQL dikumpulkan oleh event ``before/after_cursor_execute`` yang
+dipasang pada engine di ``models.get_engine`` dan disimpan di ContextVar,
+sehingga setiap thread/request punya penghitung sendiri. Hanya pasangan
+event ini yang mengukur query; modul lain (guard N+1 di query_guard.py)
+menerima data per statement lewat ``observe_statements``.
+
+Hasilnya dikirim lewat header ``Server-Timing``, satu baris log JSON per
+request (logger ``manajemen_matakuliah.instrumentation``), dan histogram
+in-process yang bisa di-scrape dari ``/metrics``.
+
+Response streaming (``app_iter`` bukan list, misalnya export NDJSON)
+menjalankan SQL saat body dibaca, setelah tween selesai. ``app_iter``-nya
+dibungkus ``InstrumentedAppIter`` agar SQL tersebut tetap terhitung; log
+dan metrik baru dicatat saat ``close()``, dan header ``Server-Timing``
+tidak dikirim karena header sudah terkirim sebelum angkanya lengkap.
+"""
+import contextlib
+import contextvars
+import ipaddress
+import json
+import logging
+import time
+
+from pyramid.settings import asbool, aslist
+from pyramid.tweens import INGRESS
+from sqlalchemy import event
+
+from .metrics import Counter, Histogram, MetricsRegistry
+
+log = logging.getLogger(__name__)
+
+_current_stats = contextvars.ContextVar('matakuliah_request_stats', default=None)
+_statement_observers = contextvars.ContextVar('matakuliah_statement_observers', default=())
+
+# Route yang tidak diukur agar scrape tidak mengotori metrik
+EXCLUDED_ROUTES = frozenset(['metrics', '__static/'])
+
+# Alamat yang boleh membaca /metrics bila tidak diatur
+DEFAULT_METRICS_ALLOW = '127.0.0.1 ::1'
+
+# Jumlah baris per request (bukan detik)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+
+class RequestStats:
+    __slots__ = ('sql_time', 'statements', 'rows')
+
+    def __init__(self):
+        self.sql_time = 0.0
+        self.statements = 0
+        self.rows = 0
+
+
+class CountingCursor:
+    """
+    Proxy cursor DBAPI yang menghitung baris yang di-fetch. Dipasang pada
+    ``context.cursor`` sebelum SQLAlchemy membuat Result, sehingga baris yang
+    dibaca lewat Result mana pun (ORM atau Core) ikut terhitung.
+    """
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._stats.rows += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None or _statement_observers.get():
+        conn.info.setdefault('matakuliah_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    observers = _statement_observers.get()
+    if stats is None and not observers:
+        return
+    starts = conn.info.get('matakuliah_query_start')
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    for observer in observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+    if stats is None:
+        return
+    stats.sql_time += elapsed
+    stats.statements += 1
+    if context is not None and not executemany and cursor.description is not None:
+        context.cursor = CountingCursor(cursor, stats)
+
+
+def instrument_engine(engine):
+    """Pasang event penghitung SQL pada engine (dipanggil get_engine)"""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def current_stats():
+    """RequestStats milik request yang sedang berjalan, atau None"""
+    return _current_stats.get()
+
+
+@contextlib.contextmanager
+def observe_statements(observer):
+    """
+    Panggil ``observer(conn, statement, parameters, executemany, elapsed)``
+    untuk setiap statement yang selesai di dalam blok ini. Dipanggil dari
+    event ``after_cursor_execute`` sebelum hasil cursor dibaca.
+    """
+    token = _statement_observers.set(_statement_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _statement_observers.reset(token)
+
+
+class InstrumentedAppIter:
+    """
+    Pembungkus ``app_iter`` streaming. RequestStats request dipasang lagi
+    di ContextVar selama setiap potongan body dibuat, lalu ``finish``
+    dipanggil sekali saat server menutup iterator.
+    """
+
+    def __init__(self, app_iter, stats, finish):
+        self._app_iter = app_iter
+        self._iterator = iter(app_iter)
+        self._stats = stats
+        self._finish = finish
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = _current_stats.set(self._stats)
+        try:
+            return next(self._iterator)
+        finally:
+            _current_stats.reset(token)
+
+    def close(self):
+        token = _current_stats.set(self._stats)
+        try:
+            close = getattr(self._app_iter, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            _current_stats.reset(token)
+            finish, self._finish = self._finish, None
+            if finish is not None:
+                finish()
+
+
+def is_streaming(response):
+    """True bila body response baru dibuat saat dibaca server"""
+    return not isinstance(response.app_iter, (list, tuple))
+
+
+class RequestMetrics:
+    """Kumpulan metrik request yang didaftarkan ke MetricsRegistry"""
+
+    def __init__(self, registry):
+        labels = ('route', 'method')
+        self.requests = registry.register(Counter(
+            'matakuliah_http_requests_total', 'Jumlah request HTTP',
+            labels + ('status',)))
+        self.duration = registry.register(Histogram(
+            'matakuliah_http_request_duration_seconds',
+            'Waktu total request (detik)', labels))
+        self.sql_duration = registry.register(Histogram(
+            'matakuliah_sql_duration_seconds',
+            'Waktu SQL per request (detik)', labels))
+        self.statements = registry.register(Counter(
+            'matakuliah_sql_statements_total', 'Jumlah statement SQL', labels))
+        self.rows = registry.register(Histogram(
+            'matakuliah_sql_rows', 'Jumlah baris yang diambil per request',
+            labels, buckets=ROW_BUCKETS))
+
+    def observe(self, route, method, status, duration, stats):
+        labels = (route, method)
+        self.requests.inc(labels + (status,))
+        self.duration.observe(labels, duration)
+        self.sql_duration.observe(labels, stats.sql_time)
+        self.statements.inc(labels, stats.statements)
+        self.rows.observe(labels, stats.rows)
+
+
+def server_timing(duration, stats):
+    return (
+        f'total;dur={duration * 1000:.2f}, '
+        f'sql;dur={stats.sql_time * 1000:.2f};'
+        f'desc="{stats.statements} statements, {stats.rows} rows"'
+    )
+
+
+def instrumentation_tween_factory(handler, registry):
+    settings = registry.settings
+    prefix = 'matakuliah.instrumentation.'
+    if not asbool(settings.get(prefix + 'enabled', True)):
+        return handler
+    add_header = asbool(settings.get(prefix + 'server_timing', True))
+    log_requests = asbool(settings.get(prefix + 'log', True))
+    metrics = registry.get('matakuliah_request_metrics')
+
+    def record(request, response, duration, stats, streamed):
+        route = request.matched_route.name if request.matched_route else 'unmatched'
+        if metrics is not None:
+            metrics.observe(route, request.method, response.status_code,
+                            duration, stats)
+        if log_requests and log.isEnabledFor(logging.INFO):
+            log.info(json.dumps({
+                'event': 'request',
+                'method': request.method,
+                'path': request.path,
+                'route': route,
+                'status': response.status_code,
+                'streamed': streamed,
+                'duration_ms': round(duration * 1000, 2),
+                'sql_ms': round(stats.sql_time * 1000, 2),
+                'statements': stats.statements,
+                'rows': stats.rows,
+            }))
+
+    def instrumentation_tween(request):
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = handler(request)
+        finally:
+            _current_stats.reset(token)
+
+        route = request.matched_route.name if request.matched_route else 'unmatched'
+        if route in EXCLUDED_ROUTES:
+            return response
+        if is_streaming(response):
+            def finish():
+                record(request, response, time.perf_counter() - start,
+                       stats, True)
+
+            response.app_iter = InstrumentedAppIter(response.app_iter, stats, finish)
+            return response
+
+        duration = time.perf_counter() - start
+        if add_header:
+            response.headers['Server-Timing'] = server_timing(duration, stats)
+        record(request, response, duration, stats, False)
+        return response
+
+    return instrumentation_tween
+
+
+def parse_networks(value):
+    """Daftar alamat/jaringan (``10.0.0.0/8``, ``::1``) dari setting"""
+    return [ipaddress.ip_network(item, strict=False) for item in aslist(value)]
+
+
+def address_allowed(address, networks):
+    """True bila alamat klien termasuk salah satu jaringan"""
+    try:
+        address = ipaddress.ip_address(address or '')
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def includeme(config):
+    settings = config.get_settings()
+    if asbool(settings.get('matakuliah.metrics.enabled', True)):
+        metrics = MetricsRegistry()
+        config.registry['matakuliah_metrics'] = metrics
+        config.registry['matakuliah_metrics_allow'] = parse_networks(
+            settings.get('matakuliah.metrics.allow', DEFAULT_METRICS_ALLOW))
+        config.registry['matakuliah_request_metrics'] = RequestMetrics(metrics)
+    config.add_tween(
+        'manajemen_matakuliah.instrumentation.instrumentation_tween_factory',
+        under=INGRESS)
@@ -0,0 +1,138 @@
+"""
+Metrik in-process dalam format teks Prometheus.
+
+Counter dan histogram disimpan per proses (per worker), sehingga setiap
+worker perlu di-scrape sendiri lalu dijumlahkan di sisi Prometheus. Server
+pre-fork (prefork.py) memberi label ``worker`` pada semua sampel lewat
+``MetricsRegistry.const_labels`` dan bisa membuka port metrik per worker.
+"""
+import threading
+
+# Batas bucket (detik), sama dengan default client Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        labels = tuple(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield self.name, list(zip(self.labelnames, labels)), value
+
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, labels, value):
+        with self._lock:
+            self._values[tuple(labels)] = value
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield self.name, list(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}   # labels -> [hitungan per bucket..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        labels = tuple(labels)
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[index] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, list(data)) for labels, data in self._values.items())
+        for labels, data in items:
+            pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                yield (self.name + '_bucket',
+                       pairs + [('le', _format_value(bound))], cumulative)
+            yield self.name + '_sum', pairs, data[-2]
+            yield self.name + '_count', pairs, data[-1]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        # Label tetap di depan setiap sampel, misalnya (('worker', '0'),)
+        self.const_labels = ()
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Seluruh metrik dalam exposition format teks Prometheus"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, pairs, value in metric.samples():
+                labels = _format_labels(list(self.const_labels) + pairs)
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def get_metrics(registry):
+    return registry['matakuliah_metrics']
+
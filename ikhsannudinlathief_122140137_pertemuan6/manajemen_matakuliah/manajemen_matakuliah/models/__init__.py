@@ -1,22 +1,35 @@
-from sqlalchemy import engine_from_config
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import configure_mappers
 import zope.sqlalchemy
 
 # Import model classes untuk memastikan mereka ter-register oleh SQLAlchemy
+from ..instrumentation import instrument_engine
+from .engine import create_engine_from_settings, dispose_after_fork
 from .matakuliah import Matakuliah
+from . import fts  # noqa: F401  tabel FTS5 ikut dibuat oleh create_all
+from .replica import is_sticky, setup_replicas
+from .table_version import TableVersion, register_version_events
 
 # Run configure_mappers setelah mendefinisikan semua models
 configure_mappers()
 
 
 def get_engine(settings, prefix='sqlalchemy.'):
-    return engine_from_config(settings, prefix)
+    # Pool dan pragma SQLite diatur dari .ini, lihat models/engine.py
+    engine = create_engine_from_settings(settings, prefix)
+    # Waktu SQL, jumlah statement dan baris per request (instrumentation.py),
+    # juga sumber data guard N+1 dan query lambat (query_guard.py)
+    instrument_engine(engine)
+    # Pool tidak ikut diwariskan ke worker server pre-fork (prefork.py)
+    dispose_after_fork(engine)
+    return engine
 
 
 def get_session_factory(engine):
     factory = sessionmaker()
     factory.configure(bind=engine)
+    # Versi tabel dinaikkan otomatis pada setiap penulisan (untuk ETag)
+    register_version_events(factory)
     return factory
 
 
@@ -42,10 +55,37 @@ def includeme(config):
     session_factory = get_session_factory(engine)
     config.registry['dbsession_factory'] = session_factory
 
+    def dbsession(request):
+        # Test dapat menyisipkan session sendiri melalui environ
+        dbsession = request.environ.get('app.dbsession')
+        if dbsession is None:
+            # request.tm adalah transaction manager yang dipakai pyramid_tm
+            dbsession = get_tm_session(session_factory, request.tm)
+        return dbsession
+
     # Add dbsession to request
-    config.add_request_method(
-        # r.tm is the transaction manager used by pyramid_tm
-        lambda r: get_tm_session(session_factory, r.tm),
-        'dbsession',
-        reify=True
-    )
\ No newline at end of file
+    config.add_request_method(dbsession, reify=True)
+
+    # Read replica opsional, lihat models/replica.py
+    replica_factory = setup_replicas(config, get_engine)
+
+    def read_dbsession(request):
+        # Tanpa replica, atau klien baru saja menulis: baca dari primary
+        if (replica_factory is None
+                or 'app.dbsession' in request.environ
+                or is_sticky(request)):
+            return request.dbsession
+        dbsession = replica_factory()
+        # Session replica hanya membaca, jadi tidak didaftarkan ke pyramid_tm
+        request.add_finished_callback(lambda r: dbsession.close())
+        return dbsession
+
+    config.add_request_method(read_dbsession, reify=True)
+
+    def new_read_session():
+        """Session baca di luar request (misalnya untuk streaming export)"""
+        if replica_factory is not None:
+            return replica_factory()
+        return session_factory()
+
+    config.registry['read_session_factory'] = new_read_session
\ No newline at end of file
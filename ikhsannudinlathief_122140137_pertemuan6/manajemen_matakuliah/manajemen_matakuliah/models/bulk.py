@@ -0,0 +1,144 @@
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .matakuliah import Matakuliah, utcnow
+
+# Jumlah baris per statement executemany pada operasi bulk
+DEFAULT_CHUNK_SIZE = 500
+
+# Kolom yang diperbarui ketika kode_mk sudah ada (upsert)
+UPSERT_FIELDS = ('nama_mk', 'sks', 'semester')
+
+# Kolom yang boleh diubah lewat bulk update (kode_mk unik per baris)
+BULK_UPDATE_FIELDS = ('nama_mk', 'sks', 'semester')
+
+# Kolom yang boleh dipakai sebagai filter kesamaan pada bulk update/delete
+BULK_FILTER_FIELDS = ('kode_mk', 'sks', 'semester')
+
+# Dialect yang mendukung INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def _chunks(records, chunk_size):
+    for start in range(0, len(records), chunk_size):
+        yield records[start:start + chunk_size]
+
+
+def _upsert_on_conflict(dbsession, dialect_insert, chunk):
+    stmt = dialect_insert(Matakuliah)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Matakuliah.kode_mk],
+        set_=dict({field: stmt.excluded[field] for field in UPSERT_FIELDS},
+                  version=Matakuliah.version + 1, updated_at=utcnow()),
+    )
+    stmt = stmt.returning(Matakuliah.kode_mk, Matakuliah.id)
+    return dbsession.execute(stmt, chunk).all()
+
+
+def _upsert_generic(dbsession, chunk):
+    # Untuk dialect tanpa ON CONFLICT: pisahkan baris lama dan baru,
+    # lalu jalankan satu UPDATE dan satu INSERT executemany per chunk
+    kodes = [record['kode_mk'] for record in chunk]
+    existing = dict(dbsession.execute(
+        select(Matakuliah.kode_mk, Matakuliah.id)
+        .where(Matakuliah.kode_mk.in_(kodes))
+    ).all())
+
+    # UPDATE executemany berdasarkan primary key; versi baris dinaikkan
+    # agar ETag detail dan If-Match pada PUT ikut berubah
+    updates = [
+        dict({field: record[field] for field in UPSERT_FIELDS},
+             b_id=existing[record['kode_mk']])
+        for record in chunk if record['kode_mk'] in existing
+    ]
+    inserts = [record for record in chunk if record['kode_mk'] not in existing]
+
+    if updates:
+        table = Matakuliah.__table__
+        dbsession.execute(
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(version=table.c.version + 1, updated_at=utcnow()),
+            updates,
+        )
+    if inserts:
+        dbsession.execute(insert(Matakuliah), inserts)
+        existing.update(dbsession.execute(
+            select(Matakuliah.kode_mk, Matakuliah.id)
+            .where(Matakuliah.kode_mk.in_([r['kode_mk'] for r in inserts]))
+        ).all())
+    return [(kode, existing[kode]) for kode in kodes]
+
+
+def upsert_matakuliah(dbsession, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert atau update banyak matakuliah berdasarkan kode_mk.
+
+    Setiap record adalah dict dengan kolom kode_mk, nama_mk, sks dan
+    semester. Record dikirim per chunk dengan executemany di dalam transaksi
+    milik dbsession. Mengembalikan dict {kode_mk: id}.
+    """
+    dialect_insert = _UPSERT_INSERTS.get(dbsession.get_bind().dialect.name)
+    ids = {}
+    for chunk in _chunks(records, chunk_size):
+        if dialect_insert is not None:
+            rows = _upsert_on_conflict(dbsession, dialect_insert, chunk)
+        else:
+            rows = _upsert_generic(dbsession, chunk)
+        ids.update(rows)
+    return ids
+
+
+def matakuliah_criteria(ids=None, filters=None):
+    """Bangun kondisi WHERE dari daftar id dan/atau filter kesamaan kolom"""
+    clauses = []
+    if ids is not None:
+        clauses.append(Matakuliah.id.in_(ids))
+    for field, value in (filters or {}).items():
+        clauses.append(getattr(Matakuliah, field) == value)
+    return and_(*clauses)
+
+
+def _set_based(dbsession, stmt, criteria, supports_returning):
+    if supports_returning:
+        stmt = stmt.where(criteria).returning(Matakuliah.id)
+        ids = dbsession.execute(
+            stmt, execution_options={'synchronize_session': False}
+        ).scalars().all()
+    else:
+        # Tanpa RETURNING, id yang terdampak dibaca lebih dulu
+        ids = dbsession.execute(
+            select(Matakuliah.id).where(criteria)
+        ).scalars().all()
+        if ids:
+            dbsession.execute(
+                stmt.where(Matakuliah.id.in_(ids)),
+                execution_options={'synchronize_session': False},
+            )
+    return sorted(ids)
+
+
+def bulk_update_matakuliah(dbsession, criteria, values):
+    """Satu UPDATE set-based, mengembalikan daftar id yang terdampak"""
+    dialect = dbsession.get_bind().dialect
+    # version_id_col tidak dinaikkan otomatis oleh UPDATE set-based
+    stmt = update(Matakuliah).values(
+        dict(values, version=Matakuliah.version + 1, updated_at=utcnow()))
+    return _set_based(dbsession, stmt, criteria, dialect.update_returning)
+
+
+def bulk_delete_matakuliah(dbsession, criteria):
+    """Satu DELETE set-based, mengembalikan daftar id yang terhapus"""
+    dialect = dbsession.get_bind().dialect
+    stmt = delete(Matakuliah)
+    return _set_based(dbsession, stmt, criteria, dialect.delete_returning)
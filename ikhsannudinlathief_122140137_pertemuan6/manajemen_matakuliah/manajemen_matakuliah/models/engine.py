@@ -0,0 +1,159 @@
+"""
+Konfigurasi engine SQLAlchemy dari file .ini.
+
+Pengaturan pool (``sqlalchemy.pool_size``, ``sqlalchemy.max_overflow``,
+``sqlalchemy.pool_recycle``, ``sqlalchemy.pool_pre_ping``,
+``sqlalchemy.pool_timeout``) diteruskan langsung ke ``engine_from_config``.
+Pengaturan ``sqlalchemy.sqlite.<pragma>`` dipisahkan lebih dulu lalu
+dijalankan sebagai ``PRAGMA`` pada setiap koneksi SQLite baru.
+
+Aplikasi ASGI memakai engine async dari pengaturan yang sama. URL-nya
+diambil dari ``sqlalchemy.async_url`` atau diturunkan dari ``sqlalchemy.url``
+dengan mengganti driver (lihat ``ASYNC_DRIVERS``).
+
+Engine yang dibuat ``get_engine`` didaftarkan ke ``dispose_after_fork``.
+Setelah ``os.fork()`` (server pre-fork, lihat ``prefork.py``) proses anak
+membuang pool warisan induknya dengan ``dispose(close=False)``, sehingga
+koneksi database tidak pernah dipakai bersama oleh dua proses.
+"""
+import os
+import weakref
+
+from pyramid.exceptions import ConfigurationError
+from sqlalchemy import engine_from_config, event
+from sqlalchemy.engine import make_url
+
+SQLITE_PREFIX = 'sqlite.'
+REPLICA_PREFIX = 'replica.'
+ASYNC_URL_KEY = 'async_url'
+
+# Driver async pengganti untuk setiap backend database
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+# Nilai yang diizinkan per pragma; None berarti harus bilangan bulat
+SQLITE_PRAGMAS = {
+    'journal_mode': {'delete', 'truncate', 'persist', 'memory', 'wal', 'off'},
+    'synchronous': {'off', 'normal', 'full', 'extra', '0', '1', '2', '3'},
+    'temp_store': {'default', 'file', 'memory', '0', '1', '2'},
+    'foreign_keys': {'on', 'off', '1', '0'},
+    'cache_size': None,
+    'mmap_size': None,
+    'busy_timeout': None,
+}
+
+
+def split_sqlite_pragmas(settings, prefix='sqlalchemy.'):
+    """
+    Pisahkan ``<prefix>sqlite.*`` dari settings. Mengembalikan (settings
+    tanpa pragma, dict pragma yang sudah divalidasi).
+    """
+    pragma_prefix = prefix + SQLITE_PREFIX
+    engine_settings = {}
+    pragmas = {}
+    for key, value in settings.items():
+        if not key.startswith(pragma_prefix):
+            engine_settings[key] = value
+            continue
+        name = key[len(pragma_prefix):]
+        if name not in SQLITE_PRAGMAS:
+            raise ValueError(f'Pragma SQLite {name} tidak didukung')
+        value = str(value).strip().lower()
+        allowed = SQLITE_PRAGMAS[name]
+        if allowed is None:
+            value = str(int(value))
+        elif value not in allowed:
+            raise ValueError(f'Nilai {value} tidak valid untuk pragma {name}')
+        pragmas[name] = value
+    return engine_settings, pragmas
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Jalankan pragma pada setiap koneksi DBAPI baru milik engine"""
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+
+# Engine yang pool-nya dibuang di proses anak setelah fork
+_fork_engines = weakref.WeakSet()
+
+
+def dispose_engines(close=True):
+    """Buang pool seluruh engine yang didaftarkan ``dispose_after_fork``"""
+    for engine in list(_fork_engines):
+        engine.dispose(close=close)
+
+
+def _dispose_engines_after_fork():
+    # close=False: koneksi milik induk tidak boleh ditutup dari proses anak,
+    # cukup dilupakan; pool baru dibuka sesuai kebutuhan
+    dispose_engines(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+
+def dispose_after_fork(engine):
+    """Buang pool ``engine`` di setiap proses anak hasil ``os.fork()``"""
+    _fork_engines.add(engine)
+
+
+def _engine_settings(settings, prefix):
+    # sqlalchemy.replica.* diatur oleh models/replica.py dan
+    # sqlalchemy.async_url oleh engine async, keduanya bukan argumen engine
+    return {
+        key: value for key, value in settings.items()
+        if not key.startswith(prefix + REPLICA_PREFIX)
+        and key != prefix + ASYNC_URL_KEY
+    }
+
+
+def create_engine_from_settings(settings, prefix='sqlalchemy.'):
+    engine_settings, pragmas = split_sqlite_pragmas(
+        _engine_settings(settings, prefix), prefix)
+    engine = engine_from_config(engine_settings, prefix)
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def async_url(settings, prefix='sqlalchemy.'):
+    """URL engine async: ``<prefix>async_url`` atau ``<prefix>url`` dengan driver async"""
+    url = settings.get(prefix + ASYNC_URL_KEY)
+    if url:
+        return make_url(url)
+    url = make_url(settings[prefix + 'url'])
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise ConfigurationError(
+            f'Tidak ada driver async untuk {url.get_backend_name()}, '
+            f'isi {prefix}{ASYNC_URL_KEY}')
+    return url.set(drivername=drivername)
+
+
+def create_async_engine_from_settings(settings, prefix='sqlalchemy.'):
+    """Engine async dengan pool dan pragma SQLite yang sama seperti engine WSGI"""
+    # Diimpor di sini karena sqlalchemy.ext.asyncio butuh greenlet (extra asgi)
+    from sqlalchemy.ext.asyncio import async_engine_from_config
+
+    engine_settings, pragmas = split_sqlite_pragmas(
+        _engine_settings(settings, prefix), prefix)
+    engine_settings[prefix + 'url'] = async_url(settings, prefix)
+    engine = async_engine_from_config(engine_settings, prefix)
+    # Event connect dipasang pada engine sinkron di balik AsyncEngine
+    apply_sqlite_pragmas(engine.sync_engine, pragmas)
+    return engine
@@ -0,0 +1,46 @@
+"""
+Index FTS5 ``matakuliah_fts`` untuk pencarian nama_mk (khusus SQLite).
+
+Database yang dibuat lewat Alembic mendapatkannya dari migrasi
+5c8a1f7e2d34. Event di sini membuat tabel dan trigger yang sama ketika
+tabel matakuliah dibuat dengan ``Base.metadata.create_all`` (test dan
+benchmark), sehingga pencarian tidak bergantung pada jalur pembuatan skema.
+"""
+from sqlalchemy import DDL, event
+
+from .matakuliah import Matakuliah
+
+CREATE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS matakuliah_fts USING fts5("
+    "nama_mk, content='matakuliah', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+# Trigger menjaga isi index tetap sama dengan tabel matakuliah
+TRIGGERS = (
+    """CREATE TRIGGER matakuliah_fts_ai AFTER INSERT ON matakuliah BEGIN
+        INSERT INTO matakuliah_fts(rowid, nama_mk) VALUES (new.id, new.nama_mk);
+    END""",
+    """CREATE TRIGGER matakuliah_fts_ad AFTER DELETE ON matakuliah BEGIN
+        INSERT INTO matakuliah_fts(matakuliah_fts, rowid, nama_mk)
+        VALUES ('delete', old.id, old.nama_mk);
+    END""",
+    """CREATE TRIGGER matakuliah_fts_au AFTER UPDATE OF nama_mk ON matakuliah BEGIN
+        INSERT INTO matakuliah_fts(matakuliah_fts, rowid, nama_mk)
+        VALUES ('delete', old.id, old.nama_mk);
+        INSERT INTO matakuliah_fts(rowid, nama_mk) VALUES (new.id, new.nama_mk);
+    END""",
+)
+
+# Trigger ikut terhapus bersama tabel matakuliah, tabel virtual tidak
+DROP_FTS = 'DROP TABLE IF EXISTS matakuliah_fts'
+
+
+def register_fts_events(table=Matakuliah.__table__):
+    for statement in (CREATE_FTS,) + TRIGGERS:
+        event.listen(table, 'after_create',
+                     DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(table, 'after_drop', DDL(DROP_FTS).execute_if(dialect='sqlite'))
+
+
+register_fts_events()
@@ -1,5 +1,9 @@
+import datetime
+
 from sqlalchemy import (
     Column,
+    DateTime,
+    Index,
     Integer,
     Text,
 )
@@ -7,6 +11,11 @@ from sqlalchemy import (
 from .meta import Base
 
 
+def utcnow():
+    # Disimpan tanpa timezone, selalu dalam UTC
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
 class Matakuliah(Base):
     """ Model untuk tabel matakuliah """
     __tablename__ = 'matakuliah'
@@ -15,6 +24,23 @@ class Matakuliah(Base):
     nama_mk = Column(Text, nullable=False)
     sks = Column(Integer, nullable=False)
     semester = Column(Integer, nullable=False)
+    # Nomor versi baris untuk optimistic locking (ETag detail dan If-Match PUT)
+    version = Column(Integer, nullable=False, server_default='1')
+    # Waktu tulis terakhir baris, untuk Last-Modified detail
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    # Index pendukung filter dan pengurutan pada GET /api/matakuliah.
+    # id disertakan agar filter kesamaan + urutan keyset tidak perlu sort.
+    __table_args__ = (
+        Index('ix_matakuliah_semester', 'semester', 'id'),
+        Index('ix_matakuliah_sks', 'sks', 'id'),
+        Index('ix_matakuliah_semester_sks', 'semester', 'sks'),
+        Index('ix_matakuliah_nama_mk', 'nama_mk', 'id'),
+    )
+
+    # UPDATE lewat ORM memakai WHERE version = :lama, lalu version + 1;
+    # bila baris sudah diubah pihak lain, flush melempar StaleDataError
+    __mapper_args__ = {'version_id_col': version}
 
     def to_dict(self):
         return {
@@ -23,4 +49,5 @@ class Matakuliah(Base):
             'nama_mk': self.nama_mk,
             'sks': self.sks,
             'semester': self.semester,
+            'version': self.version,
         }
\ No newline at end of file
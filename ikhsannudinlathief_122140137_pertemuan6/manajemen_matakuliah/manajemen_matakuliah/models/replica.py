@@ -0,0 +1,85 @@
+"""
+Routing baca ke read replica.
+
+``sqlalchemy.replica.url`` boleh berisi satu atau lebih URL (dipisah spasi
+atau baris baru). View yang hanya membaca memakai ``request.read_dbsession``
+yang terikat ke replica secara bergiliran, sedangkan ``request.dbsession``
+tetap ke primary. Setelah klien melakukan penulisan, cookie
+``matakuliah_primary`` membuat pembacaan klien tersebut diarahkan ke primary
+selama ``sqlalchemy.replica.sticky_seconds`` detik (read-your-writes).
+"""
+import itertools
+import time
+
+from pyramid.events import NewResponse
+from pyramid.settings import aslist
+from sqlalchemy.orm import sessionmaker
+
+STICKY_COOKIE = 'matakuliah_primary'
+DEFAULT_STICKY_SECONDS = 5
+
+# Method HTTP yang tidak mengubah data
+SAFE_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+def replica_urls(settings, prefix='sqlalchemy.'):
+    return aslist(settings.get(prefix + 'replica.url', ''))
+
+
+def get_replica_engines(settings, get_engine, prefix='sqlalchemy.'):
+    """Buat satu engine per URL replica dengan pool/pragma yang sama"""
+    engines = []
+    for url in replica_urls(settings, prefix):
+        replica_settings = dict(settings)
+        replica_settings[prefix + 'url'] = url
+        engines.append(get_engine(replica_settings, prefix))
+    return engines
+
+
+class ReplicaSessionFactory:
+    """Membuat session baca yang terikat ke replica secara round-robin"""
+
+    def __init__(self, engines):
+        self.engines = engines
+        self._next_engine = itertools.cycle(engines).__next__
+        self._factory = sessionmaker()
+
+    def __call__(self):
+        return self._factory(bind=self._next_engine())
+
+
+def is_sticky(request):
+    """True jika klien baru saja menulis dan harus membaca dari primary"""
+    value = request.cookies.get(STICKY_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def _mark_sticky(event):
+    request = event.request
+    response = event.response
+    if request.method in SAFE_METHODS or response.status_int >= 400:
+        return
+    seconds = request.registry['replica_sticky_seconds']
+    response.set_cookie(
+        STICKY_COOKIE, str(time.time() + seconds),
+        max_age=seconds, httponly=True, samesite='Lax')
+
+
+def setup_replicas(config, get_engine):
+    settings = config.get_settings()
+    engines = get_replica_engines(settings, get_engine)
+    if not engines:
+        config.registry['replica_session_factory'] = None
+        return None
+
+    factory = ReplicaSessionFactory(engines)
+    config.registry['replica_session_factory'] = factory
+    config.registry['replica_sticky_seconds'] = int(settings.get(
+        'sqlalchemy.replica.sticky_seconds', DEFAULT_STICKY_SECONDS))
+    config.add_subscriber(_mark_sticky, NewResponse)
+    return factory
@@ -0,0 +1,106 @@
+"""
+Penghitung versi per tabel untuk ETag dan Last-Modified daftar matakuliah.
+
+Baris penghitung setiap tabel di ``VERSIONED_TABLES`` dibuat bersama tabel
+``table_version`` (migrasi 3b7e9c2d5f10, atau event ``after_create`` bila
+skema dibuat dengan ``create_all``). Penulisan cukup menjalankan satu
+``UPDATE ... SET version = version + 1`` yang atomik di transaksi yang
+sama, tanpa fallback INSERT yang bisa berebut dengan penulis lain.
+
+Event session menaikkan versi setelah flush (unit of work ORM) dan setelah
+DML bulk (``do_orm_execute``), sehingga membaca ETag cukup satu lookup
+primary key, tanpa memindai tabel matakuliah.
+"""
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    Text,
+    event,
+    insert,
+    select,
+    update,
+)
+
+from .matakuliah import Matakuliah, utcnow
+from .meta import Base
+
+# Tabel yang versinya dinaikkan setiap kali ada penulisan
+VERSIONED_TABLES = frozenset([Matakuliah.__tablename__])
+
+
+class TableVersion(Base):
+    """ Model penghitung versi per tabel, dipakai untuk ETag/Last-Modified """
+    __tablename__ = 'table_version'
+    table_name = Column(Text, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False)
+
+
+def initial_versions():
+    """Baris awal table_version, satu per tabel yang diberi versi"""
+    now = utcnow().replace(microsecond=0)
+    return [{'table_name': name, 'version': 1, 'updated_at': now}
+            for name in sorted(VERSIONED_TABLES)]
+
+
+def _seed_versions(target, connection, **kw):
+    connection.execute(insert(target), initial_versions())
+
+
+event.listen(TableVersion.__table__, 'after_create', _seed_versions)
+
+
+def bump_table_version(connection, table_name):
+    """Naikkan versi tabel di dalam transaksi milik connection"""
+    table = TableVersion.__table__
+    result = connection.execute(
+        update(table)
+        .where(table.c.table_name == table_name)
+        .values(version=table.c.version + 1, updated_at=utcnow())
+    )
+    if result.rowcount == 0:
+        raise RuntimeError(
+            f'Baris table_version untuk {table_name} tidak ada, '
+            'jalankan alembic upgrade head')
+
+
+def get_table_version(dbsession, table_name):
+    """Kembalikan (version, updated_at) tabel, (None, None) jika belum ada"""
+    table = TableVersion.__table__
+    row = dbsession.execute(
+        select(table.c.version, table.c.updated_at)
+        .where(table.c.table_name == table_name)
+    ).first()
+    if row is None:
+        return None, None
+    return row.version, row.updated_at
+
+
+def _after_flush(session, flush_context):
+    tables = {
+        obj.__table__.name
+        for objects in (session.new, session.dirty, session.deleted)
+        for obj in objects
+    }
+    for table_name in sorted(tables & VERSIONED_TABLES):
+        bump_table_version(session.connection(), table_name)
+
+
+def _do_orm_execute(execute_state):
+    # Bulk INSERT/UPDATE/DELETE (misalnya models.bulk dan impor) tidak
+    # melewati flush, jadi versinya dinaikkan di sini
+    if not (execute_state.is_insert or execute_state.is_update
+            or execute_state.is_delete):
+        return None
+    table = getattr(execute_state.statement, 'table', None)
+    if table is None or table.name not in VERSIONED_TABLES:
+        return None
+    result = execute_state.invoke_statement()
+    bump_table_version(execute_state.session.connection(), table.name)
+    return result
+
+
+def register_version_events(session_factory):
+    event.listen(session_factory, 'after_flush', _after_flush)
+    event.listen(session_factory, 'do_orm_execute', _do_orm_execute)
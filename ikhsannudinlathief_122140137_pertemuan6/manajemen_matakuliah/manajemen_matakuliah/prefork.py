@@ -0,0 +1,280 @@
+"""
+Server pre-fork: beberapa proses waitress berbagi satu socket listen.
+
+``egg:waitress#main`` menjalankan satu proses dengan banyak thread, sehingga
+serialisasi JSON dibatasi GIL ke satu core. Runner ini membuka socket listen
+sekali di proses induk lalu menjalankan ``workers`` proses anak (``fork``),
+masing-masing berisi waitress dengan ``threads`` thread pada socket yang
+sama. Kernel membagi koneksi baru ke worker yang sedang menunggu.
+
+Dipakai dari production.ini::
+
+    [server:main]
+    use = egg:manajemen_matakuliah#prefork
+    listen = *:6543
+    workers = 4
+    threads = 4
+
+Opsi lain di ``[server:main]`` diteruskan ke waitress. Aplikasi dimuat sekali
+di induk sebelum fork, sehingga template, mapper, dan cache kompilasi SQL
+ikut terbagi. Pool koneksi tidak pernah diwariskan: induk membuang pool-nya
+sebelum fork dan setiap worker membuang salinannya setelah fork
+(``models.engine.dispose_after_fork``), lalu worker menjalankan warm-up
+sendiri bila ``matakuliah.startup.warmup`` aktif.
+
+Metrik ``/metrics`` disimpan per worker, sehingga scrape ke port utama
+hanya mengenai satu worker acak. Setiap worker memberi label ``worker``
+pada metriknya, dan bila ``metrics_port`` diisi worker ke-N melayani
+metriknya sendiri di ``metrics_host:metrics_port + N`` (bawaan 127.0.0.1)
+untuk di-scrape satu per satu. Tanpa ``metrics_port`` dan dengan lebih dari
+satu worker, ``/metrics`` di port utama dimatikan (404).
+
+Induk hanya mengawasi worker. Worker yang mati dijalankan ulang, SIGTERM
+atau SIGINT menghentikan semua worker dengan rapi (request yang sedang
+berjalan diselesaikan lebih dulu). Di platform tanpa ``os.fork`` (Windows)
+runner kembali ke waitress biasa dengan satu proses.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from pyramid.settings import asbool
+import waitress
+from waitress.adjustments import Adjustments
+
+from .metrics import CONTENT_TYPE
+from .models.engine import dispose_engines
+from .startup import warm_up
+
+log = logging.getLogger(__name__)
+
+DEFAULT_THREADS = 4
+
+# Port metrik per worker hanya dibuka di localhost kecuali diatur lain
+DEFAULT_METRICS_HOST = '127.0.0.1'
+
+# Waktu tunggu worker berhenti sebelum dipaksa dengan SIGKILL (detik)
+STOP_TIMEOUT = 30
+
+# Jeda sebelum worker yang mati dijalankan ulang (detik)
+RESPAWN_DELAY = 1.0
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def bind_sockets(listen=None, host=None, port=None, backlog=None):
+    """Buka socket listen untuk setiap alamat, dipakai bersama semua worker"""
+    address = {key: value for key, value in
+               (('listen', listen), ('host', host), ('port', port))
+               if value is not None}
+    adj = Adjustments(**address)
+    sockets = []
+    try:
+        for family, socktype, proto, sockaddr in adj.listen:
+            sock = socket.socket(family, socktype, proto)
+            sockets.append(sock)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if family == socket.AF_INET6:
+                # "*:6543" membuka IPv4 dan IPv6 pada port yang sama
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+            sock.bind(sockaddr)
+            sock.listen(int(backlog or adj.backlog))
+    except OSError:
+        for sock in sockets:
+            sock.close()
+        raise
+    return sockets
+
+
+def metrics_app(metrics):
+    """Aplikasi WSGI kecil yang hanya menyajikan ``/metrics`` satu worker"""
+    def app(environ, start_response):
+        if environ.get('PATH_INFO') != '/metrics':
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'Not Found']
+        body = metrics.render().encode('utf-8')
+        start_response('200 OK', [('Content-Type', CONTENT_TYPE),
+                                  ('Content-Length', str(len(body)))])
+        return [body]
+
+    return app
+
+
+def serve_metrics(metrics, sockets):
+    """Jalankan server metrik worker di thread daemon"""
+    server = waitress.create_server(
+        metrics_app(metrics), map={}, sockets=sockets, threads=1)
+    thread = threading.Thread(target=server.run, name='metrics', daemon=True)
+    thread.start()
+    return server
+
+
+def _exit_worker(signum, frame):
+    # Ditangkap waitress, yang lalu menunggu request yang sedang berjalan
+    raise SystemExit(0)
+
+
+class PreforkServer:
+    """Induk yang menjalankan dan mengawasi worker waitress"""
+
+    def __init__(self, app, sockets, workers=None, metrics_sockets=None, **server_kw):
+        self.app = app
+        self.sockets = sockets
+        self.workers = int(workers or default_workers())
+        # Satu daftar socket metrik per nomor worker, atau None
+        self.metrics_sockets = metrics_sockets
+        self.server_kw = server_kw
+        self.children = {}
+        self.stopping = False
+
+    def spawn(self, number):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = number
+            return pid
+        status = 0
+        try:
+            self.run_worker(number)
+        except BaseException:
+            log.exception('Worker %d gagal', number)
+            status = 1
+        finally:
+            # Jangan kembali ke kode induk (loop pengawas, handler atexit)
+            os._exit(status)
+
+    def run_worker(self, number):
+        signal.signal(signal.SIGTERM, _exit_worker)
+        # Ctrl-C dikirim ke seluruh grup proses; induk yang menghentikan worker
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+        registry = getattr(self.app, 'registry', None)
+        if registry is not None:
+            self.setup_metrics(registry, number)
+        if registry is not None and asbool(
+                registry.settings.get('matakuliah.startup.warmup', False)):
+            warm_up(registry)
+        server = waitress.create_server(
+            self.app, sockets=self.sockets, **self.server_kw)
+        log.info('Worker %d siap (pid %d)', number, os.getpid())
+        server.run()
+
+    def setup_metrics(self, registry, number):
+        """Label ``worker`` dan port metrik milik worker ``number``"""
+        metrics = registry.get('matakuliah_metrics')
+        if metrics is None:
+            return
+        metrics.const_labels = (('worker', str(number)),)
+        if self.metrics_sockets is not None:
+            serve_metrics(metrics, self.metrics_sockets[number])
+        elif self.workers == 1:
+            return
+        # /metrics di port utama hanya menjawab dari satu worker acak
+        registry['matakuliah_metrics_on_route'] = False
+
+    def stop(self, signum=None, frame=None):
+        if self.stopping:
+            return
+        self.stopping = True
+        log.info('Menghentikan %d worker', len(self.children))
+        self._signal_children(signal.SIGTERM)
+        signal.signal(signal.SIGALRM, self._kill)
+        signal.alarm(STOP_TIMEOUT)
+
+    def _kill(self, signum, frame):
+        log.warning('Worker tidak berhenti dalam %d detik, SIGKILL', STOP_TIMEOUT)
+        self._signal_children(signal.SIGKILL)
+
+    def _signal_children(self, signum):
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        # Koneksi yang dibuka warm-up di induk tidak dipakai oleh siapa pun
+        dispose_engines()
+        try:
+            for number in range(self.workers):
+                self.spawn(number)
+            log.info('Server pre-fork berjalan dengan %d worker', self.workers)
+            self._supervise()
+        finally:
+            signal.alarm(0)
+            for sock in self.sockets:
+                sock.close()
+            for sockets in self.metrics_sockets or ():
+                for sock in sockets:
+                    sock.close()
+
+    def _supervise(self):
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            number = self.children.pop(pid, None)
+            if number is None or self.stopping:
+                continue
+            log.warning('Worker %d (pid %d) berhenti dengan status %d, '
+                        'dijalankan ulang', number, pid,
+                        os.waitstatus_to_exitcode(status))
+            time.sleep(RESPAWN_DELAY)
+            if not self.stopping:
+                self.spawn(number)
+
+
+def bind_metrics_sockets(workers, host, port):
+    """Socket metrik untuk worker 0..workers-1 di ``port``, ``port + 1``, ..."""
+    metrics_sockets = []
+    try:
+        for number in range(workers):
+            metrics_sockets.append(bind_sockets(host=host, port=str(port + number)))
+    except OSError:
+        for sockets in metrics_sockets:
+            for sock in sockets:
+                sock.close()
+        raise
+    return metrics_sockets
+
+
+def serve(app, listen=None, host=None, port=None, workers=None,
+          threads=DEFAULT_THREADS, backlog=None, metrics_port=None,
+          metrics_host=DEFAULT_METRICS_HOST, **server_kw):
+    """Jalankan ``app`` dengan ``workers`` proses waitress"""
+    workers = int(workers or default_workers())
+    sockets = bind_sockets(listen, host, port, backlog)
+    for sock in sockets:
+        host, port = sock.getsockname()[:2]
+        log.info('Serving on http://%s:%s', f'[{host}]' if ':' in host else host, port)
+    metrics_sockets = None
+    if metrics_port:
+        metrics_sockets = bind_metrics_sockets(workers, metrics_host, int(metrics_port))
+        log.info('Metrik worker di %s:%s-%s', metrics_host, metrics_port,
+                 int(metrics_port) + workers - 1)
+    elif workers > 1:
+        log.warning('/metrics dimatikan: %d worker tanpa metrics_port', workers)
+    if backlog is not None:
+        server_kw['backlog'] = backlog
+    server = PreforkServer(app, sockets, workers, metrics_sockets,
+                           threads=threads, **server_kw)
+    server.run()
+
+
+def serve_paste(app, global_conf, **kw):
+    """Entry point ``paste.server_runner`` untuk ``[server:main]``"""
+    if not hasattr(os, 'fork'):
+        log.warning('os.fork tidak tersedia, memakai waitress satu proses')
+        kw.pop('workers', None)
+        kw.pop('metrics_port', None)
+        kw.pop('metrics_host', None)
+        return waitress.serve_paste(app, global_conf, **kw)
+    serve(app, **kw)
+    return 0
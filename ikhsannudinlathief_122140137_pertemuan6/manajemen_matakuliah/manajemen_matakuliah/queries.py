@@ -0,0 +1,364 @@
+"""
+Parsing parameter, validasi body, dan query matakuliah yang dipakai bersama
+oleh view Pyramid (WSGI) dan aplikasi ASGI.
+
+Fungsi di sini hanya membutuhkan mapping ``params`` yang punya ``.get``
+(``request.params`` pada Pyramid, dict query string pada ASGI) atau request
+dengan ``body``, ``json_body`` dan ``content_type``, sehingga kontrak JSON
+kedua jalur tetap sama.
+"""
+import base64
+import json
+import re
+
+from sqlalchemy import (
+    and_,
+    or_,
+    select,
+)
+
+from .models.bulk import (
+    BULK_FILTER_FIELDS,
+    BULK_UPDATE_FIELDS,
+    matakuliah_criteria,
+)
+from .models.matakuliah import Matakuliah
+from .renderers import RowList
+
+# Field yang wajib ada ketika menambahkan matakuliah
+REQUIRED_FIELDS = ('kode_mk', 'nama_mk', 'sks', 'semester')
+
+# Kolom yang boleh dipilih melalui parameter ?fields=
+MATAKULIAH_FIELDS = ('id', 'kode_mk', 'nama_mk', 'sks', 'semester', 'version')
+
+# Kolom yang boleh diubah lewat PUT /api/matakuliah/{id}
+UPDATE_FIELDS = ('kode_mk', 'nama_mk', 'sks', 'semester')
+
+# Kolom yang boleh dipakai pada ?order_by= (didukung index)
+ORDER_FIELDS = ('id', 'kode_mk', 'nama_mk', 'sks', 'semester')
+
+# Kolom dengan filter kesamaan (?sks=) dan rentang (?sks_min=&sks_max=)
+RANGE_FILTER_FIELDS = ('semester', 'sks')
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Jumlah baris yang diambil dari cursor database per batch saat export
+EXPORT_BATCH_SIZE = 1000
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+# Kolom teks; kolom lain pada REQUIRED_FIELDS berupa bilangan bulat >= 1
+TEXT_FIELDS = ('kode_mk', 'nama_mk')
+
+
+def validate_field(field, value):
+    """Validasi tipe satu kolom matakuliah, mengembalikan pesan error atau None"""
+    if field in TEXT_FIELDS:
+        if not isinstance(value, str) or not value.strip():
+            return f'Field {field} harus berupa teks yang tidak kosong'
+        return None
+    # bool adalah turunan int, tetapi true/false bukan sks atau semester
+    if not isinstance(value, int) or isinstance(value, bool):
+        return f'Field {field} harus berupa bilangan bulat'
+    if value < 1:
+        return f'Field {field} minimal 1'
+    return None
+
+
+def validate_matakuliah(data):
+    """Validasi data matakuliah baru, mengembalikan pesan error atau None"""
+    if not isinstance(data, dict):
+        return 'Data matakuliah harus berupa objek JSON'
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            return f'Field {field} wajib diisi'
+    for field in REQUIRED_FIELDS:
+        error = validate_field(field, data[field])
+        if error is not None:
+            return error
+    return None
+
+
+def parse_int_param(params, name, default=None, minimum=None):
+    """Ambil parameter query bertipe integer, ValueError jika tidak valid"""
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'Parameter {name} harus berupa bilangan bulat')
+    if minimum is not None and value < minimum:
+        raise ValueError(f'Parameter {name} minimal {minimum}')
+    return value
+
+
+def parse_fields(params, order_field):
+    """
+    Ambil daftar kolom dari ?fields=. id dan kolom pengurutan selalu
+    disertakan karena dibutuhkan untuk cursor.
+    """
+    value = params.get('fields')
+    if not value:
+        return list(MATAKULIAH_FIELDS)
+    fields = ['id']
+    if order_field not in fields:
+        fields.append(order_field)
+    for field in value.split(','):
+        field = field.strip()
+        if field not in MATAKULIAH_FIELDS:
+            raise ValueError(f'Field {field} tidak dikenal')
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+def parse_order(params):
+    """Ambil ?order_by=<kolom> atau -<kolom> (menurun), default id"""
+    value = params.get('order_by') or 'id'
+    descending = value.startswith('-')
+    # Hanya satu tanda minus; --sks dan seterusnya ditolak
+    field = value[1:] if descending else value
+    if field not in ORDER_FIELDS:
+        raise ValueError(f'order_by {value} tidak didukung')
+    return field, descending
+
+
+def parse_filters(params):
+    """Bangun kondisi WHERE dari parameter filter pada query string"""
+    table = Matakuliah.__table__
+    clauses = []
+    for field in RANGE_FILTER_FIELDS:
+        column = table.c[field]
+        value = parse_int_param(params, field)
+        if value is not None:
+            clauses.append(column == value)
+        minimum = parse_int_param(params, f'{field}_min')
+        if minimum is not None:
+            clauses.append(column >= minimum)
+        maximum = parse_int_param(params, f'{field}_max')
+        if maximum is not None:
+            clauses.append(column <= maximum)
+
+    prefix = params.get('kode_mk_prefix')
+    if prefix:
+        # Rentang [prefix, batas atas) bisa memakai index unik kode_mk
+        clauses.append(table.c.kode_mk >= prefix)
+        upper = prefix_upper_bound(prefix)
+        if upper is not None:
+            clauses.append(table.c.kode_mk < upper)
+    return clauses
+
+
+def prefix_upper_bound(prefix):
+    """
+    String terkecil yang lebih besar dari semua string berawalan ``prefix``:
+    karakter terakhir dinaikkan satu (``IF3`` -> ``IF4``). Karakter maksimum
+    di akhir dibuang lebih dulu; None bila tidak ada batas atas.
+    """
+    prefix = prefix.rstrip(chr(0x10FFFF))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def encode_cursor(value, last_id):
+    payload = json.dumps([value, last_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+
+def decode_cursor(cursor, order_field):
+    """
+    Ambil pasangan (nilai kolom, id) dari token ?after=. Tipe nilai harus
+    sama dengan kolom pengurutan agar tidak sampai ke driver database.
+    """
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError('Parameter after tidak valid')
+    if not isinstance(decoded, list) or len(decoded) != 2:
+        raise ValueError('Parameter after tidak valid')
+    value, last_id = decoded
+    if order_field in TEXT_FIELDS:
+        valid_value = isinstance(value, str)
+    else:
+        valid_value = _is_int(value)
+    if not valid_value or not _is_int(last_id):
+        raise ValueError('Parameter after tidak valid')
+    return value, last_id
+
+
+def _keyset_clause(column, id_column, descending, value, last_id):
+    # Keyset pada pasangan (kolom, id) agar nilai kolom yang sama tetap urut
+    if descending:
+        return or_(column < value, and_(column == value, id_column < last_id))
+    return or_(column > value, and_(column == value, id_column > last_id))
+
+
+def build_list_query(params, page_size=DEFAULT_PAGE_SIZE,
+                     max_page_size=MAX_PAGE_SIZE):
+    """
+    Bangun query satu halaman daftar matakuliah dari parameter query.
+    Mengembalikan (query, limit, order_field); ValueError jika parameter
+    tidak valid. Query mengambil limit + 1 baris untuk mendeteksi halaman
+    berikutnya, lihat list_page.
+    """
+    order_field, descending = parse_order(params)
+    limit = parse_int_param(params, 'limit', default=page_size, minimum=1)
+    fields = parse_fields(params, order_field)
+    clauses = parse_filters(params)
+    # Urutan id memakai cursor berupa id, urutan lain memakai token
+    if order_field == 'id':
+        after = parse_int_param(params, 'after')
+    elif params.get('after'):
+        after = decode_cursor(params['after'], order_field)
+    else:
+        after = None
+    limit = min(limit, max_page_size)
+
+    # Pilih kolom sebagai baris Core, tanpa membuat objek Matakuliah
+    table = Matakuliah.__table__
+    order_column = table.c[order_field]
+    query = select(*[table.c[field] for field in fields]).where(*clauses)
+    if order_field == 'id':
+        query = query.order_by(order_column.desc() if descending else order_column)
+        if after is not None:
+            query = query.where(order_column < after if descending else order_column > after)
+    else:
+        if descending:
+            query = query.order_by(order_column.desc(), table.c.id.desc())
+        else:
+            query = query.order_by(order_column, table.c.id)
+        if after is not None:
+            query = query.where(_keyset_clause(
+                order_column, table.c.id, descending, *after))
+    return query.limit(limit + 1), limit, order_field
+
+
+def list_page(rows, limit, order_field):
+    """Ubah hasil build_list_query menjadi body JSON daftar matakuliah"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if order_field == 'id':
+            next_cursor = last.id
+        else:
+            next_cursor = encode_cursor(getattr(last, order_field), last.id)
+
+    return {
+        'matakuliahs': RowList(rows),
+        'next_cursor': next_cursor,
+    }
+
+
+def export_query():
+    """Query seluruh kolom matakuliah berurutan id untuk export NDJSON"""
+    table = Matakuliah.__table__
+    # Kolom sama dengan to_dict(); updated_at hanya untuk Last-Modified
+    return select(*[table.c[field] for field in MATAKULIAH_FIELDS]).order_by(table.c.id)
+
+
+def search_tokens(q):
+    """Kata-kata pada kata kunci pencarian (huruf, angka, garis bawah)"""
+    return _TOKEN_RE.findall(q)
+
+
+def read_records(request):
+    """Baca body berupa array JSON atau NDJSON (satu objek per baris)"""
+    if request.content_type == 'application/x-ndjson':
+        records = []
+        for number, line in enumerate(request.body.decode('utf-8').splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f'Baris {number} bukan JSON yang valid')
+        return records
+
+    try:
+        records = request.json_body
+    except ValueError:
+        raise ValueError('Body harus berupa JSON yang valid')
+    if not isinstance(records, list):
+        raise ValueError('Body harus berupa array matakuliah')
+    return records
+
+
+def validate_records(records):
+    """Validasi seluruh record dalam satu kali jalan, termasuk kode_mk ganda"""
+    results = []
+    seen = set()
+    valid = True
+    for index, data in enumerate(records):
+        error = validate_matakuliah(data)
+        if error is None:
+            if data['kode_mk'] in seen:
+                error = f"kode_mk {data['kode_mk']} muncul lebih dari sekali"
+            seen.add(data['kode_mk'])
+        if error is None:
+            results.append({'index': index, 'success': True})
+        else:
+            results.append({'index': index, 'success': False, 'error': error})
+            valid = False
+    return valid, results
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_selection(json_data):
+    """Ambil kondisi dari 'ids' dan/atau 'filter', salah satunya wajib ada"""
+    ids = json_data.get('ids')
+    filters = json_data.get('filter')
+    if ids is None and not filters:
+        raise ValueError('Field ids atau filter wajib diisi')
+
+    if ids is not None:
+        if not isinstance(ids, list) or not all(_is_int(i) for i in ids):
+            raise ValueError('Field ids harus berupa array id')
+        if not ids:
+            raise ValueError('Field ids tidak boleh kosong')
+
+    if filters is not None:
+        if not isinstance(filters, dict):
+            raise ValueError('Field filter harus berupa objek')
+        for field, value in filters.items():
+            if field not in BULK_FILTER_FIELDS:
+                raise ValueError(f'Filter {field} tidak didukung')
+            if field == 'kode_mk':
+                if not isinstance(value, str):
+                    raise ValueError('Filter kode_mk harus berupa teks')
+            elif not _is_int(value):
+                raise ValueError(f'Filter {field} harus berupa bilangan bulat')
+
+    return matakuliah_criteria(ids=ids, filters=filters)
+
+
+def read_json_object(request):
+    """Baca body berupa objek JSON"""
+    try:
+        json_data = request.json_body
+    except ValueError:
+        raise ValueError('Body harus berupa JSON yang valid')
+    if not isinstance(json_data, dict):
+        raise ValueError('Body harus berupa objek JSON')
+    return json_data
+
+
+def parse_bulk_values(json_data):
+    """Ambil 'values' untuk bulk update, ValueError bila field atau tipenya salah"""
+    values = json_data.get('values')
+    if not isinstance(values, dict) or not values:
+        raise ValueError('Field values wajib diisi')
+    for field, value in values.items():
+        if field not in BULK_UPDATE_FIELDS:
+            raise ValueError(f'Field {field} tidak dapat diubah secara bulk')
+        error = validate_field(field, value)
+        if error is not None:
+            raise ValueError(error)
+    return values
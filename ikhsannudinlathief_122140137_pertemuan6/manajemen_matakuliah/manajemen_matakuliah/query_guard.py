@@ -0,0 +1,203 @@
+"""
+Pendeteksi N+1 dan query lambat untuk development dan CI.
+
+Guard ini opsional (``matakuliah.query_guard.enabled``). Bila aktif, tween
+``query_guard_tween_factory`` menghitung statement SQL per request dan
+mengelompokkan SELECT menurut bentuknya (teks SQL dengan daftar placeholder
+diringkas), sehingga lazy load yang dijalankan berulang kali untuk setiap
+baris terlihat sebagai satu bentuk yang muncul N kali.
+
+Pelanggaran (jumlah query melewati budget route, atau satu bentuk SELECT
+berulang minimal ``repeat_threshold`` kali) ditulis ke log sebagai warning,
+atau dilempar sebagai ``QueryBudgetExceeded`` bila ``raise = true`` seperti
+di testing.ini agar test di ``tests/`` gagal.
+
+Statement yang lebih lambat dari ``slow_ms`` dicatat bersama hasil
+``EXPLAIN QUERY PLAN`` (``EXPLAIN`` untuk database selain SQLite) yang
+dijalankan pada cursor terpisah.
+
+Guard tidak memasang event engine sendiri: statement dan durasinya
+diterima dari event instrumentation.py (``observe_statements``), sehingga
+setiap query hanya diukur sekali.
+"""
+import contextlib
+import logging
+import re
+
+from pyramid.settings import asbool, aslist
+from pyramid.tweens import INGRESS
+
+from .instrumentation import observe_statements
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUERIES = 20
+DEFAULT_REPEAT_THRESHOLD = 5
+DEFAULT_SLOW_MS = 100
+
+# Route yang tidak diperiksa (tidak menyentuh database)
+EXCLUDED_ROUTES = frozenset(['metrics', '__static/'])
+
+# Daftar placeholder "(?, ?, ?)" (qmark, format, pyformat, named, numeric)
+_PLACEHOLDER = r'(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)'
+_PLACEHOLDER_LIST = re.compile(
+    r'\(\s*' + _PLACEHOLDER + r'(?:\s*,\s*' + _PLACEHOLDER + r')+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """Request melewati budget query atau menjalankan pola N+1"""
+
+    def __init__(self, route, problems):
+        self.route = route
+        self.problems = problems
+        super().__init__(f'Route {route}: ' + '; '.join(problems))
+
+
+def statement_shape(statement):
+    """Teks SQL yang dinormalisasi agar query sejenis punya bentuk yang sama"""
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    return _PLACEHOLDER_LIST.sub('(?)', shape)
+
+
+def _is_select(statement):
+    return statement.lstrip()[:6].upper().startswith(('SELECT', 'WITH'))
+
+
+class QueryLog:
+    """Catatan query satu request (atau satu blok ``capture_queries``)"""
+
+    def __init__(self, slow_ms=None, explain=True):
+        self.count = 0
+        self.shapes = {}
+        self.slow = []
+        self.slow_seconds = None if slow_ms is None else slow_ms / 1000
+        self.explain = explain
+
+    def record(self, statement, executemany):
+        self.count += 1
+        # executemany adalah satu batch penulisan, bukan pola N+1
+        if not executemany and _is_select(statement):
+            shape = statement_shape(statement)
+            self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def observe(self, conn, statement, parameters, executemany, elapsed):
+        """Observer untuk ``observe_statements``"""
+        self.record(statement, executemany)
+        if self.slow_seconds is None or elapsed < self.slow_seconds:
+            return
+        plan = None
+        if self.explain and not executemany and _is_select(statement):
+            plan = explain(conn, statement, parameters)
+        self.slow.append((statement, elapsed, plan))
+        log.warning(
+            'Query lambat (%.1f ms): %s%s', elapsed * 1000, statement,
+            ''.join('\n    ' + line for line in ['Query plan:'] + plan) if plan else '')
+
+    def repeated(self, threshold):
+        """Bentuk SELECT yang dijalankan minimal ``threshold`` kali"""
+        return sorted(
+            ((shape, count) for shape, count in self.shapes.items()
+             if count >= threshold),
+            key=lambda item: -item[1])
+
+
+def explain(conn, statement, parameters):
+    """
+    Rencana eksekusi statement, dijalankan pada cursor DBAPI terpisah agar
+    hasil cursor asli tidak terganggu dan tidak memicu event engine lagi.
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+    except Exception as e:
+        return [f'EXPLAIN gagal: {e}']
+    finally:
+        cursor.close()
+
+
+@contextlib.contextmanager
+def capture_queries(querylog=None):
+    """
+    Catat query yang dijalankan di dalam blok ini, misalnya di test::
+
+        with capture_queries() as queries:
+            ...
+        assert queries.count <= 2
+    """
+    querylog = querylog if querylog is not None else QueryLog()
+    with observe_statements(querylog.observe):
+        yield querylog
+
+
+def parse_budgets(value):
+    """Baris ``nama_route = jumlah`` dari .ini menjadi dict"""
+    budgets = {}
+    for line in aslist(value or '', flatten=False):
+        name, sep, limit = line.partition('=')
+        if not sep:
+            raise ValueError(f'Budget query tidak valid: {line!r}')
+        budgets[name.strip()] = int(limit)
+    return budgets
+
+
+class QueryGuardPolicy:
+    """Pengaturan guard yang dibaca dari ``matakuliah.query_guard.*``"""
+
+    def __init__(self, settings):
+        prefix = 'matakuliah.query_guard.'
+        self.enabled = asbool(settings.get(prefix + 'enabled', False))
+        self.max_queries = int(settings.get(prefix + 'max_queries', DEFAULT_MAX_QUERIES))
+        self.budgets = parse_budgets(settings.get(prefix + 'budgets'))
+        self.repeat_threshold = int(settings.get(
+            prefix + 'repeat_threshold', DEFAULT_REPEAT_THRESHOLD))
+        slow_ms = settings.get(prefix + 'slow_ms', DEFAULT_SLOW_MS)
+        self.slow_ms = float(slow_ms) if str(slow_ms).strip() else None
+        self.explain = asbool(settings.get(prefix + 'explain', True))
+        self.raise_errors = asbool(settings.get(prefix + 'raise', False))
+
+    def budget(self, route):
+        return self.budgets.get(route, self.max_queries)
+
+    def check(self, route, querylog):
+        """Daftar pelanggaran (kosong bila request aman)"""
+        problems = []
+        budget = self.budget(route)
+        if querylog.count > budget:
+            problems.append(f'{querylog.count} query melebihi budget {budget}')
+        for shape, count in querylog.repeated(self.repeat_threshold):
+            problems.append(f'kemungkinan N+1, {count}x: {shape}')
+        return problems
+
+
+def query_guard_tween_factory(handler, registry):
+    policy = QueryGuardPolicy(registry.settings)
+    if not policy.enabled:
+        return handler
+
+    def query_guard_tween(request):
+        querylog = QueryLog(policy.slow_ms, policy.explain)
+        with capture_queries(querylog):
+            response = handler(request)
+
+        route = request.matched_route.name if request.matched_route else 'unmatched'
+        if route in EXCLUDED_ROUTES:
+            return response
+        problems = policy.check(route, querylog)
+        if problems:
+            if policy.raise_errors:
+                raise QueryBudgetExceeded(route, problems)
+            for problem in problems:
+                log.warning('%s %s (route %s): %s',
+                            request.method, request.path, route, problem)
+        return response
+
+    return query_guard_tween
+
+
+def includeme(config):
+    config.add_tween(
+        'manajemen_matakuliah.query_guard.query_guard_tween_factory',
+        under=INGRESS)
@@ -0,0 +1,97 @@
+"""
+Renderer JSON cepat untuk view matakuliah.
+
+Renderer ``fastjson`` memakai orjson bila terpasang dan jatuh ke modul json
+standar bila tidak. Daftar baris Core dibungkus ``RowList``: nama kolom
+dihitung sekali per hasil query, lalu setiap tuple baris dipasangkan dengan
+nama tersebut dan seluruh daftar di-encode dalam satu panggilan encoder.
+Ini menghindari ``Row._asdict()`` dan ``to_dict()`` yang mendominasi waktu
+serialisasi (lihat ``benchmarks/json_render.py``).
+
+Satu dict per baris tetap dibuat dengan ``zip`` dan menjadi sebagian besar
+sisa waktu render. Serializer tanpa dict yang ditulis di Python (potongan
+``{"kolom":`` tetap, nilai di-encode per kolom) terukur lebih lambat,
+karena setiap nilai menjadi satu panggilan fungsi, sehingga tidak dipakai.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def json_default(obj):
+    """Hook ``default`` untuk objek dengan ``__json__`` (misalnya RowList)"""
+    if hasattr(obj, '__json__'):
+        return obj.__json__(None)
+    raise TypeError(f'Objek {type(obj).__name__} tidak dapat dijadikan JSON')
+
+
+if orjson is not None:
+    def dumps(value):
+        return orjson.dumps(value, default=json_default)
+
+    def _dumps_line(value):
+        return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE)
+else:  # pragma: no cover
+    def dumps(value):
+        return json.dumps(value, default=json_default).encode('utf-8')
+
+    def _dumps_line(value):
+        return (json.dumps(value) + '\n').encode('utf-8')
+
+
+def row_keys(rows):
+    # Nama kolom Core berupa subclass str (quoted_name) yang ditolak orjson
+    # sebagai key, jadi diubah sekali ke str biasa
+    return tuple(str(key) for key in rows[0]._fields) if rows else ()
+
+
+class RowList:
+    """Daftar baris Core yang diserialisasi langsung oleh renderer fastjson"""
+
+    __slots__ = ('rows', 'keys')
+
+    def __init__(self, rows, keys=None):
+        self.rows = rows
+        self.keys = tuple(str(key) for key in keys) if keys is not None else row_keys(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __json__(self, request):
+        # dict dari zip lebih cepat daripada encode per kolom di Python
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in self.rows]
+
+
+def render(value):
+    """Serialisasi value menjadi bytes JSON"""
+    return dumps(value)
+
+
+def ndjson(rows):
+    """Satu baris JSON per row Core, dipakai oleh export streaming"""
+    keys = row_keys(rows)
+    return b''.join([_dumps_line(dict(zip(keys, row))) for row in rows])
+
+
+class FastJSONRenderer:
+    """
+    Renderer ``fastjson``. Sama seperti renderer ``json`` bawaan Pyramid,
+    tetapi memakai orjson dan serialisasi RowList tanpa ``Row._asdict()``.
+    """
+
+    def __call__(self, info):
+        def _render(value, system):
+            request = system.get('request')
+            if request is not None:
+                response = request.response
+                if response.content_type == response.default_content_type:
+                    response.content_type = 'application/json'
+            return render(value)
+        return _render
@@ -1,9 +1,18 @@
 def includeme(config):
-    config.add_static_view('static', 'static', cache_max_age=3600)
+    # File .br/.gz hasil precompress_manajemen_matakuliah_static dipakai bila ada
+    config.add_static_view('static', 'static', cache_max_age=3600,
+                           content_encodings=['br', 'gzip'])
     config.add_route('home', '/')
+    config.add_route('metrics', '/metrics')
 
     # Matakuliah routes dengan request_method untuk membedakan endpoint dengan URL yang sama
     config.add_route('matakuliah_list', '/api/matakuliah', request_method='GET')
+    # Route statis didaftarkan sebelum /api/matakuliah/{id} agar tidak tertangkap sebagai id
+    config.add_route('matakuliah_export', '/api/matakuliah/export', request_method='GET')
+    config.add_route('matakuliah_search', '/api/matakuliah/search', request_method='GET')
+    config.add_route('matakuliah_bulk_upsert', '/api/matakuliah/bulk', request_method='POST')
+    config.add_route('matakuliah_bulk_update', '/api/matakuliah/bulk', request_method='PATCH')
+    config.add_route('matakuliah_bulk_delete', '/api/matakuliah/bulk', request_method='DELETE')
     config.add_route('matakuliah_detail', '/api/matakuliah/{id}', request_method='GET')
     config.add_route('matakuliah_add', '/api/matakuliah', request_method='POST')
     config.add_route('matakuliah_update', '/api/matakuliah/{id}', request_method='PUT')
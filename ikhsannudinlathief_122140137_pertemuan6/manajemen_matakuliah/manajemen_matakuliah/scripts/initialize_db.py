@@ -1,11 +1,53 @@
+"""
+Isi database matakuliah.
+
+Tanpa opsi, script menambahkan fixture ``setup_models``. Data kurikulum
+dalam jumlah besar dapat diimpor dari CSV atau Parquet (butuh pyarrow),
+atau dibangkitkan secara sintetis untuk uji beban::
+
+    initialize_manajemen_matakuliah_db development.ini
+    initialize_manajemen_matakuliah_db development.ini --csv kurikulum.csv
+    initialize_manajemen_matakuliah_db development.ini --parquet kurikulum.parquet
+    initialize_manajemen_matakuliah_db development.ini --generate 500000
+
+File dibaca secara streaming dan ditulis per batch; setiap batch di-commit
+sendiri sehingga memori tetap kecil dan impor yang terhenti dapat diulang.
+Secara default baris di-upsert berdasarkan kode_mk (idempoten); ``--insert``
+memakai INSERT biasa yang lebih cepat untuk tabel kosong.
+"""
 import argparse
+import csv
+import random
 import sys
+import time
 import transaction
+import zope.sqlalchemy
 
 from pyramid.paster import bootstrap, setup_logging
+from sqlalchemy import insert
 from sqlalchemy.exc import OperationalError
 
 from .. import models
+from ..models.bulk import DEFAULT_CHUNK_SIZE, upsert_matakuliah
+from ..queries import REQUIRED_FIELDS, TEXT_FIELDS, validate_matakuliah
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pq = None
+
+# Jumlah baris per transaksi (commit) saat impor
+DEFAULT_BATCH_SIZE = 10000
+
+# Jumlah pesan baris tidak valid yang dicetak
+MAX_REPORTED_ERRORS = 20
+
+SYNTHETIC_NAMES = (
+    'Algoritma', 'Basis Data', 'Jaringan Komputer', 'Sistem Operasi',
+    'Kecerdasan Buatan', 'Pemrograman Web', 'Grafika Komputer',
+    'Keamanan Informasi', 'Rekayasa Perangkat Lunak', 'Statistika',
+)
+
 
 def setup_models(dbsession):
     """
@@ -29,15 +71,176 @@ def setup_models(dbsession):
     dbsession.add(matakuliah1)
     dbsession.add(matakuliah2)
 
+
+def read_csv(path, delimiter=','):
+    """Baca baris CSV satu per satu sebagai dict (header = nama kolom)"""
+    # utf-8-sig agar BOM dari ekspor Excel tidak ikut menjadi nama kolom
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def read_parquet(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Baca file Parquet per record batch, hanya kolom matakuliah"""
+    if pq is None:
+        raise RuntimeError(
+            'Impor Parquet membutuhkan pyarrow: pip install -e ".[parquet]"')
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(
+            batch_size=batch_size, columns=list(REQUIRED_FIELDS)):
+        yield from batch.to_pylist()
+
+
+def generate_matakuliah(count, seed=0, prefix='GEN'):
+    """Data matakuliah sintetis untuk uji beban, deterministik per seed"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'kode_mk': f'{prefix}{i:07d}',
+            'nama_mk': f'{rng.choice(SYNTHETIC_NAMES)} {i}',
+            'sks': rng.randint(1, 4),
+            'semester': rng.randint(1, 8),
+        }
+
+
+def clean_record(data):
+    """
+    Validasi dan normalisasi satu baris impor. Mengembalikan
+    (record, None) atau (None, pesan error).
+    """
+    if isinstance(data, dict):
+        # Nilai dari CSV berupa teks: rapikan spasi dan ubah sks/semester ke
+        # int, lalu validasi dengan aturan yang sama dengan API
+        data = {field: _coerce(field, data[field])
+                for field in REQUIRED_FIELDS if field in data}
+    error = validate_matakuliah(data)
+    if error is not None:
+        return None, error
+    return data, None
+
+
+def _coerce(field, value):
+    if field in TEXT_FIELDS:
+        return str(value or '').strip()
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    return value
+
+
+class ImportStats:
+    def __init__(self):
+        self.imported = 0
+        self.invalid = 0
+        self.batches = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+
+def _valid_batches(rows, batch_size, stats):
+    """Kelompokkan baris valid per batch; kode_mk ganda dalam batch dipakai yang terakhir"""
+    batch = {}
+    # Nomor baris mengikuti file CSV (baris 1 adalah header)
+    for line, data in enumerate(rows, start=2):
+        record, error = clean_record(data)
+        if error is not None:
+            stats.invalid += 1
+            if len(stats.errors) < MAX_REPORTED_ERRORS:
+                stats.errors.append(f'baris {line}: {error}')
+            continue
+        batch[record['kode_mk']] = record
+        if len(batch) >= batch_size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def _insert_statement(dbsession):
+    table = models.Matakuliah.__table__
+    stmt = insert(table)
+    if dbsession.get_bind().dialect.insert_executemany_returning:
+        # RETURNING membuat SQLAlchemy memakai mode "insertmanyvalues" (satu
+        # INSERT multi-VALUES per chunk); pada SQLite ~2x lebih cepat
+        # daripada executemany per baris
+        stmt = stmt.returning(table.c.id)
+    return stmt
+
+
+def import_records(session_factory, rows, batch_size=DEFAULT_BATCH_SIZE,
+                   chunk_size=DEFAULT_CHUNK_SIZE, upsert=True, progress=None):
+    """
+    Tulis baris impor ke database per batch, satu transaksi per batch.
+    Baris tidak valid dilewati dan dicatat di ImportStats.
+    """
+    stats = ImportStats()
+    for batch in _valid_batches(rows, batch_size, stats):
+        with transaction.manager:
+            dbsession = models.get_tm_session(session_factory, transaction.manager)
+            if upsert:
+                upsert_matakuliah(dbsession, batch, chunk_size=chunk_size)
+            else:
+                stmt = _insert_statement(dbsession)
+                for start in range(0, len(batch), chunk_size):
+                    dbsession.execute(stmt, batch[start:start + chunk_size])
+                # Statement Core tidak terlihat oleh zope.sqlalchemy
+                zope.sqlalchemy.mark_changed(dbsession)
+        stats.imported += len(batch)
+        stats.batches += 1
+        stats.elapsed = time.perf_counter() - stats.started
+        if progress is not None:
+            progress(stats)
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
+
+
 def parse_args(argv):
     parser = argparse.ArgumentParser()
     parser.add_argument(
         'config_uri',
         help='Configuration file, e.g., development.ini',
     )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--csv', metavar='PATH', help='Impor dari file CSV')
+    source.add_argument('--parquet', metavar='PATH',
+                        help='Impor dari file Parquet (butuh pyarrow)')
+    source.add_argument('--generate', metavar='N', type=int,
+                        help='Bangkitkan N matakuliah sintetis')
+    parser.add_argument('--delimiter', default=',', help='Pemisah kolom CSV')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed generator data sintetis')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Jumlah baris per commit')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Jumlah baris per statement executemany')
+    parser.add_argument('--insert', action='store_true',
+                        help='INSERT biasa tanpa upsert (gagal bila kode_mk sudah ada)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Jangan cetak progres per batch')
     return parser.parse_args(argv[1:])
 
 
+def _source_rows(args):
+    if args.csv:
+        return read_csv(args.csv, args.delimiter)
+    if args.parquet:
+        return read_parquet(args.parquet, args.batch_size)
+    if args.generate is not None:
+        return generate_matakuliah(args.generate, args.seed)
+    return None
+
+
+def _print_progress(stats):
+    print(f'{stats.imported} baris '
+          f'({stats.rows_per_sec:.0f} baris/detik)', file=sys.stderr)
+
+
 def main(argv=sys.argv):
     args = parse_args(argv)
     setup_logging(args.config_uri)
@@ -46,10 +249,25 @@ def main(argv=sys.argv):
     try:
         # Get the session factory
         session_factory = env['registry']['dbsession_factory']
-        # Create a session with transaction management
-        with transaction.manager:
-            dbsession = models.get_tm_session(session_factory, transaction.manager)
-            setup_models(dbsession)
+        rows = _source_rows(args)
+        if rows is None:
+            # Create a session with transaction management
+            with transaction.manager:
+                dbsession = models.get_tm_session(session_factory, transaction.manager)
+                setup_models(dbsession)
+            return
+
+        stats = import_records(
+            session_factory, rows, args.batch_size, args.chunk_size,
+            upsert=not args.insert,
+            progress=None if args.quiet else _print_progress)
+        for error in stats.errors:
+            print(f'Dilewati, {error}')
+        if stats.invalid > len(stats.errors):
+            print(f'... dan {stats.invalid - len(stats.errors)} baris tidak valid lainnya')
+        print(f'{stats.imported} baris diimpor dalam {stats.batches} batch, '
+              f'{stats.invalid} baris tidak valid, {stats.elapsed:.1f} detik '
+              f'({stats.rows_per_sec:.0f} baris/detik)')
     except OperationalError:
         print('''
 Pyramid is having a problem using your SQL database.  The problem
@@ -62,6 +280,8 @@ might be caused by one of the following things:
     database server referred to by the "sqlalchemy.url" setting in
     your "development.ini" file is running.
             ''')
+    finally:
+        env['closer']()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
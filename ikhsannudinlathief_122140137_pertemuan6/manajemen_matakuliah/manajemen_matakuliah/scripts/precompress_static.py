@@ -0,0 +1,114 @@
+"""
+Buat versi ``.gz`` dan ``.br`` dari file statis saat build/deploy.
+
+``add_static_view(..., content_encodings=['br', 'gzip'])`` di routes.py
+akan menyajikan file tersebut langsung bila klien mendukungnya, sehingga
+tidak ada kompresi per request untuk aset statis.
+
+    precompress_manajemen_matakuliah_static
+    precompress_manajemen_matakuliah_static path/ke/static --min-size 512
+"""
+import argparse
+import gzip
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+DEFAULT_STATIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+# Ekstensi file teks yang masih bisa mengecil bila dikompresi
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.json', '.svg', '.html', '.txt', '.xml', '.map',
+)
+
+DEFAULT_MIN_SIZE = 256
+
+
+def _gzip(data):
+    # mtime=0 agar hasil build identik untuk isi yang sama
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def encoders():
+    result = [('.gz', _gzip)]
+    if brotli is not None:
+        result.append(('.br', _brotli))
+    return result
+
+
+def _up_to_date(source, target):
+    return (os.path.exists(target)
+            and os.path.getmtime(target) >= os.path.getmtime(source))
+
+
+def precompress_file(path, min_size=DEFAULT_MIN_SIZE, force=False):
+    """
+    Kompresi satu file. Mengembalikan daftar (path_tujuan, ukuran) yang
+    ditulis; file hasil yang tidak lebih kecil dari aslinya dihapus.
+    """
+    written = []
+    size = os.path.getsize(path)
+    if size < min_size:
+        return written
+    data = None
+    for suffix, compress in encoders():
+        target = path + suffix
+        if not force and _up_to_date(path, target):
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        compressed = compress(data)
+        if len(compressed) >= size:
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, 'wb') as f:
+            f.write(compressed)
+        written.append((target, len(compressed)))
+    return written
+
+
+def precompress_directory(directory, min_size=DEFAULT_MIN_SIZE, force=False):
+    written = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                written.extend(precompress_file(
+                    os.path.join(root, name), min_size, force))
+    return written
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'directory', nargs='?', default=DEFAULT_STATIC_DIR,
+        help='Folder aset statis, default folder static milik paket',
+    )
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument('--force', action='store_true',
+                        help='Kompresi ulang walaupun file hasil masih baru')
+    return parser.parse_args(argv[1:])
+
+
+def main(argv=sys.argv):
+    args = parse_args(argv)
+    if brotli is None:
+        print('Paket brotli tidak terpasang, hanya membuat file .gz')
+    written = precompress_directory(args.directory, args.min_size, args.force)
+    for target, size in written:
+        print(f'{os.path.relpath(target, args.directory)}: {size} byte')
+    print(f'{len(written)} file ditulis')
+
+
+if __name__ == '__main__':
+    main()
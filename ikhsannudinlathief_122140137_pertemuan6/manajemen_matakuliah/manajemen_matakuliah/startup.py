@@ -0,0 +1,175 @@
+"""
+Registrasi view dan fase warm-up saat aplikasi dibuat.
+
+Secara default ``main()`` memindai seluruh paket dengan ``config.scan()``.
+Dengan ``matakuliah.startup.scan = false`` hanya modul di ``VIEW_MODULES``
+yang dipindai, sehingga modul lain (asgi, scripts, alembic) tidak ikut
+di-import saat boot.
+
+Warm-up (``matakuliah.startup.warmup = true``) dijalankan sekali setelah
+aplikasi WSGI dibuat, sebelum request pertama:
+
+- seluruh template di ``templates/`` dikompilasi ke cache Jinja2
+- pool koneksi dibuka hingga ``pool_connections`` koneksi per engine
+- query utama dijalankan sekali pada setiap koneksi, sehingga cache
+  kompilasi SQLAlchemy dan cache statement sqlite3 per koneksi sudah terisi
+
+Waktu import, konfigurasi, dan warm-up dicatat ke log
+``manajemen_matakuliah.startup`` dan ke metrik ``matakuliah_boot_seconds``.
+"""
+import json
+import logging
+import os
+import time
+
+from pyramid.events import ApplicationCreated
+from pyramid.settings import asbool
+from pyramid_jinja2 import IJinja2Environment
+
+from .conditional import detail_etag, list_etag
+from .metrics import Gauge
+from .models.matakuliah import Matakuliah
+from .queries import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, build_list_query
+
+log = logging.getLogger(__name__)
+
+# Modul yang berisi @view_config, dipakai bila scan dimatikan.
+# Tambahkan modul view baru di sini.
+VIEW_MODULES = (
+    '.views.default',
+    '.views.notfound',
+    '.views.metrics',
+    '.views.api.matakuliah',
+    '.views.api.matakuliah_bulk',
+    '.views.api.matakuliah_search',
+)
+
+TEMPLATE_PACKAGE = 'manajemen_matakuliah'
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+TEMPLATE_EXTENSIONS = ('.jinja2',)
+
+
+class _MatchDict:
+    """Request tiruan untuk fungsi ETag yang membaca ``matchdict['id']``"""
+
+    def __init__(self, matakuliah_id):
+        self.matchdict = {'id': matakuliah_id}
+
+
+def include_views(config):
+    """Daftarkan view lewat scan paket atau daftar VIEW_MODULES"""
+    settings = config.get_settings()
+    if asbool(settings.get('matakuliah.startup.scan', True)):
+        config.scan()
+    else:
+        for module in VIEW_MODULES:
+            config.scan(module)
+
+
+def warm_templates(registry):
+    """Kompilasi seluruh template ke cache environment Jinja2"""
+    environment = registry.queryUtility(IJinja2Environment, name='.jinja2')
+    if environment is None:
+        return 0
+    count = 0
+    for root, _, files in os.walk(TEMPLATE_DIR):
+        for name in sorted(files):
+            if not name.endswith(TEMPLATE_EXTENSIONS):
+                continue
+            path = os.path.relpath(os.path.join(root, name), os.path.dirname(TEMPLATE_DIR))
+            # Nama sama dengan renderer di @view_config agar cache-nya terpakai
+            environment.get_template(f"{TEMPLATE_PACKAGE}:{path.replace(os.sep, '/')}")
+            count += 1
+    return count
+
+
+def warm_statements(dbsession, settings):
+    """Jalankan query utama sekali tanpa mengubah data"""
+    page_size = int(settings.get('matakuliah.page_size', DEFAULT_PAGE_SIZE))
+    max_page_size = int(settings.get('matakuliah.max_page_size', MAX_PAGE_SIZE))
+    query, _, _ = build_list_query({}, page_size, max_page_size)
+    dbsession.execute(query).all()
+    dbsession.query(Matakuliah).filter_by(id=0).first()
+    list_etag(dbsession, None)
+    detail_etag(dbsession, _MatchDict(0))
+
+
+def _engines(registry):
+    engines = [registry['dbsession_factory'].kw['bind']]
+    replicas = registry.get('replica_session_factory')
+    if replicas is not None:
+        engines.extend(replicas.engines)
+    return engines
+
+
+def warm_pool(registry, connections, statements=True):
+    """
+    Buka ``connections`` koneksi per engine (dibatasi pool_size) lalu
+    kembalikan ke pool. Mengembalikan jumlah koneksi yang dibuka.
+    """
+    session_factory = registry['dbsession_factory']
+    settings = registry.settings
+    opened = 0
+    for engine in _engines(registry):
+        size = getattr(engine.pool, 'size', lambda: connections)()
+        held = []
+        try:
+            for _ in range(min(connections, size)):
+                connection = engine.connect()
+                held.append(connection)
+                if statements:
+                    with session_factory(bind=connection) as dbsession:
+                        warm_statements(dbsession, settings)
+                        dbsession.rollback()
+        finally:
+            for connection in held:
+                connection.close()
+        opened += len(held)
+    return opened
+
+
+def record_boot_time(registry, phase, seconds):
+    metrics = registry.get('matakuliah_metrics')
+    if metrics is not None:
+        gauge = registry.get('matakuliah_boot_seconds')
+        if gauge is None:
+            gauge = registry['matakuliah_boot_seconds'] = metrics.register(Gauge(
+                'matakuliah_boot_seconds', 'Waktu boot per fase (detik)', ('phase',)))
+        gauge.set((phase,), seconds)
+
+
+def warm_up(registry):
+    """Fase warm-up, mengembalikan ringkasan untuk log"""
+    settings = registry.settings
+    prefix = 'matakuliah.startup.'
+    summary = {}
+    if asbool(settings.get(prefix + 'templates', True)):
+        summary['templates'] = warm_templates(registry)
+    connections = int(settings.get(
+        prefix + 'pool_connections', settings.get('sqlalchemy.pool_size', 5)))
+    if connections > 0:
+        summary['connections'] = warm_pool(
+            registry, connections,
+            statements=asbool(settings.get(prefix + 'statements', True)))
+    return summary
+
+
+def _on_application_created(event):
+    registry = event.app.registry
+    settings = registry.settings
+    boot = registry.get('matakuliah_boot_times', {})
+    if asbool(settings.get('matakuliah.startup.warmup', False)):
+        start = time.perf_counter()
+        boot.update(warm_up(registry))
+        boot['warmup'] = time.perf_counter() - start
+    for phase in ('import', 'configure', 'warmup'):
+        if phase in boot:
+            record_boot_time(registry, phase, boot[phase])
+    log.info(json.dumps(dict(
+        {'event': 'boot'},
+        **{key: round(value, 4) if isinstance(value, float) else value
+           for key, value in boot.items()})))
+
+
+def includeme(config):
+    config.add_subscriber(_on_application_created, ApplicationCreated)
@@ -1,25 +1,105 @@
 import datetime
 from pyramid.view import view_config
+from pyramid.response import Response
 from pyramid.httpexceptions import (
     HTTPFound,
     HTTPNotFound,
     HTTPBadRequest,
+    HTTPConflict,
+    exception_response,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from ...cache import (
+    LIST_TAG,
+    cached_view,
+    invalidate_matakuliah,
+    item_tag,
+)
+from ...conditional import (
+    check_version,
+    conditional_view,
+    detail_etag,
+    list_etag,
+    row_etag,
 )
 from ...models.matakuliah import Matakuliah
+from ...queries import (
+    DEFAULT_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    UPDATE_FIELDS,
+    build_list_query,
+    export_query,
+    list_page,
+    read_json_object,
+    validate_field,
+    validate_matakuliah,
+)
+from ...renderers import ndjson
 
 
-@view_config(route_name='matakuliah_list', renderer='json')
+@view_config(route_name='matakuliah_list', renderer='fastjson',
+             decorator=(conditional_view(list_etag),
+                        cached_view(lambda request: [LIST_TAG])))
 def matakuliah_list(request):
-    """View untuk menampilkan daftar matakuliah"""
-    dbsession = request.dbsession
-    matakuliahs = dbsession.query(Matakuliah).all()
-    return {'matakuliahs': [m.to_dict() for m in matakuliahs]}
+    """View untuk menampilkan daftar matakuliah per halaman dengan filter"""
+    settings = request.registry.settings
+    page_size = int(settings.get('matakuliah.page_size', DEFAULT_PAGE_SIZE))
+    max_page_size = int(settings.get('matakuliah.max_page_size', MAX_PAGE_SIZE))
+
+    try:
+        query, limit, order_field = build_list_query(
+            request.params, page_size, max_page_size)
+    except ValueError as e:
+        return HTTPBadRequest(json_body={'error': str(e)})
+
+    # Ambil satu baris lebih untuk mengetahui apakah masih ada halaman berikutnya
+    rows = request.read_dbsession.execute(query).all()
+    return list_page(rows, limit, order_field)
+
+
+def iter_matakuliah_ndjson(dbsession, batch_size=EXPORT_BATCH_SIZE):
+    """Generator NDJSON seluruh tabel matakuliah, satu chunk per batch cursor"""
+    query = export_query()
+    # yield_per mengaktifkan stream_results (server-side cursor bila didukung)
+    result = dbsession.execute(query.execution_options(yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            yield ndjson(rows)
+    finally:
+        result.close()
+
+
+def _export_app_iter(session_factory, batch_size):
+    # Session dibuat sendiri karena app_iter baru dibaca setelah pyramid_tm
+    # menutup transaksi request
+    dbsession = session_factory()
+    try:
+        yield from iter_matakuliah_ndjson(dbsession, batch_size)
+    finally:
+        dbsession.close()
+
+
+@view_config(route_name='matakuliah_export')
+def matakuliah_export(request):
+    """View untuk export seluruh matakuliah sebagai NDJSON secara streaming"""
+    settings = request.registry.settings
+    batch_size = int(settings.get('matakuliah.export.batch_size', EXPORT_BATCH_SIZE))
+
+    response = Response(content_type='application/x-ndjson')
+    response.content_disposition = 'attachment; filename="matakuliah.ndjson"'
+    response.app_iter = _export_app_iter(
+        request.registry['read_session_factory'], batch_size)
+    return response
 
 
-@view_config(route_name='matakuliah_detail', renderer='json')
+@view_config(route_name='matakuliah_detail', renderer='fastjson',
+             decorator=(conditional_view(detail_etag),
+                        cached_view(lambda request: [item_tag(request.matchdict['id'])])))
 def matakuliah_detail(request):
     """View untuk melihat detail satu matakuliah"""
-    dbsession = request.dbsession
+    dbsession = request.read_dbsession
     matakuliah_id = request.matchdict['id']
     matakuliah = dbsession.query(Matakuliah).filter_by(id=matakuliah_id).first()
     
@@ -29,7 +109,7 @@ def matakuliah_detail(request):
     return {'matakuliah': matakuliah.to_dict()}
 
 
-@view_config(route_name='matakuliah_add', request_method='POST', renderer='json')
+@view_config(route_name='matakuliah_add', request_method='POST', renderer='fastjson')
 def matakuliah_add(request):
     """View untuk menambahkan matakuliah baru"""
     try:
@@ -37,10 +117,9 @@ def matakuliah_add(request):
         json_data = request.json_body
         
         # Validasi data minimal
-        required_fields = ['kode_mk', 'nama_mk', 'sks', 'semester']
-        for field in required_fields:
-            if field not in json_data:
-                return HTTPBadRequest(json_body={'error': f'Field {field} wajib diisi'})
+        error = validate_matakuliah(json_data)
+        if error is not None:
+            return HTTPBadRequest(json_body={'error': error})
         
         # Buat objek matakuliah baru
         matakuliah = Matakuliah(
@@ -54,14 +133,20 @@ def matakuliah_add(request):
         dbsession = request.dbsession
         dbsession.add(matakuliah)
         dbsession.flush()  # Untuk mendapatkan ID yang baru dibuat
+        invalidate_matakuliah(request, [matakuliah.id])
         
         return {'success': True, 'matakuliah': matakuliah.to_dict()}
             
-    except Exception as e:
-        return HTTPBadRequest(json_body={'error': str(e)})
+    except IntegrityError:
+        # Dilempar agar pyramid_tm membatalkan transaksi; pesan database
+        # tidak dikirim ke klien
+        raise HTTPConflict(json_body={'error': 'kode_mk sudah dipakai matakuliah lain'})
+    except ValueError as e:
+        # Body bukan JSON yang valid
+        raise HTTPBadRequest(json_body={'error': str(e)})
 
 
-@view_config(route_name='matakuliah_update', request_method='PUT', renderer='json')
+@view_config(route_name='matakuliah_update', request_method='PUT', renderer='fastjson')
 def matakuliah_update(request):
     """View untuk mengupdate data matakuliah"""
     dbsession = request.dbsession
@@ -74,8 +159,20 @@ def matakuliah_update(request):
     
     try:
         # Ambil data dari request JSON
-        json_data = request.json_body
+        json_data = read_json_object(request)
+
+        # Optimistic locking: klien wajib menyebut versi yang ingin diubah
+        problem = check_version(request.headers.get('If-Match'), json_data, matakuliah)
+        if problem is not None:
+            status, error = problem
+            return exception_response(status, json_body={'error': error})
         
+        for field in UPDATE_FIELDS:
+            if field in json_data:
+                error = validate_field(field, json_data[field])
+                if error is not None:
+                    return HTTPBadRequest(json_body={'error': error})
+
         # Update atribut yang ada di request
         if 'kode_mk' in json_data:
             matakuliah.kode_mk = json_data['kode_mk']
@@ -85,14 +182,26 @@ def matakuliah_update(request):
             matakuliah.sks = json_data['sks']
         if 'semester' in json_data:
             matakuliah.semester = json_data['semester']
-                
+        # UPDATE ... WHERE version = :lama dijalankan sekarang agar konflik
+        # terdeteksi di sini dan versi baru bisa dikirim ke klien
+        dbsession.flush()
+        invalidate_matakuliah(request, [matakuliah.id])
+
+        request.response.etag = row_etag(matakuliah.id, matakuliah.version)
         return {'success': True, 'matakuliah': matakuliah.to_dict()}
-        
-    except Exception as e:
-        return HTTPBadRequest(json_body={'error': str(e)})
+
+    except StaleDataError:
+        # Baris diubah request lain di antara SELECT dan UPDATE. Dilempar
+        # (bukan dikembalikan) agar pyramid_tm membatalkan transaksi
+        raise HTTPConflict(json_body={
+            'error': 'Matakuliah sudah diubah, ambil ulang data terbaru'})
+    except IntegrityError:
+        raise HTTPConflict(json_body={'error': 'kode_mk sudah dipakai matakuliah lain'})
+    except ValueError as e:
+        raise HTTPBadRequest(json_body={'error': str(e)})
 
 
-@view_config(route_name='matakuliah_delete', request_method='DELETE', renderer='json')
+@view_config(route_name='matakuliah_delete', request_method='DELETE', renderer='fastjson')
 def matakuliah_delete(request):
     """View untuk menghapus data matakuliah"""
     dbsession = request.dbsession
@@ -105,5 +214,6 @@ def matakuliah_delete(request):
     
     # Hapus dari database
     dbsession.delete(matakuliah)
+    invalidate_matakuliah(request, [matakuliah.id])
     
     return {'success': True, 'message': f'Matakuliah dengan id {matakuliah_id} berhasil dihapus'}
\ No newline at end of file
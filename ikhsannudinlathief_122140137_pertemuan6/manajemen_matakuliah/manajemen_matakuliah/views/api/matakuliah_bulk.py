@@ -0,0 +1,73 @@
+from pyramid.view import view_config
+from pyramid.httpexceptions import HTTPBadRequest
+
+from ...cache import invalidate_matakuliah
+from ...models.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    bulk_delete_matakuliah,
+    bulk_update_matakuliah,
+    upsert_matakuliah,
+)
+from ...queries import (
+    REQUIRED_FIELDS,
+    parse_bulk_values,
+    parse_selection,
+    read_json_object,
+    read_records,
+    validate_records,
+)
+
+
+@view_config(route_name='matakuliah_bulk_upsert', renderer='fastjson')
+def matakuliah_bulk_upsert(request):
+    """View untuk menambahkan atau memperbarui banyak matakuliah sekaligus"""
+    try:
+        records = read_records(request)
+    except ValueError as e:
+        return HTTPBadRequest(json_body={'error': str(e)})
+    if not records:
+        return HTTPBadRequest(json_body={'error': 'Tidak ada matakuliah yang dikirim'})
+
+    # Jika ada satu saja yang tidak valid, tidak ada yang disimpan
+    valid, results = validate_records(records)
+    if not valid:
+        return HTTPBadRequest(json_body={'success': False, 'results': results})
+
+    settings = request.registry.settings
+    chunk_size = int(settings.get('matakuliah.bulk.chunk_size', DEFAULT_CHUNK_SIZE))
+    rows = [{field: data[field] for field in REQUIRED_FIELDS} for data in records]
+    ids = upsert_matakuliah(request.dbsession, rows, chunk_size=chunk_size)
+    invalidate_matakuliah(request, ids.values())
+
+    for result, row in zip(results, rows):
+        result['id'] = ids[row['kode_mk']]
+        result['kode_mk'] = row['kode_mk']
+    return {'success': True, 'count': len(rows), 'results': results}
+
+
+@view_config(route_name='matakuliah_bulk_update', renderer='fastjson')
+def matakuliah_bulk_update(request):
+    """View untuk mengupdate sebagian field banyak matakuliah sekaligus"""
+    try:
+        json_data = read_json_object(request)
+        criteria = parse_selection(json_data)
+        values = parse_bulk_values(json_data)
+    except ValueError as e:
+        return HTTPBadRequest(json_body={'error': str(e)})
+
+    ids = bulk_update_matakuliah(request.dbsession, criteria, values)
+    invalidate_matakuliah(request, ids)
+    return {'success': True, 'count': len(ids), 'ids': ids}
+
+
+@view_config(route_name='matakuliah_bulk_delete', renderer='fastjson')
+def matakuliah_bulk_delete(request):
+    """View untuk menghapus banyak matakuliah sekaligus"""
+    try:
+        criteria = parse_selection(read_json_object(request))
+    except ValueError as e:
+        return HTTPBadRequest(json_body={'error': str(e)})
+
+    ids = bulk_delete_matakuliah(request.dbsession, criteria)
+    invalidate_matakuliah(request, ids)
+    return {'success': True, 'count': len(ids), 'ids': ids}
@@ -0,0 +1,82 @@
+from pyramid.view import view_config
+from pyramid.httpexceptions import HTTPBadRequest
+from sqlalchemy import (
+    and_,
+    case,
+    column,
+    select,
+    table,
+    text,
+)
+
+from ...cache import LIST_TAG, cached_view
+from ...conditional import conditional_view, list_etag
+from ...models.matakuliah import Matakuliah
+from ...queries import parse_int_param, search_tokens
+from ...renderers import RowList
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+# Tabel virtual FTS5 (khusus SQLite), lihat models/fts.py
+matakuliah_fts = table('matakuliah_fts', column('rowid'), column('rank'))
+
+
+def search_fts(dbsession, q, limit):
+    """Cari nama_mk lewat FTS5, setiap kata dicocokkan sebagai prefix"""
+    # Setiap token dikutip agar karakter khusus FTS5 tidak ditafsirkan
+    match = ' '.join(f'"{token}"*' for token in search_tokens(q))
+    columns = Matakuliah.__table__.c
+    query = (
+        select(*columns)
+        .join_from(matakuliah_fts, Matakuliah.__table__,
+                   matakuliah_fts.c.rowid == columns.id)
+        .where(text('matakuliah_fts MATCH :match').bindparams(match=match))
+        .order_by(matakuliah_fts.c.rank)
+        .limit(limit)
+    )
+    return dbsession.execute(query).all()
+
+
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_like(dbsession, q, limit):
+    """Fallback untuk engine selain SQLite: ILIKE per kata, prefix di depan"""
+    columns = Matakuliah.__table__.c
+    clauses = [
+        columns.nama_mk.ilike(f'%{_like_escape(token)}%', escape='\\')
+        for token in search_tokens(q)
+    ]
+    starts_with = columns.nama_mk.ilike(f'{_like_escape(q.strip())}%', escape='\\')
+    query = (
+        select(*columns)
+        .where(and_(*clauses))
+        .order_by(case((starts_with, 0), else_=1), columns.nama_mk, columns.id)
+        .limit(limit)
+    )
+    return dbsession.execute(query).all()
+
+
+@view_config(route_name='matakuliah_search', renderer='fastjson',
+             decorator=(conditional_view(list_etag),
+                        cached_view(lambda request: [LIST_TAG])))
+def matakuliah_search(request):
+    """View pencarian matakuliah berdasarkan nama_mk (typeahead)"""
+    q = request.params.get('q', '')
+    try:
+        limit = parse_int_param(request.params, 'limit',
+                                default=DEFAULT_SEARCH_LIMIT, minimum=1)
+    except ValueError as e:
+        return HTTPBadRequest(json_body={'error': str(e)})
+    if not search_tokens(q):
+        return HTTPBadRequest(json_body={'error': 'Parameter q wajib diisi'})
+    limit = min(limit, MAX_SEARCH_LIMIT)
+
+    dbsession = request.read_dbsession
+    if dbsession.get_bind().dialect.name == 'sqlite':
+        rows = search_fts(dbsession, q, limit)
+    else:
+        rows = search_like(dbsession, q, limit)
+    return {'matakuliahs': RowList(rows)}
@@ -14,7 +14,7 @@ from ..models.matakuliah import Matakuliah
 def my_view(request):
     try:
         # Replace MyModel with MataKuliah
-        query = request.dbsession.query(models.Matakuliah)
+        query = request.read_dbsession.query(models.Matakuliah)
         matakuliah_list = query.all()
     except Exception as e:
         return HTTPBadRequest(json_body={'error': str(e)})
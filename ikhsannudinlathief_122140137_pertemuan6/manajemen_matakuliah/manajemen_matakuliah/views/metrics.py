@@ -0,0 +1,22 @@
+from pyramid.httpexceptions import HTTPForbidden, HTTPNotFound
+from pyramid.response import Response
+from pyramid.view import view_config
+
+from ..instrumentation import address_allowed
+from ..metrics import CONTENT_TYPE
+
+
+@view_config(route_name='metrics', request_method='GET')
+def metrics_view(request):
+    """View untuk scrape metrik per proses oleh Prometheus"""
+    metrics = request.registry.get('matakuliah_metrics')
+    # Dimatikan oleh server pre-fork bila ada lebih dari satu worker
+    if metrics is None or not request.registry.get('matakuliah_metrics_on_route', True):
+        return HTTPNotFound()
+    # REMOTE_ADDR, bukan X-Forwarded-For yang bisa diisi klien
+    allowed = request.registry.get('matakuliah_metrics_allow', ())
+    if not address_allowed(request.remote_addr, allowed):
+        return HTTPForbidden()
+    response = Response(content_type=CONTENT_TYPE)
+    response.text = metrics.render()
+    return response
@@ -28,6 +28,28 @@ tests_require = [
     'pytest-cov',
 ]
 
+redis_require = [
+    'redis',
+]
+
+fastjson_require = [
+    'orjson',
+]
+
+brotli_require = [
+    'brotli',
+]
+
+parquet_require = [
+    'pyarrow',
+]
+
+asgi_require = [
+    'SQLAlchemy[asyncio]',
+    'aiosqlite',
+    'uvicorn',
+]
+
 setup(
     name='manajemen_matakuliah',
     version='0.0',
@@ -48,14 +70,23 @@ setup(
     zip_safe=False,
     extras_require={
         'testing': tests_require,
+        'redis': redis_require,
+        'asgi': asgi_require,
+        'fastjson': fastjson_require,
+        'brotli': brotli_require,
+        'parquet': parquet_require,
     },
     install_requires=requires,
     entry_points={
         'paste.app_factory': [
             'main = manajemen_matakuliah:main',
         ],
+        'paste.server_runner': [
+            'prefork = manajemen_matakuliah.prefork:serve_paste',
+        ],
         'console_scripts': [
             'initialize_manajemen_matakuliah_db=manajemen_matakuliah.scripts.initialize_db:main',
+            'precompress_manajemen_matakuliah_static=manajemen_matakuliah.scripts.precompress_static:main',
         ],
     },
 )
@@ -65,6 +65,21 @@ def dbsession(app, tm):
     session_factory = app.registry['dbsession_factory']
     return models.get_tm_session(session_factory, tm)
 
+@pytest.fixture
+def seed_matakuliah(dbsession):
+    """Fungsi ``seed(count)`` yang menambah matakuliah IF1000, IF1001, ..."""
+    def seed(count):
+        for i in range(count):
+            dbsession.add(models.Matakuliah(
+                kode_mk=f'IF{1000 + i}',
+                nama_mk=f'Matakuliah {i}',
+                sks=2 + i % 3,
+                semester=1 + i % 8,
+            ))
+        dbsession.flush()
+
+    return seed
+
 @pytest.fixture
 def testapp(app, tm, dbsession):
     # override request.dbsession and request.tm with our own
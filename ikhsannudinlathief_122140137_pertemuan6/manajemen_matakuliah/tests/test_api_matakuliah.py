@@ -0,0 +1,433 @@
+import base64
+import json
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.queries import encode_cursor, prefix_upper_bound
+
+
+def test_list_paginates_with_cursor(testapp, seed_matakuliah):
+    seed_matakuliah(5)
+
+    res = testapp.get('/api/matakuliah', params={'limit': 2}, status=200)
+    assert res.content_type == 'application/json'
+    first_page = res.json['matakuliahs']
+    assert [m['kode_mk'] for m in first_page] == ['IF1000', 'IF1001']
+    assert res.json['next_cursor'] == first_page[-1]['id']
+
+    res = testapp.get('/api/matakuliah', params={
+        'limit': 10, 'after': res.json['next_cursor']}, status=200)
+    assert [m['kode_mk'] for m in res.json['matakuliahs']] == [
+        'IF1002', 'IF1003', 'IF1004']
+    assert res.json['next_cursor'] is None
+
+
+def test_list_projects_fields(testapp, seed_matakuliah):
+    seed_matakuliah(1)
+
+    res = testapp.get('/api/matakuliah', params={'fields': 'nama_mk,sks'},
+                      status=200)
+    assert set(res.json['matakuliahs'][0]) == {'id', 'nama_mk', 'sks'}
+
+
+def test_list_rejects_invalid_params(testapp):
+    res = testapp.get('/api/matakuliah', params={'fields': 'password'},
+                      status=400)
+    assert 'error' in res.json
+    testapp.get('/api/matakuliah', params={'limit': 0}, status=400)
+    testapp.get('/api/matakuliah', params={'after': 'abc'}, status=400)
+
+
+def test_export_streams_ndjson(dbsession, seed_matakuliah):
+    from manajemen_matakuliah.views.api.matakuliah import iter_matakuliah_ndjson
+    seed_matakuliah(5)
+
+    chunks = list(iter_matakuliah_ndjson(dbsession, batch_size=2))
+    assert len(chunks) == 3
+    lines = b''.join(chunks).decode('utf-8').splitlines()
+    assert [json.loads(line)['kode_mk'] for line in lines] == [
+        'IF1000', 'IF1001', 'IF1002', 'IF1003', 'IF1004']
+
+
+def test_export_route(testapp):
+    res = testapp.get('/api/matakuliah/export', status=200)
+    assert res.content_type == 'application/x-ndjson'
+
+
+def test_bulk_upsert_inserts_and_updates(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+
+    res = testapp.post_json('/api/matakuliah/bulk', [
+        {'kode_mk': 'IF1000', 'nama_mk': 'Diperbarui', 'sks': 4, 'semester': 2},
+        {'kode_mk': 'IF2000', 'nama_mk': 'Baru', 'sks': 3, 'semester': 6},
+    ], status=200)
+    assert res.json['count'] == 2
+    assert all(r['success'] for r in res.json['results'])
+
+    rows = {m.kode_mk: m for m in dbsession.query(models.Matakuliah)}
+    assert rows['IF1000'].nama_mk == 'Diperbarui'
+    assert rows['IF2000'].id == res.json['results'][1]['id']
+
+
+def test_bulk_upsert_accepts_ndjson(testapp, dbsession):
+    body = '\n'.join(json.dumps({
+        'kode_mk': f'IF30{i}', 'nama_mk': 'NDJSON', 'sks': 2, 'semester': 1,
+    }) for i in range(3))
+
+    res = testapp.post('/api/matakuliah/bulk', body,
+                       content_type='application/x-ndjson', status=200)
+    assert res.json['count'] == 3
+
+
+def test_bulk_upsert_rejects_whole_batch(testapp, dbsession):
+    res = testapp.post_json('/api/matakuliah/bulk', [
+        {'kode_mk': 'IF4000', 'nama_mk': 'Valid', 'sks': 3, 'semester': 6},
+        {'kode_mk': 'IF4001', 'nama_mk': 'Tanpa sks', 'semester': 6},
+    ], status=400)
+    assert [r['success'] for r in res.json['results']] == [True, False]
+    assert dbsession.query(models.Matakuliah).count() == 0
+
+
+def test_bulk_upsert_checks_field_types(testapp, dbsession):
+    res = testapp.post_json('/api/matakuliah/bulk', [
+        {'kode_mk': ['IF4000'], 'nama_mk': 'Daftar', 'sks': 3, 'semester': 6},
+        {'kode_mk': 'IF4001', 'nama_mk': 'Teks', 'sks': 'tiga', 'semester': 6},
+        {'kode_mk': 'IF4002', 'nama_mk': 'Bool', 'sks': True, 'semester': 6},
+        {'kode_mk': 'IF4003', 'nama_mk': ' ', 'sks': 3, 'semester': 0},
+    ], status=400)
+    assert [r['error'] for r in res.json['results']] == [
+        'Field kode_mk harus berupa teks yang tidak kosong',
+        'Field sks harus berupa bilangan bulat',
+        'Field sks harus berupa bilangan bulat',
+        'Field nama_mk harus berupa teks yang tidak kosong',
+    ]
+    assert dbsession.query(models.Matakuliah).count() == 0
+
+
+def test_bulk_update_by_filter(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(8)
+
+    res = testapp.patch_json('/api/matakuliah/bulk', {
+        'filter': {'semester': 6}, 'values': {'sks': 4},
+    }, status=200)
+    updated = dbsession.query(models.Matakuliah).filter_by(semester=6).all()
+    assert res.json['ids'] == [m.id for m in updated]
+    dbsession.expire_all()
+    assert {m.sks for m in updated} == {4}
+
+
+def test_bulk_update_checks_value_types(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+
+    res = testapp.patch_json('/api/matakuliah/bulk', {
+        'ids': [matakuliah.id], 'values': {'sks': 'tiga'}}, status=400)
+    assert res.json['error'] == 'Field sks harus berupa bilangan bulat'
+    res = testapp.put_json(f'/api/matakuliah/{matakuliah.id}', {
+        'nama_mk': '', 'version': 1}, status=400)
+    assert res.json['error'] == 'Field nama_mk harus berupa teks yang tidak kosong'
+    dbsession.expire_all()
+    assert (matakuliah.sks, matakuliah.version) == (2, 1)
+
+
+def test_bulk_filter_checks_kode_mk_type(testapp):
+    res = testapp.delete_json('/api/matakuliah/bulk', {
+        'filter': {'kode_mk': ['x']}}, status=400)
+    assert res.json['error'] == 'Filter kode_mk harus berupa teks'
+    res = testapp.patch_json('/api/matakuliah/bulk', {
+        'filter': {'kode_mk': 1}, 'values': {'sks': 3}}, status=400)
+    assert res.json['error'] == 'Filter kode_mk harus berupa teks'
+
+
+def test_bulk_delete_by_ids(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(3)
+    ids = [m.id for m in dbsession.query(models.Matakuliah).limit(2)]
+
+    res = testapp.delete_json('/api/matakuliah/bulk', {'ids': ids}, status=200)
+    assert res.json['ids'] == sorted(ids)
+    assert dbsession.query(models.Matakuliah).count() == 1
+
+
+def test_bulk_delete_requires_selection(testapp):
+    testapp.delete_json('/api/matakuliah/bulk', {}, status=400)
+    testapp.patch_json('/api/matakuliah/bulk', {
+        'ids': [1], 'values': {'kode_mk': 'X'}}, status=400)
+
+
+def test_list_answers_if_none_match_with_304(testapp, seed_matakuliah):
+    seed_matakuliah(1)
+
+    res = testapp.get('/api/matakuliah', status=200)
+    assert res.etag and res.last_modified
+
+    res = testapp.get('/api/matakuliah', headers={
+        'If-None-Match': res.headers['ETag']}, status=304)
+    assert res.body == b''
+
+
+def test_etag_changes_after_write(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+
+    before = testapp.get(f'/api/matakuliah/{matakuliah.id}', status=200)
+    testapp.put_json(f'/api/matakuliah/{matakuliah.id}', {'sks': 4}, headers={
+        'If-Match': before.headers['ETag']}, status=200)
+    dbsession.flush()
+
+    after = testapp.get(f'/api/matakuliah/{matakuliah.id}', headers={
+        'If-None-Match': before.headers['ETag']}, status=200)
+    assert after.etag != before.etag
+    assert after.json['matakuliah']['sks'] == 4
+
+
+def test_update_requires_version(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+    url = f'/api/matakuliah/{matakuliah.id}'
+
+    res = testapp.put_json(url, {'sks': 4}, status=428)
+    assert 'If-Match' in res.json['error']
+
+    res = testapp.put_json(url, {'sks': 4, 'version': 1}, status=200)
+    assert res.json['matakuliah']['version'] == 2
+    assert res.etag == f'matakuliah-{matakuliah.id}-v2'
+
+    # Versi lama ditolak: lewat body 409, lewat If-Match 412
+    testapp.put_json(url, {'sks': 2, 'version': 1}, status=409)
+    testapp.put_json(url, {'sks': 2}, headers={
+        'If-Match': f'"matakuliah-{matakuliah.id}-v1"'}, status=412)
+    testapp.put_json(url, {'sks': 2}, headers={
+        'If-Match': res.headers['ETag']}, status=200)
+    assert matakuliah.sks == 2
+
+
+def test_add_duplicate_kode_mk_conflicts(testapp, seed_matakuliah):
+    seed_matakuliah(1)
+
+    res = testapp.post_json('/api/matakuliah', {
+        'kode_mk': 'IF1000', 'nama_mk': 'Ganda', 'sks': 3, 'semester': 1}, status=409)
+    # Pesan database (SQL, nama constraint) tidak dikirim ke klien
+    assert res.json == {'error': 'kode_mk sudah dipakai matakuliah lain'}
+
+
+def test_update_duplicate_kode_mk_conflicts(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(2)
+    first, second = dbsession.query(models.Matakuliah).order_by(models.Matakuliah.id)
+
+    res = testapp.put_json(f'/api/matakuliah/{second.id}', {
+        'kode_mk': first.kode_mk, 'version': 1}, status=409)
+    assert res.json == {'error': 'kode_mk sudah dipakai matakuliah lain'}
+
+
+def test_update_rejects_non_object_body(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+
+    res = testapp.put_json(f'/api/matakuliah/{matakuliah.id}', [1], status=400)
+    assert res.json == {'error': 'Body harus berupa objek JSON'}
+
+
+def test_concurrent_update_conflicts(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+    # Penulis lain menaikkan versi setelah baris dibaca ke dalam session
+    dbsession.execute(models.Matakuliah.__table__.update().values(
+        version=models.Matakuliah.__table__.c.version + 1))
+
+    res = testapp.put_json(f'/api/matakuliah/{matakuliah.id}', {'sks': 4, 'version': 1},
+                           status=409)
+    assert 'sudah diubah' in res.json['error']
+
+
+def test_detail_etag_is_per_row(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(2)
+    first, second = dbsession.query(models.Matakuliah).order_by(models.Matakuliah.id)
+
+    before = testapp.get(f'/api/matakuliah/{first.id}', status=200)
+    assert before.etag == f'matakuliah-{first.id}-v1'
+    testapp.put_json(f'/api/matakuliah/{second.id}', {'sks': 4, 'version': 1}, status=200)
+    # Baris lain berubah, ETag baris ini tetap
+    testapp.get(f'/api/matakuliah/{first.id}', headers={
+        'If-None-Match': before.headers['ETag']}, status=304)
+
+
+def test_detail_missing_row_gets_no_etag(testapp, dbsession):
+    for matakuliah_id in ('999', 'abc'):
+        res = testapp.get(f'/api/matakuliah/{matakuliah_id}', headers={
+            'If-None-Match': f'"matakuliah-{matakuliah_id}-vNone"'}, status=404)
+        assert 'ETag' not in res.headers
+
+
+def test_detail_last_modified(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+
+    res = testapp.get(f'/api/matakuliah/{matakuliah.id}', status=200)
+    assert res.last_modified is not None
+    testapp.get(f'/api/matakuliah/{matakuliah.id}', headers={
+        'If-Modified-Since': res.headers['Last-Modified']}, status=304)
+
+
+def test_bulk_writes_bump_row_version(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+
+    testapp.post_json('/api/matakuliah/bulk', [
+        {'kode_mk': 'IF1000', 'nama_mk': 'Diperbarui', 'sks': 4, 'semester': 2},
+    ], status=200)
+    testapp.patch_json('/api/matakuliah/bulk', {
+        'ids': [matakuliah.id], 'values': {'sks': 2}}, status=200)
+    dbsession.expire_all()
+    assert matakuliah.version == 3
+
+
+def test_bulk_writes_change_list_etag(testapp, dbsession):
+    def etag():
+        return testapp.get('/api/matakuliah', status=200).etag
+
+    etags = [etag()]
+    testapp.post_json('/api/matakuliah/bulk', [
+        {'kode_mk': 'IF5000', 'nama_mk': 'Bulk', 'sks': 3, 'semester': 6},
+        {'kode_mk': 'IF5001', 'nama_mk': 'Bulk', 'sks': 3, 'semester': 6},
+    ], status=200)
+    etags.append(etag())
+    testapp.patch_json('/api/matakuliah/bulk', {
+        'filter': {'kode_mk': 'IF5000'}, 'values': {'sks': 4}}, status=200)
+    etags.append(etag())
+    testapp.delete_json('/api/matakuliah/bulk', {
+        'filter': {'kode_mk': 'IF5000'}}, status=200)
+    etags.append(etag())
+
+    assert len(set(etags)) == 4
+
+
+def test_single_row_update_changes_list_etag(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(1)
+    matakuliah = dbsession.query(models.Matakuliah).first()
+
+    before = testapp.get('/api/matakuliah', status=200)
+    assert before.etag.startswith('matakuliah-v')
+    # Jumlah baris dan id terbesar tetap, ETag daftar tetap harus berubah
+    testapp.put_json(f'/api/matakuliah/{matakuliah.id}', {'nama_mk': 'Baru', 'version': 1},
+                     status=200)
+    testapp.get('/api/matakuliah', headers={
+        'If-None-Match': before.headers['ETag']}, status=200)
+
+
+def test_list_filters_by_semester_and_sks_range(testapp, seed_matakuliah):
+    seed_matakuliah(16)
+
+    res = testapp.get('/api/matakuliah', params={
+        'semester': 6, 'sks_min': 3}, status=200)
+    rows = res.json['matakuliahs']
+    assert rows
+    assert all(m['semester'] == 6 and m['sks'] >= 3 for m in rows)
+
+
+def test_list_filters_by_kode_mk_prefix(testapp, seed_matakuliah):
+    seed_matakuliah(12)
+
+    res = testapp.get('/api/matakuliah', params={'kode_mk_prefix': 'IF100'},
+                      status=200)
+    assert [m['kode_mk'] for m in res.json['matakuliahs']] == [
+        f'IF100{i}' for i in range(10)]
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound('IF3') == 'IF4'
+    assert prefix_upper_bound('IF' + chr(0x10FFFF)) == 'IG'
+    assert prefix_upper_bound(chr(0x10FFFF)) is None
+
+
+def test_list_orders_and_paginates_by_other_column(testapp, dbsession, seed_matakuliah):
+    seed_matakuliah(7)
+    expected = sorted(
+        ((m.sks, m.id) for m in dbsession.query(models.Matakuliah)),
+        reverse=True)
+
+    seen = []
+    params = {'order_by': '-sks', 'limit': 2, 'fields': 'kode_mk'}
+    while True:
+        res = testapp.get('/api/matakuliah', params=params, status=200)
+        seen.extend((m['sks'], m['id']) for m in res.json['matakuliahs'])
+        if res.json['next_cursor'] is None:
+            break
+        params['after'] = res.json['next_cursor']
+    assert seen == expected
+
+
+def test_list_rejects_unknown_order(testapp):
+    testapp.get('/api/matakuliah', params={'order_by': 'password'}, status=400)
+    res = testapp.get('/api/matakuliah', params={'order_by': '--sks'}, status=400)
+    assert res.json['error'] == 'order_by --sks tidak didukung'
+    testapp.get('/api/matakuliah', params={'order_by': 'sks', 'after': '!!'},
+                status=400)
+    # Token harus [nilai, id] dengan tipe nilai sesuai kolom
+    for token in ([{'a': 1}, 1], ['x', 1], [3, 'x'], [True, 1], [3], {'a': 1}):
+        after = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+        testapp.get('/api/matakuliah', params={'order_by': 'sks', 'after': after},
+                    status=400)
+    testapp.get('/api/matakuliah', params={
+        'order_by': 'nama_mk', 'after': encode_cursor({'a': 1}, 1)}, status=400)
+
+
+def _seed_names(dbsession, names):
+    for i, name in enumerate(names):
+        dbsession.add(models.Matakuliah(
+            kode_mk=f'IF6{i:03d}', nama_mk=name, sks=3, semester=6))
+    dbsession.flush()
+
+
+def test_search_matches_word_prefixes(testapp, dbsession):
+    _seed_names(dbsession, [
+        'Pemrograman Web', 'Pemrograman Berorientasi Objek', 'Basis Data'])
+
+    res = testapp.get('/api/matakuliah/search', params={'q': 'pemrog web'},
+                      status=200)
+    assert [m['nama_mk'] for m in res.json['matakuliahs']] == ['Pemrograman Web']
+
+    res = testapp.get('/api/matakuliah/search', params={'q': 'pem', 'limit': 1},
+                      status=200)
+    assert len(res.json['matakuliahs']) == 1
+
+
+def test_search_follows_updates(testapp, dbsession):
+    _seed_names(dbsession, ['Multimedia'])
+    matakuliah = dbsession.query(models.Matakuliah).one()
+    matakuliah.nama_mk = 'Grafika Komputer'
+    dbsession.flush()
+
+    res = testapp.get('/api/matakuliah/search', params={'q': 'multi'}, status=200)
+    assert res.json['matakuliahs'] == []
+    res = testapp.get('/api/matakuliah/search', params={'q': 'grafik'}, status=200)
+    assert len(res.json['matakuliahs']) == 1
+
+
+def test_search_like_fallback(dbsession):
+    from manajemen_matakuliah.views.api.matakuliah_search import search_like
+    _seed_names(dbsession, ['Data Mining', 'Basis Data', 'Struktur_Data'])
+
+    rows = search_like(dbsession, 'data', 10)
+    assert [row.nama_mk for row in rows] == [
+        'Data Mining', 'Basis Data', 'Struktur_Data']
+    # _ dicari sebagai karakter biasa, bukan wildcard LIKE
+    assert [row.nama_mk for row in search_like(dbsession, '_', 10)] == [
+        'Struktur_Data']
+
+
+def test_search_index_created_by_create_all(tmp_path):
+    from manajemen_matakuliah.models.meta import Base
+    from manajemen_matakuliah.views.api.matakuliah_search import search_fts
+    engine = models.get_engine({'sqlalchemy.url': f"sqlite:///{tmp_path / 'fts.sqlite'}"})
+    Base.metadata.create_all(engine)
+    with models.get_session_factory(engine)() as dbsession:
+        _seed_names(dbsession, ['Pemrograman Web', 'Basis Data'])
+        assert [row.nama_mk for row in search_fts(dbsession, 'pemrog', 10)] == [
+            'Pemrograman Web']
+    Base.metadata.drop_all(engine)
+    with engine.connect() as connection:
+        assert not engine.dialect.has_table(connection, 'matakuliah_fts')
+    engine.dispose()
+
+
+def test_search_requires_query(testapp):
+    testapp.get('/api/matakuliah/search', params={'q': '  '}, status=400)
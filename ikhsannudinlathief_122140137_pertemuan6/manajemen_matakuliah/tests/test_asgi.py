@@ -0,0 +1,187 @@
+import asyncio
+import json
+
+import pytest
+import webtest
+from sqlalchemy import create_engine
+
+from manajemen_matakuliah import main
+from manajemen_matakuliah.models.meta import Base
+
+pytest.importorskip('greenlet')
+pytest.importorskip('aiosqlite')
+
+from manajemen_matakuliah.asgi import create_app  # noqa: E402
+
+
+def _call(app, method, path, query='', body=None, headers=()):
+    """Jalankan satu request HTTP ke aplikasi ASGI, kembalikan (status, headers, body)"""
+    messages = []
+    body = json.dumps(body).encode('utf-8') if body is not None else b''
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query.encode('latin-1'),
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                    for k, v in headers],
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    content = b''.join(m.get('body', b'') for m in messages[1:])
+    response_headers = {k.decode(): v.decode() for k, v in start['headers']}
+    return start['status'], response_headers, content
+
+
+def _json(content):
+    return json.loads(content) if content else None
+
+
+@pytest.fixture
+def settings(tmp_path):
+    url = f"sqlite:///{tmp_path / 'asgi.sqlite'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return {
+        'sqlalchemy.url': url,
+        'sqlalchemy.sqlite.busy_timeout': '5000',
+        'matakuliah.cache.backend': 'none',
+    }
+
+
+@pytest.fixture
+def asgi_app(settings):
+    return create_app(settings)
+
+
+def test_crud_contract(asgi_app):
+    data = {'kode_mk': 'IF1000', 'nama_mk': 'Basis Data', 'sks': 3, 'semester': 4}
+    status, _, content = _call(asgi_app, 'POST', '/api/matakuliah', body=data)
+    assert status == 200
+    added = _json(content)['matakuliah']
+    assert added == dict(data, id=added['id'], version=1)
+
+    status, _, content = _call(asgi_app, 'PUT', f"/api/matakuliah/{added['id']}",
+                               body={'sks': 4})
+    assert status == 428
+    status, headers, content = _call(asgi_app, 'PUT', f"/api/matakuliah/{added['id']}",
+                                     body={'sks': 4, 'version': 1})
+    assert status == 200
+    assert _json(content)['matakuliah']['sks'] == 4
+    assert _json(content)['matakuliah']['version'] == 2
+    status, _, _ = _call(asgi_app, 'PUT', f"/api/matakuliah/{added['id']}",
+                         body={'sks': 2}, headers=[('If-Match', '"matakuliah-1-v1"')])
+    assert status == 412
+    status, _, _ = _call(asgi_app, 'PUT', f"/api/matakuliah/{added['id']}",
+                         body={'sks': 2}, headers=[('If-Match', headers['etag'])])
+    assert status == 200
+
+    status, _, content = _call(asgi_app, 'DELETE', f"/api/matakuliah/{added['id']}")
+    assert status == 200
+    assert _json(content)['success'] is True
+
+    status, _, content = _call(asgi_app, 'GET', f"/api/matakuliah/{added['id']}")
+    assert status == 404
+    assert _json(content) == {'error': 'Matakuliah tidak ditemukan'}
+
+
+def test_invalid_update_changes_nothing(asgi_app):
+    data = {'kode_mk': 'IF1000', 'nama_mk': 'Basis Data', 'sks': 3, 'semester': 4}
+    status, _, content = _call(asgi_app, 'POST', '/api/matakuliah', body=data)
+    added = _json(content)['matakuliah']
+
+    # nama_mk valid, sks tidak: tidak ada field yang boleh tersimpan
+    status, _, _ = _call(asgi_app, 'PUT', f"/api/matakuliah/{added['id']}",
+                         body={'nama_mk': 'Baru', 'sks': 'x', 'version': 1})
+    assert status == 400
+    status, _, content = _call(asgi_app, 'GET', f"/api/matakuliah/{added['id']}")
+    assert _json(content)['matakuliah'] == added
+
+
+def test_duplicate_kode_mk_conflicts(asgi_app):
+    first = {'kode_mk': 'IF1000', 'nama_mk': 'Basis Data', 'sks': 3, 'semester': 4}
+    second = dict(first, kode_mk='IF1001')
+    _call(asgi_app, 'POST', '/api/matakuliah', body=first)
+    status, _, content = _call(asgi_app, 'POST', '/api/matakuliah', body=second)
+    added = _json(content)['matakuliah']
+
+    status, _, content = _call(asgi_app, 'POST', '/api/matakuliah', body=first)
+    assert status == 409
+    assert _json(content) == {'error': 'kode_mk sudah dipakai matakuliah lain'}
+
+    status, _, content = _call(asgi_app, 'PUT', f"/api/matakuliah/{added['id']}",
+                               body={'kode_mk': 'IF1000', 'nama_mk': 'Baru', 'version': 1})
+    assert status == 409
+    assert _json(content) == {'error': 'kode_mk sudah dipakai matakuliah lain'}
+    status, _, content = _call(asgi_app, 'GET', f"/api/matakuliah/{added['id']}")
+    assert _json(content)['matakuliah'] == added
+
+
+def test_add_requires_fields(asgi_app):
+    status, _, content = _call(asgi_app, 'POST', '/api/matakuliah',
+                               body={'kode_mk': 'IF1000'})
+    assert status == 400
+    assert _json(content) == {'error': 'Field nama_mk wajib diisi'}
+
+
+def test_list_matches_wsgi(settings, asgi_app):
+    records = [
+        {'kode_mk': f'IF{1000 + i}', 'nama_mk': f'Matakuliah {i}',
+         'sks': 2 + i % 3, 'semester': 1 + i % 8}
+        for i in range(7)
+    ]
+    status, _, _ = _call(asgi_app, 'POST', '/api/matakuliah/bulk', body=records)
+    assert status == 200
+
+    testapp = webtest.TestApp(main({}, **settings))
+    for query in ('limit=3', 'order_by=-nama_mk&limit=2&fields=nama_mk',
+                  'sks_min=3&semester_max=6'):
+        status, headers, content = _call(asgi_app, 'GET', '/api/matakuliah', query)
+        res = testapp.get('/api/matakuliah?' + query, status=200)
+        assert status == 200
+        assert _json(content) == res.json
+        assert headers['etag'] == res.headers['ETag']
+
+
+def test_list_not_modified(asgi_app):
+    _call(asgi_app, 'POST', '/api/matakuliah', body={
+        'kode_mk': 'IF1000', 'nama_mk': 'Basis Data', 'sks': 3, 'semester': 4})
+    status, headers, _ = _call(asgi_app, 'GET', '/api/matakuliah')
+    assert status == 200
+
+    status, _, content = _call(asgi_app, 'GET', '/api/matakuliah',
+                               headers=[('If-None-Match', headers['etag'])])
+    assert status == 304
+    assert content == b''
+
+
+def test_detail_missing_row_is_404(asgi_app):
+    status, headers, _ = _call(asgi_app, 'GET', '/api/matakuliah/999',
+                               headers=[('If-None-Match', '"matakuliah-999-vNone"')])
+    assert status == 404
+    assert 'etag' not in headers
+
+
+def test_export_streams_ndjson(asgi_app):
+    records = [
+        {'kode_mk': f'IF{1000 + i}', 'nama_mk': f'Matakuliah {i}',
+         'sks': 3, 'semester': 1}
+        for i in range(3)
+    ]
+    _call(asgi_app, 'POST', '/api/matakuliah/bulk', body=records)
+
+    status, headers, content = _call(asgi_app, 'GET', '/api/matakuliah/export')
+    assert status == 200
+    assert headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+    assert [line['kode_mk'] for line in lines] == ['IF1000', 'IF1001', 'IF1002']
+    # Kolom sama dengan to_dict(), tanpa updated_at
+    assert set(lines[0]) == {'id', 'kode_mk', 'nama_mk', 'sks', 'semester', 'version'}
@@ -0,0 +1,69 @@
+import transaction
+
+from manajemen_matakuliah import cache
+
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = cache.MemoryCache(max_entries=2, ttl=60)
+    backend.set('a', 1)
+    backend.set('b', 2)
+    backend.get('a')
+    backend.set('c', 3)
+
+    assert backend.get('a') == 1
+    assert backend.get('b') is None
+    assert backend.get('c') == 3
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    backend = cache.MemoryCache(ttl=10)
+    backend.set('a', 1)
+
+    now[0] += 11
+    assert backend.get('a') is None
+    assert len(backend) == 0
+
+
+def test_memory_cache_invalidates_by_tag():
+    backend = cache.MemoryCache()
+    backend.set('list', 1, [cache.LIST_TAG])
+    backend.set('detail-1', 2, [cache.item_tag(1)])
+    backend.set('detail-2', 3, [cache.item_tag(2)])
+
+    backend.invalidate_tags([cache.LIST_TAG, cache.item_tag(1)])
+    assert backend.get('list') is None
+    assert backend.get('detail-1') is None
+    assert backend.get('detail-2') == 3
+
+
+def test_invalidation_waits_for_commit(dummy_request):
+    backend = cache.MemoryCache()
+    dummy_request.registry['matakuliah_cache'] = backend
+
+    for finish, expected in (('abort', 1), ('commit', None)):
+        backend.set('list', 1, [cache.LIST_TAG])
+        tm = transaction.TransactionManager(explicit=True)
+        tm.begin()
+        dummy_request.tm = tm
+        cache.invalidate_matakuliah(dummy_request, [1])
+        assert backend.get('list') == 1
+        getattr(tm, finish)()
+        assert backend.get('list') == expected
+
+
+def test_cached_view_reads_through(dummy_request):
+    backend = cache.MemoryCache()
+    dummy_request.registry['matakuliah_cache'] = backend
+    dummy_request.matched_route = None
+    calls = []
+
+    def view(context, request):
+        calls.append(request)
+        return {'matakuliahs': []}
+
+    wrapped = cache.cached_view(lambda request: [cache.LIST_TAG])(view)
+    assert wrapped(None, dummy_request) == {'matakuliahs': []}
+    assert wrapped(None, dummy_request) == {'matakuliahs': []}
+    assert len(calls) == 1
@@ -0,0 +1,94 @@
+import gzip
+import json
+
+import pytest
+from pyramid.response import Response
+from pyramid.request import Request
+
+from manajemen_matakuliah import compression
+from manajemen_matakuliah.scripts import precompress_static
+
+
+@pytest.fixture
+def policy():
+    return compression.CompressionPolicy({
+        'matakuliah.compression.min_size': '100',
+        'matakuliah.compression.brotli': 'false',
+    })
+
+
+def _request(accept_encoding):
+    return Request.blank('/', headers={'Accept-Encoding': accept_encoding})
+
+
+def _json_response(size):
+    response = Response(content_type='application/json')
+    response.text = json.dumps({'data': 'x' * size})
+    response.etag = 'matakuliah-1'
+    return response
+
+
+def test_compresses_large_json(policy):
+    response = compression.compress_response(
+        policy, _request('gzip, deflate'), _json_response(1000))
+    assert response.content_encoding == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert response.headers['ETag'] == 'W/"matakuliah-1"'
+    assert json.loads(gzip.decompress(response.body))['data'] == 'x' * 1000
+
+
+def test_skips_small_or_unlisted(policy):
+    response = compression.compress_response(
+        policy, _request('gzip'), _json_response(10))
+    assert response.content_encoding is None
+
+    response = Response(body=b'x' * 1000, content_type='image/png')
+    response = compression.compress_response(policy, _request('gzip'), response)
+    assert response.content_encoding is None
+
+    response = compression.compress_response(
+        policy, _request('identity'), _json_response(1000))
+    assert response.content_encoding is None
+
+
+def test_streaming_response(policy):
+    response = Response(content_type='application/x-ndjson',
+                        app_iter=iter([b'{"id": 1}\n'] * 500))
+    response = compression.compress_response(policy, _request('gzip'), response)
+    assert response.content_encoding == 'gzip'
+    assert gzip.decompress(b''.join(response.app_iter)) == b'{"id": 1}\n' * 500
+
+
+def test_api_list_gzip(testapp, dbsession):
+    from manajemen_matakuliah import models
+    for i in range(50):
+        dbsession.add(models.Matakuliah(
+            kode_mk=f'IF{1000 + i}', nama_mk=f'Matakuliah {i}', sks=3, semester=1))
+    dbsession.flush()
+
+    res = testapp.get('/api/matakuliah', headers={'Accept-Encoding': 'gzip'},
+                      status=200)
+    # WebTest sudah membuka gzip; ETag weak menandakan body dikompresi
+    assert len(res.json['matakuliahs']) == 50
+    assert res.headers['Vary'] == 'Accept-Encoding'
+    etag = res.headers['ETag']
+    assert etag.startswith('W/')
+    testapp.get('/api/matakuliah', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': etag}, status=304)
+
+
+def test_precompress_directory(tmp_path):
+    css = tmp_path / 'theme.css'
+    css.write_text('body { color: red; }\n' * 100)
+    (tmp_path / 'tiny.css').write_text('a{}')
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG' * 200)
+
+    written = precompress_static.precompress_directory(str(tmp_path))
+    targets = {path for path, _ in written}
+    assert str(css) + '.gz' in targets
+    assert gzip.decompress((tmp_path / 'theme.css.gz').read_bytes()) == css.read_bytes()
+    assert not (tmp_path / 'tiny.css.gz').exists()
+    assert not (tmp_path / 'logo.png.gz').exists()
+
+    # File yang sudah up to date tidak ditulis ulang
+    assert precompress_static.precompress_directory(str(tmp_path)) == []
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import text
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.models.engine import split_sqlite_pragmas
+
+
+def test_sqlite_pragmas_are_applied(tmp_path):
+    engine = models.get_engine({
+        'sqlalchemy.url': f"sqlite:///{tmp_path / 'pragma.sqlite'}",
+        'sqlalchemy.pool_size': '3',
+        'sqlalchemy.sqlite.journal_mode': 'WAL',
+        'sqlalchemy.sqlite.synchronous': 'normal',
+        'sqlalchemy.sqlite.busy_timeout': '1234',
+    })
+    with engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 1
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 1234
+    assert engine.pool.size() == 3
+    engine.dispose()
+
+
+def test_invalid_pragmas_are_rejected():
+    with pytest.raises(ValueError):
+        split_sqlite_pragmas({'sqlalchemy.sqlite.journal_mode': 'wal; DROP'})
+    with pytest.raises(ValueError):
+        split_sqlite_pragmas({'sqlalchemy.sqlite.key': 'secret'})
+    with pytest.raises(ValueError):
+        split_sqlite_pragmas({'sqlalchemy.sqlite.cache_size': 'big'})
@@ -0,0 +1,60 @@
+from sqlalchemy import func, select
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.models.meta import Base
+from manajemen_matakuliah.scripts.initialize_db import (
+    clean_record,
+    generate_matakuliah,
+    import_records,
+    read_csv,
+)
+
+
+def _session_factory(tmp_path):
+    engine = models.get_engine({'sqlalchemy.url': f"sqlite:///{tmp_path / 'import.sqlite'}"})
+    Base.metadata.create_all(engine)
+    return models.get_session_factory(engine)
+
+
+def _count(session_factory):
+    with session_factory() as dbsession:
+        return dbsession.scalar(select(func.count()).select_from(models.Matakuliah))
+
+
+def test_clean_record():
+    assert clean_record({'kode_mk': ' IF1 ', 'nama_mk': 'Basis Data',
+                         'sks': '3', 'semester': '2'}) == (
+        {'kode_mk': 'IF1', 'nama_mk': 'Basis Data', 'sks': 3, 'semester': 2}, None)
+    assert clean_record({'kode_mk': 'IF1', 'nama_mk': 'X', 'sks': 'tiga',
+                         'semester': '2'}) == (None, 'Field sks harus berupa bilangan bulat')
+    assert clean_record({'kode_mk': 'IF1', 'nama_mk': ''})[1] == 'Field sks wajib diisi'
+
+
+def test_generated_import_is_idempotent(tmp_path):
+    session_factory = _session_factory(tmp_path)
+
+    stats = import_records(session_factory, generate_matakuliah(25), batch_size=10,
+                           chunk_size=4)
+    assert (stats.imported, stats.batches, stats.invalid) == (25, 3, 0)
+    # Upsert pada kode_mk: impor ulang tidak menambah baris
+    import_records(session_factory, generate_matakuliah(25, seed=1), batch_size=10)
+    assert _count(session_factory) == 25
+
+
+def test_csv_import_skips_invalid_rows(tmp_path):
+    session_factory = _session_factory(tmp_path)
+    path = tmp_path / 'kurikulum.csv'
+    path.write_text(
+        '﻿kode_mk,nama_mk,sks,semester\n'
+        'IF101,Algoritma,3,1\n'
+        'IF102,Basis Data,x,2\n'
+        'IF101,Algoritma Lanjut,4,1\n',
+        encoding='utf-8')
+
+    stats = import_records(session_factory, read_csv(str(path)), upsert=False)
+    assert (stats.imported, stats.invalid) == (1, 1)
+    assert stats.errors == ['baris 3: Field sks harus berupa bilangan bulat']
+    with session_factory() as dbsession:
+        matakuliah = dbsession.scalars(select(models.Matakuliah)).one()
+    # kode_mk ganda dalam satu batch: baris terakhir yang dipakai
+    assert (matakuliah.nama_mk, matakuliah.sks) == ('Algoritma Lanjut', 4)
@@ -0,0 +1,83 @@
+import json
+import logging
+import re
+
+from manajemen_matakuliah.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_server_timing_header(testapp, seed_matakuliah):
+    seed_matakuliah(3)
+
+    res = testapp.get('/api/matakuliah', status=200)
+    timing = res.headers['Server-Timing']
+    assert re.match(r'total;dur=[\d.]+, sql;dur=[\d.]+;desc="\d+ statements, \d+ rows"',
+                    timing)
+    statements, rows = map(int, re.search(r'(\d+) statements, (\d+) rows', timing).groups())
+    # Versi tabel (ETag) + query daftar
+    assert statements == 2
+    assert rows >= 3
+
+
+def test_structured_log(testapp, caplog):
+    with caplog.at_level(logging.INFO, logger='manajemen_matakuliah.instrumentation'):
+        testapp.get('/api/matakuliah/999', status=404)
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['route'] == 'matakuliah_detail'
+    assert record['status'] == 404
+    assert record['statements'] >= 1
+
+
+LOCAL = {'REMOTE_ADDR': '127.0.0.1'}
+
+
+def test_streamed_export_counts_sql(testapp, caplog):
+    # Query export berjalan saat body dibaca, setelah tween selesai
+    with caplog.at_level(logging.INFO, logger='manajemen_matakuliah.instrumentation'):
+        res = testapp.get('/api/matakuliah/export', status=200)
+    assert 'Server-Timing' not in res.headers
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['route'] == 'matakuliah_export'
+    assert record['streamed'] is True
+    assert record['statements'] >= 1
+
+
+def test_metrics_endpoint(testapp):
+    testapp.get('/api/matakuliah', status=200)
+    res = testapp.get('/metrics', status=200, extra_environ=LOCAL)
+    assert res.content_type == 'text/plain'
+    assert re.search(
+        r'^matakuliah_http_requests_total\{route="matakuliah_list",method="GET",status="200"\} \d+$',
+        res.text, re.MULTILINE)
+    assert ('matakuliah_http_request_duration_seconds_bucket'
+            '{route="matakuliah_list",method="GET",le="+Inf"}') in res.text
+    assert 'route="metrics"' not in res.text
+
+
+def test_metrics_restricted_to_allowed_addresses(testapp):
+    testapp.get('/metrics', status=403)
+    testapp.get('/metrics', status=403, extra_environ={'REMOTE_ADDR': '203.0.113.7'})
+    # X-Forwarded-For dari klien tidak dipercaya
+    testapp.get('/metrics', status=403, extra_environ={'REMOTE_ADDR': '203.0.113.7'},
+                headers={'X-Forwarded-For': '127.0.0.1'})
+
+
+def test_prometheus_format():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter('demo_total', 'Demo', ('route',)))
+    histogram = registry.register(Histogram('demo_seconds', 'Demo', (), buckets=(0.1, 1)))
+    counter.inc(('a"b',))
+    histogram.observe((), 0.05)
+    histogram.observe((), 0.5)
+
+    assert registry.render().splitlines() == [
+        '# HELP demo_total Demo',
+        '# TYPE demo_total counter',
+        'demo_total{route="a\\"b"} 1',
+        '# HELP demo_seconds Demo',
+        '# TYPE demo_seconds histogram',
+        'demo_seconds_bucket{le="0.1"} 1',
+        'demo_seconds_bucket{le="1"} 2',
+        'demo_seconds_bucket{le="+Inf"} 2',
+        'demo_seconds_sum 0.55',
+        'demo_seconds_count 2',
+    ]
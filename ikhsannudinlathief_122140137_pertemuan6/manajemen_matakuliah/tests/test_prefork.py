@@ -0,0 +1,115 @@
+import http.client
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+from manajemen_matakuliah import models
+from manajemen_matakuliah.prefork import PreforkServer, bind_sockets
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='butuh os.fork')
+
+
+def _pid_app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [str(os.getpid()).encode()]
+
+
+def _get_pid(port):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        connection.request('GET', '/')
+        response = connection.getresponse()
+        assert response.status == 200
+        return int(response.read())
+    finally:
+        connection.close()
+
+
+def test_engine_pool_is_not_shared_after_fork(tmp_path):
+    engine = models.get_engine({'sqlalchemy.url': f"sqlite:///{tmp_path / 'fork.sqlite'}"})
+    engine.connect().close()
+    assert engine.pool.checkedin() == 1
+    parent_pool = id(engine.pool)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Proses anak: pool warisan sudah dibuang, koneksi baru tetap jalan
+        try:
+            shared = id(engine.pool) == parent_pool or engine.pool.checkedin()
+            engine.connect().close()
+            os.write(write_fd, b'shared' if shared else b'ok')
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    result = os.read(read_fd, 16)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert result == b'ok'
+    # Koneksi induk tidak ditutup oleh proses anak
+    assert engine.pool.checkedin() == 1
+    engine.connect().close()
+    engine.dispose()
+
+
+def test_workers_share_socket_and_restart():
+    [sock] = bind_sockets(host='127.0.0.1', port='0')
+    port = sock.getsockname()[1]
+    server = PreforkServer(_pid_app, [sock], workers=2, threads=1)
+    process = multiprocessing.get_context('fork').Process(target=server.run)
+    process.start()
+    sock.close()
+    try:
+        pid = _get_pid(port)
+        assert pid != process.pid
+
+        # Worker yang mati dijalankan ulang, server tetap melayani
+        os.kill(pid, signal.SIGKILL)
+        assert _get_pid(port) != pid
+    finally:
+        process.terminate()
+        process.join(10)
+    assert process.exitcode == 0
+
+
+def _get(port, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return response.status, response.read().decode('utf-8')
+    finally:
+        connection.close()
+
+
+def test_metrics_served_per_worker(app):
+    from manajemen_matakuliah.prefork import bind_metrics_sockets
+
+    [sock] = bind_sockets(host='127.0.0.1', port='0')
+    port = sock.getsockname()[1]
+    # Dua port berurutan yang kosong untuk worker 0 dan 1
+    [[probe]] = bind_metrics_sockets(1, '127.0.0.1', 0)
+    metrics_port = probe.getsockname()[1]
+    probe.close()
+    metrics_sockets = bind_metrics_sockets(2, '127.0.0.1', metrics_port)
+    server = PreforkServer(app, [sock], workers=2,
+                           metrics_sockets=metrics_sockets, threads=1)
+    process = multiprocessing.get_context('fork').Process(target=server.run)
+    process.start()
+    sock.close()
+    for sockets in metrics_sockets:
+        sockets[0].close()
+    try:
+        # Scrape port utama akan mengenai worker acak, jadi dimatikan
+        assert _get(port, '/metrics')[0] == 404
+        for number in range(2):
+            status, text = _get(metrics_port + number, '/metrics')
+            assert status == 200
+            assert f'worker="{number}"' in text
+    finally:
+        process.terminate()
+        process.join(10)
+    assert process.exitcode == 0
@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+from sqlalchemy import select
+import webtest
+
+from manajemen_matakuliah import main
+from manajemen_matakuliah import models
+from manajemen_matakuliah.query_guard import (
+    QueryBudgetExceeded,
+    QueryLog,
+    capture_queries,
+    parse_budgets,
+    statement_shape,
+)
+
+
+def test_statement_shape_collapses_placeholder_lists():
+    assert statement_shape('SELECT *\n  FROM t WHERE id IN (?, ?, ?)') == \
+        statement_shape('SELECT * FROM t WHERE id IN (?, ?)') == \
+        'SELECT * FROM t WHERE id IN (?)'
+
+
+def test_parse_budgets():
+    assert parse_budgets('\nmatakuliah_list = 2\nhome=1') == {
+        'matakuliah_list': 2, 'home': 1}
+    with pytest.raises(ValueError):
+        parse_budgets('matakuliah_list 2')
+
+
+def test_repeated_select_is_flagged(dbsession, seed_matakuliah):
+    seed_matakuliah(3)
+    ids = dbsession.scalars(select(models.Matakuliah.id)).all()
+    dbsession.expunge_all()
+
+    with capture_queries() as queries:
+        # Pola N+1: satu SELECT per baris
+        for id in ids:
+            dbsession.execute(
+                select(models.Matakuliah).where(models.Matakuliah.id == id)).one()
+
+    assert queries.count == 3
+    [(shape, count)] = queries.repeated(3)
+    assert count == 3
+    assert shape.startswith('SELECT matakuliah.id')
+
+
+def test_slow_query_logs_query_plan(dbsession, caplog, seed_matakuliah):
+    seed_matakuliah(1)
+    with caplog.at_level(logging.WARNING, logger='manajemen_matakuliah.query_guard'):
+        with capture_queries(QueryLog(slow_ms=0)) as queries:
+            dbsession.execute(select(models.Matakuliah).where(
+                models.Matakuliah.kode_mk == 'IF1000')).one()
+
+    statement, elapsed, plan = queries.slow[0]
+    # Indeks unik kode_mk dipakai, dan hasil query asli tetap utuh
+    assert any('USING INDEX' in line for line in plan)
+    assert 'Query plan:' in caplog.records[-1].getMessage()
+
+
+def test_route_budget_fails_request(app_settings, dbengine, tm, dbsession):
+    settings = dict(app_settings)
+    settings['matakuliah.query_guard.budgets'] = 'matakuliah_list = 1'
+    testapp = webtest.TestApp(main({}, **settings), extra_environ={
+        'HTTP_HOST': 'example.com',
+        'tm.active': True,
+        'tm.manager': tm,
+        'app.dbsession': dbsession,
+    })
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        testapp.get('/api/matakuliah')
+    assert excinfo.value.route == 'matakuliah_list'
+    assert excinfo.value.problems == ['2 query melebihi budget 1']
+
+
+def test_configured_budget_passes(testapp, seed_matakuliah):
+    seed_matakuliah(5)
+    testapp.get('/api/matakuliah', status=200)
+
+
+def test_guard_shares_instrumentation_events(dbengine, dbsession, seed_matakuliah):
+    from manajemen_matakuliah.instrumentation import _after_cursor_execute
+    # Satu pasang event: query diukur sekali untuk instrumentasi dan guard
+    assert list(dbengine.dispatch.after_cursor_execute) == [_after_cursor_execute]
+    assert len(dbengine.dispatch.before_cursor_execute) == 1
+
+    seed_matakuliah(1)
+    with capture_queries(QueryLog(slow_ms=0)) as queries:
+        dbsession.execute(select(models.Matakuliah)).all()
+    assert queries.count == 1
+    assert queries.slow[0][1] > 0
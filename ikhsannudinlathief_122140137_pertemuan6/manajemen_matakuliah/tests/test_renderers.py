@@ -0,0 +1,39 @@
+import json
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, select
+
+from manajemen_matakuliah.renderers import RowList, ndjson, render
+
+metadata = MetaData()
+sample = Table(
+    'sample', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('nama', Text),
+    Column('sks', Integer),
+)
+
+
+def _rows():
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(sample.insert(), [
+            {'nama': 'Basis "Data"', 'sks': 3},
+            {'nama': 'Jaringan\\Komputer é', 'sks': None},
+        ])
+        return connection.execute(select(sample).order_by(sample.c.id)).all()
+
+
+def test_rowlist_matches_stdlib_json():
+    rows = _rows()
+    expected = [row._asdict() for row in rows]
+
+    value = {'matakuliahs': RowList(rows), 'next_cursor': None}
+    assert json.loads(render(value)) == {'matakuliahs': expected, 'next_cursor': None}
+    assert RowList(rows).__json__(None) == expected
+    assert [json.loads(line) for line in ndjson(rows).splitlines()] == expected
+
+
+def test_empty_rowlist():
+    assert json.loads(render({'matakuliahs': RowList([])})) == {'matakuliahs': []}
+    assert ndjson([]) == b''
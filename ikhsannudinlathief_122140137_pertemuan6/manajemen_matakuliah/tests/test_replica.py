@@ -0,0 +1,51 @@
+import pytest
+import webtest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from manajemen_matakuliah import main, models
+from manajemen_matakuliah.models.meta import Base
+
+
+def _create_db(path, nama_mk):
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    with Session(engine) as dbsession:
+        dbsession.add(models.Matakuliah(
+            kode_mk='IF0001', nama_mk=nama_mk, sks=3, semester=6))
+        dbsession.commit()
+    engine.dispose()
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    # Dua file SQLite terpisah sebagai pengganti primary dan replica
+    primary = tmp_path / 'primary.sqlite'
+    replica = tmp_path / 'replica.sqlite'
+    _create_db(primary, 'Dari primary')
+    _create_db(replica, 'Dari replica')
+
+    app = main({}, **{
+        'sqlalchemy.url': f'sqlite:///{primary}',
+        'sqlalchemy.replica.url': f'sqlite:///{replica}',
+        'sqlalchemy.replica.sticky_seconds': '30',
+        'matakuliah.cache.backend': 'none',
+    })
+    return webtest.TestApp(app, extra_environ={'HTTP_HOST': 'example.com'})
+
+
+def test_reads_go_to_replica(replica_app):
+    res = replica_app.get('/api/matakuliah', status=200)
+    assert res.json['matakuliahs'][0]['nama_mk'] == 'Dari replica'
+
+    res = replica_app.get('/api/matakuliah/1', status=200)
+    assert res.json['matakuliah']['nama_mk'] == 'Dari replica'
+
+
+def test_reads_stick_to_primary_after_write(replica_app):
+    res = replica_app.put_json('/api/matakuliah/1', {'sks': 4, 'version': 1}, status=200)
+    assert 'matakuliah_primary' in res.headers['Set-Cookie']
+
+    res = replica_app.get('/api/matakuliah/1', status=200)
+    assert res.json['matakuliah']['nama_mk'] == 'Dari primary'
+    assert res.json['matakuliah']['sks'] == 4
@@ -0,0 +1,45 @@
+import json
+import logging
+
+from pyramid_jinja2 import IJinja2Environment
+
+from manajemen_matakuliah import main
+
+
+def _views(app):
+    return {
+        (item['introspectable']['route_name'],
+         getattr(item['introspectable']['callable'], '__name__', None))
+        for item in app.registry.introspector.get_category('views')
+    }
+
+
+def test_view_modules_match_scan(app_settings, dbengine):
+    scanned = main({}, **dict(app_settings, **{'matakuliah.startup.scan': 'true'}))
+    explicit = main({}, **dict(app_settings, **{'matakuliah.startup.scan': 'false'}))
+    # VIEW_MODULES harus memuat semua modul yang punya @view_config
+    assert ('matakuliah_list', 'matakuliah_list') in _views(scanned)
+    assert _views(explicit) == _views(scanned)
+
+
+def test_warm_up(app_settings, dbengine, caplog):
+    settings = dict(app_settings, **{
+        'matakuliah.startup.warmup': 'true',
+        'matakuliah.startup.pool_connections': '2',
+    })
+    with caplog.at_level(logging.INFO, logger='manajemen_matakuliah.startup'):
+        app = main({}, **settings)
+
+    environment = app.registry.queryUtility(IJinja2Environment, name='.jinja2')
+    names = {name for _, name in environment.cache.keys()}
+    assert 'manajemen_matakuliah:templates/mytemplate.jinja2' in names
+
+    engine = app.registry['dbsession_factory'].kw['bind']
+    assert engine.pool.checkedin() == 2
+
+    boot = json.loads(caplog.records[-1].getMessage())
+    assert boot['event'] == 'boot'
+    assert boot['templates'] == 3 and boot['connections'] == 2
+    assert boot['import'] > 0 and boot['configure'] > 0 and boot['warmup'] > 0
+    assert 'matakuliah_boot_seconds{phase="warmup"}' in \
+        app.registry['matakuliah_metrics'].render()